@@ -20,8 +20,19 @@ import streamlit_authenticator as stauth
 from streamlit_authenticator.utilities import LoginError
 import yaml
 from yaml.loader import SafeLoader
-from dp_utilities import is_admin, get_ld_context, mp_track_page_view
-import ldclient
+from dp_draft import get_draft_state
+from dp_utilities import (
+    analytics_buffer,
+    feature_flags,
+    is_admin,
+    get_ld_context,
+    mp_track_page_view,
+    notification_dispatcher,
+    snowflake_connection_pool,
+    snowflake_query_cache,
+    thumbnail_cache,
+    wikidata_store,
+)
 
 
 # Configure logging
@@ -139,6 +150,38 @@ def display_admin_tools() -> None:
     with st.expander("Session State for Debugging", icon="💾"):
         st.session_state
 
+    # Connection pool metrics
+    with st.expander("Snowflake Connection Pool", icon="🔌"):
+        st.json(snowflake_connection_pool().stats())
+
+    # Query result cache metrics
+    with st.expander("Snowflake Result Cache", icon="🗄️"):
+        st.json(snowflake_query_cache().stats())
+
+    # SMS dispatcher metrics
+    with st.expander("SMS Dispatcher", icon="📨"):
+        st.json(notification_dispatcher().stats())
+
+    # Analytics buffer metrics
+    with st.expander("Mixpanel Analytics", icon="📈"):
+        st.json(analytics_buffer().stats())
+
+    # Feature flag client metrics
+    with st.expander("LaunchDarkly Flags", icon="🚩"):
+        st.json(feature_flags().stats())
+
+    # Persistent Wikidata store metrics
+    with st.expander("Wikidata Store", icon="📚"):
+        st.json(wikidata_store().stats())
+
+    # Portrait thumbnail cache metrics
+    with st.expander("Thumbnail Cache", icon="🖼️"):
+        st.json(thumbnail_cache().stats())
+
+    # Draft turn state metrics
+    with st.expander("Draft State", icon="🎯"):
+        st.json(get_draft_state().stats())
+
 
 def main() -> None:
     """Main function to handle the application flow."""
@@ -163,9 +206,7 @@ def main() -> None:
 
         # Set LaunchDarkly Context for the user and send a login event
         ld_context = get_ld_context()
-        ldclient.get().track(
-            event_name="deadpool-login", metric_value=1, context=ld_context
-        )
+        feature_flags().track("deadpool-login", ld_context, metric_value=1)
         st.session_state["ld_context"] = ld_context
 
         mp_track_page_view(PAGE_TITLE)
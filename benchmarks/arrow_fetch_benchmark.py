@@ -0,0 +1,138 @@
+"""
+Benchmark for the Arrow fetch path of ``load_snowflake_table``.
+
+Compares wall time and peak RSS of the previous ``fetchall`` tuple path with
+the Arrow record batch path at several table sizes. A fake cursor serves the
+same synthetic NNDB-like data as Arrow batches (the format Snowflake sends);
+the tuple path first turns the batches into Python row tuples, as the
+connector's ``fetchall`` does. Each measurement runs in a fresh process so
+peak RSS is not shared between runs. Run from the repository root:
+
+    python -m benchmarks.arrow_fetch_benchmark --rows 10000 100000 1000000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dp_utilities import load_snowflake_table
+
+BATCH_ROWS = 50_000
+
+
+def make_batches(rows: int) -> list:
+    """Builds NNDB-like Arrow batches: ids, names, ages, dates and floats."""
+    rng = np.random.default_rng(7)
+    table = pa.table(
+        {
+            "ID": pa.array(np.arange(rows, dtype=np.int64)),
+            "NAME": pa.array([f"Person {i}" for i in range(rows)]),
+            "AGE": pa.array(rng.integers(20, 105, rows)),
+            "DEATH_DATE": pa.array(
+                pd.to_datetime(rng.integers(0, 2 * 10**9, rows), unit="s")
+            ),
+            "PREDICTION": pa.array(rng.random(rows)),
+        }
+    )
+    return table.to_batches(max_chunksize=BATCH_ROWS)
+
+
+class FakeCursor:
+    """Cursor serving pre-built Arrow batches through both fetch APIs."""
+
+    def __init__(self, batches: list):
+        self._batches = batches
+        self.description = [(name,) for name in batches[0].schema.names]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetch_arrow_batches(self):
+        for batch in self._batches:
+            yield pa.Table.from_batches([batch])
+
+    def fetchall(self):
+        rows = []
+        for batch in self._batches:
+            rows.extend(zip(*(column.to_pylist() for column in batch.columns)))
+        return rows
+
+
+class FakeConnection:
+    def __init__(self, batches: list):
+        self._batches = batches
+
+    def cursor(self):
+        return FakeCursor(self._batches)
+
+
+def load_with_tuples(conn, table):
+    """The previous ``load_snowflake_table`` implementation."""
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT * FROM {table}")
+        result = cur.fetchall()
+        columns = [desc[0] for desc in cur.description]
+    return pd.DataFrame(result, columns=columns)
+
+
+def run_once(path: str, rows: int) -> dict:
+    """Loads ``rows`` rows with one path and reports time and memory."""
+    conn = FakeConnection(make_batches(rows))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if path == "tuples":
+        df = load_with_tuples(conn, "nndb")
+    else:
+        df = load_snowflake_table(conn, "nndb")
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "seconds": seconds,
+        "peak_mb": peak / 1024,
+        "delta_mb": (peak - baseline) / 1024,
+        "frame_mb": df.memory_usage(deep=True).sum() / 2**20,
+        "dtypes": sorted({str(dtype) for dtype in df.dtypes}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once(args.child[0], int(args.child[1]))))
+        return
+
+    print(f"{'rows':>10} {'path':>7} {'seconds':>8} {'peak MB':>8} {'+RSS MB':>8} {'frame MB':>9}  dtypes")
+    for rows in args.rows:
+        for path in ("tuples", "arrow"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.arrow_fetch_benchmark", "--child", path, str(rows)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            print(
+                f"{rows:>10,} {path:>7} {result['seconds']:>8.2f} {result['peak_mb']:>8.0f} "
+                f"{result['delta_mb']:>8.0f} {result['frame_mb']:>9.1f}  {', '.join(result['dtypes'])}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for feature flag evaluation in ``dp_flags``.
+
+Runs the client in offline, file-backed mode, so no network is involved.
+It compares raw SDK evaluations with cached ``FlagClient.variation`` calls
+and measures context construction with and without memoization. Run from the
+repository root:
+
+    python -m benchmarks.flags_benchmark --users 50 --evaluations 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from dp_flags import FlagClient, build_context
+
+FLAGS = {"flagValues": {"show-death-wall": True, "draft-open": False, "max-picks": 20}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--evaluations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "flags.json")
+        with open(path, "w") as f:
+            json.dump(FLAGS, f)
+
+        start = time.perf_counter()
+        flags = FlagClient(flags_file=path)
+        print(f"client start      {1000 * (time.perf_counter() - start):8.2f} ms")
+
+        users = [(f"user-{i}", f"User {i}", f"user{i}@example.com") for i in range(args.users)]
+        flag_keys = list(FLAGS["flagValues"])
+        n = args.evaluations
+
+        start = time.perf_counter()
+        for i in range(n):
+            build_context.__wrapped__(*users[i % len(users)])
+        raw_context = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(n):
+            build_context(*users[i % len(users)])
+        memo_context = time.perf_counter() - start
+        print(f"context build     {1e6 * raw_context / n:8.2f} us  memoized {1e6 * memo_context / n:8.2f} us")
+
+        contexts = [build_context(*user) for user in users]
+        start = time.perf_counter()
+        for i in range(n):
+            flags.client.variation(flag_keys[i % 3], contexts[i % len(contexts)], None)
+        raw = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(n):
+            flags.variation(flag_keys[i % 3], contexts[i % len(contexts)], None)
+        cached = time.perf_counter() - start
+        print(f"evaluation        {1e6 * raw / n:8.2f} us  cached   {1e6 * cached / n:8.2f} us")
+        print(f"stats: {flags.stats()}")
+        flags.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark for the fuzzy name index in ``dp_matching``.
+
+Builds a synthetic table of celebrity-like names, then compares lookup latency
+and agreement between ``NameIndex.best_match`` and a full linear scan of the
+same keys. Run from the repository root:
+
+    python -m benchmarks.name_index_benchmark --size 100000 --queries 2000
+"""
+
+import argparse
+import random
+import string
+import time
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from dp_matching import NameIndex, normalize_name
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph",
+    "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy",
+    "Daniel", "Lisa", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Willie", "Dolly", "Keith", "Ozzy", "Helena", "Björn", "Renée", "José",
+]
+
+
+def random_word(rng: random.Random, low: int = 4, high: int = 10) -> str:
+    """Returns a capitalized pseudo surname."""
+    length = rng.randint(low, high)
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length)).title()
+
+
+def make_names(size: int, seed: int) -> list:
+    """Generates ``size`` distinct two- or three-token names."""
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < size:
+        parts = [rng.choice(FIRST_NAMES), random_word(rng)]
+        if rng.random() < 0.2:
+            parts.insert(1, random_word(rng, 3, 6))
+        names.add(" ".join(parts))
+    return list(names)
+
+
+def add_typo(rng: random.Random, name: str) -> str:
+    """Applies a single random substitution, deletion or swap."""
+    chars = list(name)
+    i = rng.randrange(1, len(chars) - 1)
+    op = rng.choice(["sub", "del", "swap"])
+    if op == "sub":
+        chars[i] = rng.choice(string.ascii_lowercase)
+    elif op == "del":
+        del chars[i]
+    else:
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--scan-queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_names(args.size, args.seed)
+    ids = list(range(len(names)))
+
+    start = time.perf_counter()
+    index = NameIndex()
+    index.add_many(names, ids)
+    build_seconds = time.perf_counter() - start
+    print(f"Indexed {len(index):,} names in {build_seconds:.2f}s")
+
+    queries = [add_typo(rng, rng.choice(names)) for _ in range(args.queries)]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.best_match(query)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    print(
+        f"NameIndex.best_match: mean {timings.mean():.3f} ms, "
+        f"p50 {np.percentile(timings, 50):.3f} ms, "
+        f"p95 {np.percentile(timings, 95):.3f} ms"
+    )
+
+    keys = [normalize_name(name) for name in names]
+    agree = 0
+    scan_timings = []
+    for query in queries[: args.scan_queries]:
+        start = time.perf_counter()
+        exact = process.extractOne(
+            normalize_name(query), keys, scorer=fuzz.ratio, score_cutoff=85
+        )
+        scan_timings.append(time.perf_counter() - start)
+        match = index.best_match(query)
+        exact_score = exact[1] if exact else None
+        index_score = match.score if match else None
+        agree += exact_score == index_score
+    scan_timings = np.array(scan_timings) * 1000
+    print(f"Linear scan (RapidFuzz, C): mean {scan_timings.mean():.3f} ms")
+    print(f"Best-score agreement with scan: {agree}/{args.scan_queries}")
+
+
+if __name__ == "__main__":
+    main()
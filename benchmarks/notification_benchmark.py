@@ -0,0 +1,63 @@
+"""
+Benchmark for the background SMS dispatcher in ``dp_notifications``.
+
+Sends one draft announcement to a list of numbers through a ``FakeTransport``
+with simulated Twilio latency, first with the old one-at-a-time loop and then
+through ``NotificationDispatcher``. Reports how long the caller is blocked,
+the time until every message is delivered, and throughput. Run from the
+repository root:
+
+    python -m benchmarks.notification_benchmark --numbers 40 --latency 0.25
+"""
+
+import argparse
+import time
+
+from dp_notifications import FakeTransport, NotificationDispatcher
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--numbers", type=int, default=40)
+    parser.add_argument("--duplicates", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    numbers = [f"+1555{i:07d}" for i in range(args.numbers)]
+    numbers += numbers[: args.duplicates]
+    body = "Player has picked Someone Famous"
+
+    # Sequential baseline, as send_sms used to work
+    transport = FakeTransport(args.latency)
+    start = time.perf_counter()
+    for number in numbers:
+        transport.send(number, body)
+    sequential = time.perf_counter() - start
+    print(
+        f"sequential   blocked {sequential:7.3f} s  delivered {sequential:7.3f} s  "
+        f"{len(numbers) / sequential:7.1f} msg/s  sent {len(transport.sent)}"
+    )
+
+    transport = FakeTransport(args.latency, args.failure_rate)
+    dispatcher = NotificationDispatcher(
+        transport, workers=args.workers, backoff=args.latency
+    )
+    start = time.perf_counter()
+    futures = dispatcher.send(body, numbers)
+    blocked = time.perf_counter() - start
+    results = [future.result() for future in futures]
+    delivered = time.perf_counter() - start
+    dispatcher.close()
+
+    sent = sum(result.status == "sent" for result in results)
+    print(
+        f"dispatcher   blocked {blocked:7.3f} s  delivered {delivered:7.3f} s  "
+        f"{len(results) / delivered:7.1f} msg/s  sent {sent}/{len(results)}"
+    )
+    print(f"dispatcher stats: {dispatcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Validation and benchmark for the scoring engine in ``dp_scoring``.
+
+On generated fixture picks, checks that the vectorized ``score_picks`` and
+the incremental ``Standings.record_death`` both agree with a row-by-row
+reference of the rules, and times them. It also
+times ``simulate_rules`` over a grid of rule variants for three fixture
+seasons. The fixture checks only show the code matches the rules as written
+here; the acceptance check is --live, which scores the picks view of every
+season and compares the result with its score view in Snowflake, and exits
+with an error on any mismatch. Run from the repository root:
+
+    python -m benchmarks.scoring_validation --players 30 --picks 20
+    python -m benchmarks.scoring_validation --live
+"""
+
+import argparse
+import itertools
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from dp_scoring import (
+    BASE_POINTS,
+    FIRST_BLOOD_BONUS,
+    LAST_BLOOD_BONUS,
+    QUARTERLY_BONUS,
+    DEFAULT_RULES,
+    RuleSet,
+    Standings,
+    score_picks,
+    simulate_rules,
+)
+
+
+def make_picks(players: int, picks: int, death_rate: float, seed: int = 7) -> pd.DataFrame:
+    """Generates one season of picks with unique names and some deaths."""
+    rng = np.random.default_rng(seed)
+    rows = players * picks
+    dead = rng.random(rows) < death_rate
+    days = rng.integers(0, 365, rows)
+    return pd.DataFrame(
+        {
+            "PLAYER": np.repeat([f"player_{i:03d}" for i in range(players)], picks),
+            "NAME": [f"person_{i:05d}" for i in range(rows)],
+            "AGE": rng.integers(40, 105, rows),
+            "DEATH_DATE": np.where(
+                dead, np.datetime64("2025-01-01") + days.astype("timedelta64[D]"), np.datetime64("NaT")
+            ),
+        }
+    )
+
+
+def reference_scores(df_picks: pd.DataFrame) -> dict:
+    """Scores picks one row at a time, straight from the rules text."""
+    dead = df_picks[df_picks["DEATH_DATE"].notna()]
+    first, last = dead["DEATH_DATE"].min(), dead["DEATH_DATE"].max()
+    totals = {player: 0 for player in df_picks["PLAYER"]}
+    by_quarter = {}
+    for row in dead.itertuples():
+        points = BASE_POINTS + (100 - row.AGE)
+        if row.DEATH_DATE == first:
+            points += FIRST_BLOOD_BONUS
+        if row.DEATH_DATE == last:
+            points += LAST_BLOOD_BONUS
+        totals[row.PLAYER] += points
+        quarter = by_quarter.setdefault((row.DEATH_DATE.year, row.DEATH_DATE.quarter), {})
+        quarter[row.PLAYER] = quarter.get(row.PLAYER, 0) + points
+    for quarter in by_quarter.values():
+        best = max(quarter.values())
+        for player, points in quarter.items():
+            if points == best:
+                totals[player] += QUARTERLY_BONUS
+    return totals
+
+
+def as_dict(df_totals: pd.DataFrame) -> dict:
+    return dict(zip(df_totals["PLAYER"], df_totals["TOTAL"].astype(int)))
+
+
+def validate_fixture(players: int, picks: int, death_rate: float) -> None:
+    df_picks = make_picks(players, picks, death_rate)
+    print(f"{len(df_picks)} picks, {df_picks['DEATH_DATE'].notna().sum()} deaths")
+
+    start = time.perf_counter()
+    expected = reference_scores(df_picks)
+    print(f"reference    {1000 * (time.perf_counter() - start):8.2f} ms")
+
+    start = time.perf_counter()
+    vectorized = as_dict(score_picks(df_picks))
+    print(f"score_picks  {1000 * (time.perf_counter() - start):8.2f} ms")
+    assert vectorized == expected, "score_picks differs from the reference"
+
+    # Start with no deaths and record them one by one in random order
+    df_alive = df_picks.assign(DEATH_DATE=pd.NaT)
+    standings = Standings(df_alive)
+    deaths = df_picks[df_picks["DEATH_DATE"].notna()].sample(frac=1, random_state=7)
+    start = time.perf_counter()
+    for row in deaths.itertuples():
+        standings.record_death(row.NAME, row.AGE, row.DEATH_DATE.date())
+    seconds = time.perf_counter() - start
+    print(f"record_death {1e6 * seconds / max(len(deaths), 1):8.2f} us/death")
+    assert as_dict(standings.frame()) == expected, "Standings differs from the reference"
+
+    # A season in progress: quarters are only awarded once they end
+    as_of = date(2025, 6, 30)
+    standings = Standings(df_alive, last_blood=False, as_of=as_of)
+    standings.update(df_picks, as_of=as_of)
+    partial = score_picks(df_picks, last_blood=False, as_of=as_of)
+    assert as_dict(standings.frame()) == as_dict(partial), "open Standings differs"
+    standings.update(df_picks, as_of=date(2026, 1, 1))
+    settled = score_picks(df_picks, last_blood=False, as_of=date(2026, 1, 1))
+    assert as_dict(standings.frame()) == as_dict(settled), "settled Standings differs"
+
+    # A corrected death date rebuilds the standings
+    df_corrected = df_picks.copy()
+    df_corrected.loc[deaths.index[0], "DEATH_DATE"] = pd.Timestamp("2025-01-01")
+    standings.update(df_corrected, as_of=date(2026, 1, 1))
+    corrected = score_picks(df_corrected, last_blood=False, as_of=date(2026, 1, 1))
+    assert as_dict(standings.frame()) == as_dict(corrected), "rebuilt Standings differs"
+    print("fixture: OK")
+
+
+def benchmark_simulation(players: int, picks: int, death_rate: float, variants: int) -> None:
+    seasons = {
+        str(year): make_picks(players, picks, death_rate, seed=year) for year in (2023, 2024, 2025)
+    }
+    bonuses = range(0, 101, 5)
+    grid = itertools.product(bonuses, bonuses, [np.inf, 100, 95], [0.8, 1.0, 1.2])
+    rule_sets = [
+        RuleSet(first_blood=first, last_blood=last, age_cap=cap, exponent=exponent)
+        for first, last, cap, exponent in itertools.islice(grid, variants)
+    ]
+
+    as_of = date(2025, 12, 31)
+    start = time.perf_counter()
+    df_sim = simulate_rules(seasons, rule_sets, open_seasons=["2025"], as_of=as_of)
+    print(
+        f"simulate_rules {len(rule_sets)} variants x {len(seasons)} seasons "
+        f"in {1000 * (time.perf_counter() - start):.1f} ms"
+    )
+
+    # The real rules must reproduce score_picks
+    df_default = simulate_rules(seasons, [DEFAULT_RULES], open_seasons=["2025"], as_of=as_of)
+    for season, df_picks in seasons.items():
+        df_season = df_default[df_default["SEASON"] == season]
+        is_open = season == "2025"
+        expected = score_picks(df_picks, last_blood=not is_open, as_of=as_of if is_open else None)
+        assert as_dict(df_season) == as_dict(expected)
+
+    # Real standings as baselines give the baseline variant zero rank changes
+    baselines = {season: df_default[df_default["SEASON"] == season] for season in seasons}
+    df_real = simulate_rules(
+        seasons, [DEFAULT_RULES], open_seasons=["2025"], baselines=baselines, as_of=as_of
+    )
+    assert (df_real["RANK_CHANGE"] == 0).all()
+    assert len(df_sim) == len(rule_sets) * players * len(seasons)
+    print("simulation: OK")
+
+
+def validate_live() -> None:
+    from dp_seasons import closed_seasons, current_season, load_season
+    from dp_utilities import snowflake_connection_helper
+
+    conn = snowflake_connection_helper()
+    failed = False
+    for year in [current_season(), *closed_seasons(conn)]:
+        is_open = year == current_season()
+        df_picks = load_season(conn, "picks", year)
+        as_of = date.today() if is_open else None
+        expected = as_dict(load_season(conn, "score", year))
+        for label, df_computed in (
+            ("score_picks", score_picks(df_picks, last_blood=not is_open, as_of=as_of)),
+            ("Standings", Standings(df_picks, last_blood=not is_open, as_of=as_of).frame()),
+        ):
+            computed = as_dict(df_computed)
+            mismatches = {
+                player: (computed.get(player), total)
+                for player, total in expected.items()
+                if computed.get(player, 0) != total
+            }
+            status = "OK" if not mismatches else f"{len(mismatches)} mismatches: {mismatches}"
+            print(f"{year} {label} vs scores: {status}")
+            failed = failed or bool(mismatches)
+    if failed:
+        raise SystemExit("The scoring engine does not match the score views")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--picks", type=int, default=20)
+    parser.add_argument("--death-rate", type=float, default=0.1)
+    parser.add_argument("--variants", type=int, default=500)
+    parser.add_argument("--live", action="store_true", help="Also compare with the Snowflake score views")
+    args = parser.parse_args()
+
+    validate_fixture(args.players, args.picks, args.death_rate)
+    benchmark_simulation(args.players, args.picks, args.death_rate, args.variants)
+    if args.live:
+        validate_live()
+
+
+if __name__ == "__main__":
+    main()
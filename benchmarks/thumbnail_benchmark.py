@@ -0,0 +1,86 @@
+"""
+Benchmark for the portrait thumbnail cache in ``dp_images``.
+
+Generates full-resolution JPEG portraits and serves them from a local fixture
+HTTP server. A ``ThumbnailCache`` is then allowed to fetch from localhost, and
+the benchmark reports cold (download and resize) and warm (disk hit) latency,
+the bytes saved by serving thumbnails, and eviction under a small size limit.
+Run from the repository root:
+
+    python -m benchmarks.thumbnail_benchmark --images 20 --size 3000x2000
+"""
+
+import argparse
+import functools
+import io
+import os
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from PIL import Image
+
+from dp_images import ThumbnailCache
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def make_portraits(directory: str, count: int, width: int, height: int) -> int:
+    """Writes noisy JPEGs (which compress poorly, like photos) and returns total bytes."""
+    rng = np.random.default_rng(7)
+    total = 0
+    for i in range(count):
+        pixels = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+        image = Image.fromarray(pixels).resize((width, height), Image.BILINEAR)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=92)
+        with open(os.path.join(directory, f"portrait_{i}.jpg"), "wb") as f:
+            f.write(buffer.getvalue())
+        total += buffer.tell()
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--size", default="3000x2000")
+    args = parser.parse_args()
+    width, height = (int(value) for value in args.size.split("x"))
+
+    with tempfile.TemporaryDirectory() as fixtures, tempfile.TemporaryDirectory() as cache_dir:
+        original_total = make_portraits(fixtures, args.images, width, height)
+        handler = functools.partial(QuietHandler, directory=fixtures)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        urls = [f"{base}/portrait_{i}.jpg" for i in range(args.images)]
+        print(f"{args.images} originals of {width}x{height}: {original_total / 1e6:.1f} MB")
+
+        thumbnails = ThumbnailCache(cache_dir, allowed_hosts={"127.0.0.1"})
+        for label in ("cold", "warm"):
+            start = time.perf_counter()
+            served = sum(len(thumbnails.get(url)) for url in urls)
+            seconds = time.perf_counter() - start
+            print(
+                f"{label:5} {1000 * seconds / len(urls):8.2f} ms/image  "
+                f"served {served / 1e3:8.1f} kB"
+            )
+        print(f"stats: {thumbnails.stats()}")
+
+        # Eviction: room for about a quarter of the thumbnails
+        limit = thumbnails.stats()["cached_bytes"] // 4
+        small = ThumbnailCache(os.path.join(cache_dir, "small"), max_bytes=limit, allowed_hosts={"127.0.0.1"})
+        for url in urls:
+            small.get(url)
+        stats = small.stats()
+        print(f"eviction limit {limit} B: {stats['entries']} kept, {stats['evictions']} evicted, {stats['cached_bytes']} B cached")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
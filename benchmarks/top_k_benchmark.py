@@ -0,0 +1,58 @@
+"""
+Benchmark for bulk top-k name scoring in ``dp_matching``.
+
+Compares ``top_k_matches`` (one bulk similarity matrix) with calling
+``has_fuzzy_match`` once per query, which is what a "did you mean" loop over
+the old API amounts to. Run from the repository root:
+
+    python -m benchmarks.top_k_benchmark --queries 500 --references 20000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.name_index_benchmark import add_typo, make_names
+from dp_matching import top_k_matches
+from dp_utilities import has_fuzzy_match
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--references", type=int, default=20_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--loop-queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_names(args.references, args.seed)
+    ids = list(range(len(names)))
+    queries = [add_typo(rng, rng.choice(names)) for _ in range(args.queries)]
+
+    for workers in (1, -1):
+        start = time.perf_counter()
+        top_k_matches(queries, names, ids, k=args.k, workers=workers)
+        seconds = time.perf_counter() - start
+        print(
+            f"top_k_matches workers={workers}: {seconds:.2f}s for "
+            f"{args.queries:,} x {args.references:,} "
+            f"({seconds / args.queries * 1000:.2f} ms/query)"
+        )
+
+    df = pd.DataFrame({"NAME": names, "ID": ids})
+    start = time.perf_counter()
+    for query in queries[: args.loop_queries]:
+        has_fuzzy_match(query, df, "NAME")
+    seconds = time.perf_counter() - start
+    print(
+        f"has_fuzzy_match loop: {seconds / args.loop_queries * 1000:.2f} ms/query "
+        "(best match only)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Buffered Mixpanel analytics for the Deadpool application.
+
+Page views used to be sent with two synchronous HTTP calls on every
+Streamlit rerun. This module puts events in a bounded in-memory buffer and
+sends them in batches from one background thread. Rendering a page never
+waits on Mixpanel.
+
+Features:
+- Non-blocking ``track`` and ``identify``
+- Batched delivery through Mixpanel's BufferedConsumer
+- Profile updates (people_set) only when the profile fields change
+- Events are dropped, and counted, when the buffer is full
+- Failed batches are requeued and retried; track events carry an
+  ``$insert_id`` so Mixpanel deduplicates a batch that was partly sent
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, NamedTuple, Optional
+
+from mixpanel import BufferedConsumer, Mixpanel, MixpanelException
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Buffer Constants
+DEFAULT_MAX_EVENTS = 1000
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 5.0
+MAX_ATTEMPTS = 3
+
+
+class AnalyticsEvent(NamedTuple):
+    """One buffered Mixpanel call."""
+
+    kind: str  # "track" or "people_set"
+    distinct_id: str
+    name: Optional[str]
+    properties: Dict[str, Any]
+    attempts: int = 0
+
+
+class AnalyticsBuffer:
+    """Bounded event buffer flushed to Mixpanel by a background thread.
+
+    Only the flush thread touches the Mixpanel client, since its buffered
+    consumer is not thread-safe.
+
+    Example:
+        analytics = AnalyticsBuffer(token)
+        analytics.track(user_id, "Page View", {"Page": "Leaderboard"})
+    """
+
+    def __init__(
+        self,
+        token: str,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        consumer=None,
+    ):
+        """Creates the buffer and starts its flush thread.
+
+        Args:
+            token: Mixpanel project token
+            max_events: Events held before new ones are dropped. Defaults to 1000.
+            batch_size: Events that trigger an early flush and are sent per
+                request. Defaults to 50, Mixpanel's maximum.
+            flush_interval: Maximum seconds between flushes. Defaults to 5.0.
+            consumer: Mixpanel consumer to send through. Defaults to a
+                BufferedConsumer of ``batch_size``.
+        """
+        self.batch_size = min(batch_size, DEFAULT_BATCH_SIZE)
+        self.flush_interval = flush_interval
+        self._token = token
+        self._consumer = consumer or BufferedConsumer(max_size=self.batch_size)
+        self._mixpanel = Mixpanel(token, consumer=self._consumer)
+        self._queue: "queue.Queue[AnalyticsEvent]" = queue.Queue(maxsize=max_events)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._metrics = {
+            "queued": 0,
+            "sent": 0,
+            "dropped": 0,
+            "retried": 0,
+            "failed": 0,
+            "flushes": 0,
+        }
+        self._thread = threading.Thread(
+            target=self._run, name="mixpanel-flush", daemon=True
+        )
+        self._thread.start()
+
+    def _count(self, metric: str, amount: int = 1) -> None:
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def _enqueue(self, event: AnalyticsEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def track(self, distinct_id: str, event_name: str, properties: Optional[Dict[str, Any]] = None) -> bool:
+        """Buffers an event; the event time is taken now, not at flush.
+
+        Args:
+            distinct_id: Mixpanel distinct ID of the user
+            event_name: Name of the event
+            properties: Event properties. Defaults to None.
+
+        Returns:
+            bool: False if the buffer was full and the event was dropped
+        """
+        properties = dict(properties or {})
+        properties.setdefault("time", time.time())
+        properties.setdefault("$insert_id", uuid.uuid4().hex)
+        return self._enqueue(AnalyticsEvent("track", distinct_id, event_name, properties))
+
+    def identify(self, distinct_id: str, profile: Dict[str, Any]) -> bool:
+        """Buffers a profile update if the profile differs from the last one sent.
+
+        Args:
+            distinct_id: Mixpanel distinct ID of the user
+            profile: Profile properties such as name and $email
+
+        Returns:
+            bool: True if an update was queued
+        """
+        with self._lock:
+            if self._profiles.get(distinct_id) == profile:
+                return False
+            self._profiles[distinct_id] = dict(profile)
+        if not self._enqueue(AnalyticsEvent("people_set", distinct_id, None, dict(profile))):
+            # Let the next call retry the update
+            with self._lock:
+                self._profiles.pop(distinct_id, None)
+            return False
+        return True
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Sends all buffered events; called from the flush thread or at shutdown.
+
+        Events go out in batches of ``batch_size``. When a batch fails, it
+        and every later batch are put back in the buffer. A failed batch may
+        have been partly delivered, which ``$insert_id`` makes safe to
+        resend. Events are counted as failed only once they have failed
+        ``MAX_ATTEMPTS`` times.
+
+        Returns:
+            int: Number of events sent
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not events:
+            return 0
+
+        sent = 0
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start:start + self.batch_size]
+            try:
+                for event in batch:
+                    if event.kind == "track":
+                        self._mixpanel.track(event.distinct_id, event.name, event.properties)
+                    else:
+                        self._mixpanel.people_set(event.distinct_id, event.properties)
+                self._consumer.flush()
+            except MixpanelException as e:
+                logger.warning(f"Mixpanel batch of {len(batch)} events failed: {e}")
+                self._reset_consumer()
+                self._requeue(batch, failed=True)
+                self._requeue(events[start + len(batch):], failed=False)
+                break
+            sent += len(batch)
+
+        self._count("sent", sent)
+        self._count("flushes")
+        return sent
+
+    def _reset_consumer(self) -> None:
+        """Drops messages a BufferedConsumer kept from a failed batch.
+
+        The batch is requeued instead, so keeping them would send them twice
+        and mix them into the next batch.
+        """
+        if isinstance(self._consumer, BufferedConsumer):
+            self._consumer = BufferedConsumer(max_size=self.batch_size)
+            self._mixpanel = Mixpanel(self._token, consumer=self._consumer)
+
+    def _requeue(self, events, failed: bool) -> None:
+        """Puts unsent events back in the buffer, counting the ones given up on."""
+        for event in events:
+            if failed:
+                event = event._replace(attempts=event.attempts + 1)
+                if event.attempts >= MAX_ATTEMPTS:
+                    self._count("failed")
+                    continue
+                self._count("retried")
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._count("dropped")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns queued, sent, dropped, retried and failed counts and the buffer size."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["buffered"] = self._queue.qsize()
+        return metrics
+
+    def close(self) -> None:
+        """Stops the flush thread and sends whatever is still buffered."""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush()
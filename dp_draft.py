@@ -0,0 +1,366 @@
+"""
+Process-wide draft turn state for the Deadpool drafting page.
+
+The draft is a round robin: players take turns in DRAFT_ORDER until every
+player has ``MAX_PICKS`` alive picks for the year. Instead of every session
+querying the ``draft_next`` view on each render and submission, this module
+keeps one in-memory copy of the order and each player's pick count per
+process, and answers "whose turn is it", "who is next" and "how long until
+my turn" without a query.
+
+A committed pick advances the turn pointer locally (write-through), and the
+new turn is confirmed with a single-row read of ``draft_next`` before anyone
+is notified. All other changes are picked up by a cheap version check on LAST_ALTERED of both
+``player_picks`` (picks made from another process) and ``people`` (deaths,
+which reopen a turn for the re-up). When either changes, the order is
+reloaded and checked against the head of ``draft_next``, which stays the
+source of truth. The head is also compared every ``HEAD_CHECK_INTERVAL``
+seconds, to catch changes the version check cannot see.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import streamlit as st
+
+from dp_utilities import get_table_version, load_snowflake_table, run_snowflake_query
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Draft Constants
+MAX_PICKS = 20
+VERSION_TTL = 10
+HEAD_CHECK_INTERVAL = 30.0
+VERSION_TABLES = ("player_picks", "people")
+DEFAULT_PICK_SECONDS = 120.0
+PICK_SECONDS_SMOOTHING = 0.3
+
+# SQL Queries
+SQL_DRAFT_PLAYERS = """
+SELECT
+    d.ID,
+    d.NAME,
+    d.EMAIL,
+    d.SMS,
+    d.DRAFT_ORDER,
+    COUNT(CASE WHEN pe.ID IS NOT NULL AND pe.DEATH_DATE IS NULL THEN 1 END) AS PICKS
+FROM draft d
+LEFT JOIN player_picks pp ON pp.PLAYER_ID = d.ID AND pp.YEAR = %(year)s
+LEFT JOIN people pe ON pe.ID = pp.PEOPLE_ID
+GROUP BY d.ID, d.NAME, d.EMAIL, d.SMS, d.DRAFT_ORDER
+ORDER BY d.DRAFT_ORDER, d.ID
+"""
+
+SQL_DRAFT_FINGERPRINT = """
+SELECT
+    (SELECT COUNT(*) FROM player_picks WHERE YEAR = %(year)s) AS PICKS,
+    (SELECT COUNT(*) FROM people) AS PEOPLE,
+    (SELECT COUNT(DEATH_DATE) FROM people) AS DEATHS
+"""
+
+
+class DraftTurn(NamedTuple):
+    """A player in the draft order with their current pick count."""
+
+    id: Any
+    name: str
+    email: str
+    sms: Optional[str]
+    picks: int
+
+
+class DraftState:
+    """Round-robin draft order with a locally advanced turn pointer.
+
+    Only players who still need picks are kept in ``_active``, in draft
+    order, with ``_positions`` mapping each player to their index. The turn
+    pointer indexes into ``_active``, so ``current``, ``next`` and
+    ``turns_until`` are O(1). Instances are shared by every session in the
+    process (see ``get_draft_state``), so all methods are guarded by a lock.
+    """
+
+    def __init__(self, year: Optional[int] = None, max_picks: int = MAX_PICKS):
+        """Creates an empty state; the first ``sync`` loads the order.
+
+        Args:
+            year (int, optional): Draft year. Defaults to the current year.
+            max_picks (int, optional): Alive picks each player needs.
+                Defaults to 20.
+        """
+        self.year = year or datetime.now().year
+        self.max_picks = max_picks
+        self._lock = threading.RLock()
+        self._players: Dict[Any, DraftTurn] = {}
+        self._active: List[Any] = []
+        self._positions: Dict[Any, int] = {}
+        self._emails: Dict[str, Any] = {}
+        self._pointer = 0
+        self._version: Optional[Tuple[Optional[str], ...]] = None
+        self._fingerprint: Optional[Tuple[int, int, int]] = None
+        self._head_checked_at = 0.0
+        self._last_pick_at: Optional[float] = None
+        self.seconds_per_pick = DEFAULT_PICK_SECONDS
+        self.reloads = 0
+        self.local_advances = 0
+
+    def sync(self, _conn, ttl: float = VERSION_TTL) -> bool:
+        """Reloads the order if ``player_picks`` or ``people`` changed.
+
+        When neither changed but the head of ``draft_next`` was last checked
+        more than HEAD_CHECK_INTERVAL seconds ago, it is checked again and
+        the order is reloaded if it disagrees. Queries run without the lock
+        held, so other sessions keep reading the current order meanwhile.
+
+        Args:
+            _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+            ttl (float, optional): Seconds to reuse the version lookup.
+                Defaults to 10.
+
+        Returns:
+            bool: True if the order was reloaded
+        """
+        version = self._read_version(_conn, ttl)
+        with self._lock:
+            unchanged = self._version is not None and version == self._version
+            if unchanged and time.monotonic() - self._head_checked_at < HEAD_CHECK_INTERVAL:
+                return False
+        if unchanged:
+            expected = self._read_head(_conn)
+            with self._lock:
+                if expected == self._current_id():
+                    return False
+            logger.warning(f"draft_next moved to {expected} without a version change, reloading")
+        self._load(_conn, version)
+        return True
+
+    def _read_version(self, _conn, ttl: float = VERSION_TTL) -> Tuple[Optional[str], ...]:
+        """Returns the LAST_ALTERED of every table the order depends on."""
+        return tuple(get_table_version(_conn, table, ttl=ttl) for table in VERSION_TABLES)
+
+    def _read_fingerprint(self, _conn) -> Tuple[int, int, int]:
+        """Returns the year's pick count and the people and death counts."""
+        row = run_snowflake_query(_conn, SQL_DRAFT_FINGERPRINT, params={"year": self.year}).iloc[0]
+        return int(row["PICKS"]), int(row["PEOPLE"]), int(row["DEATHS"])
+
+    def _read_head(self, _conn) -> Optional[Any]:
+        """Returns the player at the head of draft_next, or None if it is empty."""
+        df_next = load_snowflake_table(_conn, "draft_next", columns=["ID"], limit=1)
+        with self._lock:
+            self._head_checked_at = time.monotonic()
+        return df_next["ID"].iloc[0] if len(df_next) else None
+
+    def _load(self, _conn, version: Tuple[Optional[str], ...]) -> None:
+        """Replaces the order and pick counts, and reconciles with draft_next.
+
+        The queries run without the lock held; the new state is swapped in
+        under it. If a pick was recorded in the meantime, the loaded order
+        may predate it, so it is dropped and the next ``sync`` loads again.
+
+        Args:
+            _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+            version: Versions read before the queries, adopted with the order
+        """
+        with self._lock:
+            advances = self.local_advances
+        fingerprint = self._read_fingerprint(_conn)
+        df_players = run_snowflake_query(_conn, SQL_DRAFT_PLAYERS, params={"year": self.year})
+        expected = self._read_head(_conn)
+        players = {
+            row.ID: DraftTurn(row.ID, row.NAME, row.EMAIL, row.SMS, int(row.PICKS))
+            for row in df_players.itertuples(index=False)
+        }
+
+        with self._lock:
+            if self.local_advances != advances:
+                logger.info("A pick was recorded while loading the draft order, loading again on next sync")
+                self._version = None
+                return
+            self._players = players
+            self._emails = {turn.email: player for player, turn in players.items()}
+            self._rebuild_active()
+
+            # Turn goes to the earliest player in draft order with the fewest picks
+            self._pointer = 0
+            if self._active:
+                fewest = min(self._players[player].picks for player in self._active)
+                self._pointer = next(
+                    i
+                    for i, player in enumerate(self._active)
+                    if self._players[player].picks == fewest
+                )
+
+            # draft_next is the source of truth for whose turn it is
+            current = self._current_id()
+            if expected != current:
+                logger.warning(
+                    f"Draft order disagrees with draft_next ({current} != {expected}), "
+                    "following draft_next"
+                )
+                if expected in self._positions:
+                    self._pointer = self._positions[expected]
+            self._version, self._fingerprint = version, fingerprint
+            self.reloads += 1
+            logger.info(f"Loaded draft order for {self.year}: {len(self._active)} players still drafting")
+
+    def _rebuild_active(self) -> None:
+        """Recomputes the players who still need picks and their positions."""
+        self._active = [
+            player for player, turn in self._players.items() if turn.picks < self.max_picks
+        ]
+        self._positions = {player: i for i, player in enumerate(self._active)}
+
+    def _current_id(self) -> Optional[Any]:
+        return self._active[self._pointer] if self._active else None
+
+    def current(self) -> Optional[DraftTurn]:
+        """Returns the player whose turn it is, or None once the draft is over."""
+        with self._lock:
+            player = self._current_id()
+            return self._players[player] if player is not None else None
+
+    def next(self) -> Optional[DraftTurn]:
+        """Returns the player after the current one, or None if there is none."""
+        with self._lock:
+            if not self._active:
+                return None
+            finishing = self._players[self._current_id()].picks + 1 >= self.max_picks
+            if finishing and len(self._active) == 1:
+                return None
+            return self._players[self._active[(self._pointer + 1) % len(self._active)]]
+
+    def find(self, email: str) -> Optional[DraftTurn]:
+        """Returns the player with an email, or None if not in the draft."""
+        with self._lock:
+            player = self._emails.get(email)
+            return self._players[player] if player is not None else None
+
+    def turns_until(self, player_id: Any) -> Optional[int]:
+        """Returns how many picks happen before a player's turn.
+
+        Args:
+            player_id: ID of the player
+
+        Returns:
+            int or None: 0 if it is the player's turn, None if the player has
+            all their picks or is not in the draft
+        """
+        with self._lock:
+            position = self._positions.get(player_id)
+            if position is None:
+                return None
+            return (position - self._pointer) % len(self._active)
+
+    def eta(self, player_id: Any) -> Optional[float]:
+        """Estimates the seconds until a player's turn.
+
+        Uses a moving average of the time between the picks recorded in this
+        process.
+
+        Args:
+            player_id: ID of the player
+
+        Returns:
+            float or None: Estimated seconds, None as for ``turns_until``
+        """
+        turns = self.turns_until(player_id)
+        return None if turns is None else turns * self.seconds_per_pick
+
+    def record_pick(self, _conn, player_id: Any, new_person: bool = False) -> Optional[DraftTurn]:
+        """Applies a committed pick and advances the turn (write-through).
+
+        Call this after the transaction writing to ``player_picks`` commits
+        and the query cache was invalidated. The new versions are adopted, so
+        the pick does not trigger a reload, only if the tables changed by
+        exactly this write: one more pick, one more person if ``new_person``,
+        and no new deaths. Either way, the new turn is confirmed against the
+        head of ``draft_next`` before it is returned, and the order is
+        reloaded if another process wrote as well or the head disagrees, so
+        the returned player is safe to notify.
+
+        Args:
+            _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+            player_id: ID of the player who picked
+            new_person (bool, optional): The same transaction inserted the
+                picked person into ``people``. Defaults to False.
+
+        Returns:
+            DraftTurn or None: The player whose turn it is now, None once the
+            draft is over
+        """
+        with self._lock:
+            turn = self._players.get(player_id)
+            in_turn = turn is not None and player_id == self._current_id()
+            if in_turn:
+                self._players[player_id] = turn._replace(picks=turn.picks + 1)
+                if turn.picks + 1 >= self.max_picks:
+                    # Player is done: drop them, the pointer then already points at the next one
+                    self._rebuild_active()
+                    if self._pointer >= len(self._active):
+                        self._pointer = 0
+                else:
+                    self._pointer = (self._pointer + 1) % len(self._active)
+
+                now = time.monotonic()
+                if self._last_pick_at is not None:
+                    self.seconds_per_pick += PICK_SECONDS_SMOOTHING * (
+                        now - self._last_pick_at - self.seconds_per_pick
+                    )
+                self._last_pick_at = now
+                self.local_advances += 1
+
+        # Versions first: a write after this read changes them again
+        version = self._read_version(_conn)
+        if not in_turn:
+            # Out-of-turn pick (e.g. an admin correction)
+            logger.warning(f"Pick by {player_id} was out of turn, reloading the order")
+            self._load(_conn, version)
+            return self.current()
+
+        fingerprint = self._read_fingerprint(_conn)
+        expected = self._read_head(_conn)
+        with self._lock:
+            own_write = (
+                self._version is not None
+                and self._fingerprint is not None
+                and fingerprint
+                == (self._fingerprint[0] + 1, self._fingerprint[1] + int(new_person), self._fingerprint[2])
+                and None not in version
+                and version[0] != self._version[0]
+                and (new_person or version[1] == self._version[1])
+            )
+            if own_write and expected == self._current_id():
+                self._version, self._fingerprint = version, fingerprint
+                return self.current()
+
+        logger.info("Draft tables changed beyond this pick, reloading the order")
+        self._load(_conn, version)
+        return self.current()
+
+    def stats(self) -> dict:
+        """Returns counters for monitoring."""
+        with self._lock:
+            current = self._current_id()
+            return {
+                "year": self.year,
+                "players": len(self._players),
+                "drafting": len(self._active),
+                "current": self._players[current].name if current is not None else None,
+                "version": self._version,
+                "seconds_per_pick": round(self.seconds_per_pick, 1),
+                "reloads": self.reloads,
+                "local_advances": self.local_advances,
+            }
+
+
+@st.cache_resource
+def get_draft_state() -> DraftState:
+    """Returns the process-wide draft state shared by every session.
+
+    Returns:
+        DraftState: The shared state (empty until its first ``sync``)
+    """
+    return DraftState()
@@ -0,0 +1,159 @@
+"""
+Feature flag evaluation for the Deadpool application via LaunchDarkly.
+
+The SDK client holds a streaming connection and a background event
+processor, so it is created once per process and shared by every session.
+Contexts are memoized per user, and flag values are cached per user for a
+short TTL so repeated renders do not re-evaluate the same flags.
+
+Setting a flags file puts the client in offline, file-backed mode. Flags
+are read from a local JSON/YAML file in the LaunchDarkly file data source
+format and no network connections are made, for example:
+
+    {"flagValues": {"show-death-wall": true}}
+
+The pages do not evaluate any flags yet; Home only sends the login metric
+through ``track``. New flag checks should go through
+``feature_flags().variation`` so they share the client and its cache.
+"""
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import ldclient
+from ldclient import Context
+from ldclient.config import Config
+from ldclient.integrations import Files
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Flag Constants
+DEFAULT_TTL = 30.0
+DEFAULT_START_WAIT = 5.0
+OFFLINE_SDK_KEY = "offline"
+
+
+@lru_cache(maxsize=1024)
+def build_context(user_key: str, name: str, email: str) -> Context:
+    """Builds, or returns the memoized, LaunchDarkly context for a user.
+
+    Args:
+        user_key: Stable user ID
+        name: Display name of the user
+        email: Email address of the user
+
+    Returns:
+        ldclient.Context: The user context
+    """
+    builder = Context.builder(user_key)
+    builder.kind("user")
+    builder.name(name)
+    builder.set("email", email)
+    return builder.build()
+
+
+class FlagClient:
+    """Process-wide LaunchDarkly client with a per-user evaluation cache.
+
+    Example:
+        flags = FlagClient(sdk_key)
+        if flags.variation("show-death-wall", context, False):
+            ...
+    """
+
+    def __init__(
+        self,
+        sdk_key: Optional[str] = None,
+        flags_file: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        start_wait: float = DEFAULT_START_WAIT,
+    ):
+        """Creates and starts the SDK client.
+
+        Args:
+            sdk_key: LaunchDarkly server-side SDK key. Ignored in file mode.
+            flags_file: Path of a local flags file. When set, the client
+                evaluates flags from the file and sends no events.
+            ttl: Seconds a flag value is cached per user. Defaults to 30.
+            start_wait: Seconds to wait for the initial flag payload.
+                Defaults to 5.
+        """
+        if flags_file:
+            config = Config(
+                OFFLINE_SDK_KEY,
+                update_processor_class=Files.new_data_source(paths=[flags_file]),
+                send_events=False,
+            )
+        elif sdk_key:
+            config = Config(sdk_key)
+        else:
+            raise ValueError("Either sdk_key or flags_file is required")
+
+        self.ttl = ttl
+        self.offline = bool(flags_file)
+        self.client = ldclient.LDClient(config, start_wait=start_wait)
+        if not self.client.is_initialized():
+            logger.warning("LaunchDarkly client not initialized; using flag defaults")
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def variation(self, flag_key: str, context: Context, default: Any) -> Any:
+        """Evaluates a flag for a context, using the cached value if fresh.
+
+        Args:
+            flag_key: Key of the flag
+            context: Context to evaluate for
+            default: Value returned if the flag cannot be evaluated
+
+        Returns:
+            The flag value
+        """
+        key = (context.fully_qualified_key, flag_key)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] > now:
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        value = self.client.variation(flag_key, context, default)
+        with self._lock:
+            self._cache[key] = (value, now + self.ttl)
+        return value
+
+    def track(self, event_name: str, context: Context, metric_value: Optional[float] = None) -> None:
+        """Records a custom event for a context (no-op in file mode)."""
+        if not self.offline:
+            self.client.track(event_name, context, metric_value=metric_value)
+
+    def invalidate(self, context: Optional[Context] = None) -> None:
+        """Drops cached values for one context, or for everyone."""
+        with self._lock:
+            if context is None:
+                self._cache.clear()
+            else:
+                user = context.fully_qualified_key
+                for key in [key for key in self._cache if key[0] == user]:
+                    del self._cache[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache hits, misses and client state."""
+        with self._lock:
+            return {
+                "initialized": self.client.is_initialized(),
+                "offline": self.offline,
+                "cached": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        """Flushes pending events and closes the SDK client."""
+        self.client.close()
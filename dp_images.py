@@ -0,0 +1,328 @@
+"""
+Thumbnail cache for Death Wall portraits.
+
+Wikidata portrait URLs point at full-resolution Wikimedia Commons originals,
+which are often several megabytes, while the Death Wall shows them 200px wide.
+This module fetches each original once, stores a resized JPEG thumbnail on
+disk, and evicts the least recently used thumbnails once the cache grows past
+its size limit.
+
+Thumbnails are served to Streamlit as bytes, and by the Flask app in
+``github_webhook.py`` at ``/thumbnail?url=...`` with long-lived cache headers.
+Only hosts in ``ALLOWED_IMAGE_HOSTS`` are fetched, so the route cannot be
+used as an open proxy.
+
+Streamlit and every gunicorn worker share the cache directory, each with its
+own in-memory index. The directory is the source of truth: a thumbnail
+another process built is picked up from disk instead of downloaded again,
+and eviction rescans the directory first, using file modification times
+(touched on every hit) as the shared LRU order.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from urllib.parse import urljoin, urlparse
+
+import requests
+from PIL import Image, ImageOps
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Thumbnail Constants
+CACHE_DIR = os.path.join(
+    os.environ.get(
+        "DEADPOOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "deadpool")
+    ),
+    "thumbnails",
+)
+ALLOWED_IMAGE_HOSTS = frozenset({"commons.wikimedia.org", "upload.wikimedia.org"})
+THUMBNAIL_WIDTH = 200
+THUMBNAIL_QUALITY = 85
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TIMEOUT = 10
+MAX_REDIRECTS = 5
+DEFAULT_WORKERS = 4
+RESCAN_INTERVAL = 60.0
+IMAGE_AGENT = "deadpool-app (https://github.com/broepke/deadpool-app)"
+
+
+class ThumbnailCache:
+    """Disk cache of resized portraits with size-based LRU eviction.
+
+    Example:
+        thumbnails = ThumbnailCache()
+        image_bytes = thumbnails.get(person.image_url)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        width: int = THUMBNAIL_WIDTH,
+        allowed_hosts: Iterable[str] = ALLOWED_IMAGE_HOSTS,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """Creates the cache directory and indexes existing thumbnails.
+
+        Args:
+            cache_dir: Directory holding thumbnails. Defaults to
+                $DEADPOOL_CACHE_DIR/thumbnails.
+            max_bytes: Size the cache is trimmed back to. Defaults to 200 MB.
+            width: Thumbnail width in pixels. Defaults to 200.
+            allowed_hosts: Hosts images may be fetched from. Defaults to
+                Wikimedia Commons.
+            timeout: Seconds per download. Defaults to 10.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.width = width
+        self.allowed_hosts = frozenset(allowed_hosts)
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = IMAGE_AGENT
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="thumbnails")
+        self._pending = set()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "evictions": 0,
+            "original_bytes": 0,
+            "thumbnail_bytes": 0,
+            "bytes_saved": 0,
+        }
+        # Original sizes of thumbnails built by this process, for bytes_saved
+        self._originals: Dict[str, int] = {}
+
+        # Size of every cached file, in least recently used order
+        self._sizes: Dict[str, int] = {}
+        self._total = 0
+        self._scanned_at = 0.0
+        self._rescan()
+
+    def _rescan(self) -> None:
+        """Re-indexes the directory, including files written by other processes.
+
+        Must be called without ``_lock`` held; the index is swapped in under it.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.endswith(".jpg") and os.path.isfile(path):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, name, stat.st_size))
+            except OSError:
+                # Evicted by another process while scanning
+                continue
+        sizes = {name: size for _, name, size in sorted(entries)}
+        with self._lock:
+            self._sizes = sizes
+            self._total = sum(sizes.values())
+            self._scanned_at = time.monotonic()
+
+    def is_allowed(self, url: str) -> bool:
+        """Returns True if the URL is http(s) on an allowed host."""
+        parsed = urlparse(url or "")
+        return parsed.scheme in ("http", "https") and parsed.hostname in self.allowed_hosts
+
+    def key(self, url: str) -> str:
+        """Returns the cache file name for an image URL at this width."""
+        return hashlib.sha1(f"{self.width}:{url}".encode("utf-8")).hexdigest() + ".jpg"
+
+    def source_url(self, url: str) -> str:
+        """Returns the URL to download for an image.
+
+        Commons ``Special:FilePath`` links accept a width, so Wikimedia sends
+        a pre-scaled image at twice the thumbnail width instead of the original.
+        """
+        if "Special:FilePath/" in url and "?" not in url:
+            return f"{url}?width={2 * self.width}"
+        return url
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Returns the thumbnail for an image URL, fetching it on a miss.
+
+        Args:
+            url: Original image URL
+
+        Returns:
+            bytes or None: JPEG thumbnail, or None if the URL is not allowed
+            or the image could not be fetched
+        """
+        if not self.is_allowed(url):
+            return None
+
+        name = self.key(url)
+        path = os.path.join(self.cache_dir, name)
+        with self._lock:
+            cached = name in self._sizes
+            if cached:
+                # Move to the most recently used end
+                self._sizes[name] = self._sizes.pop(name)
+        if not cached and os.path.isfile(path):
+            # Built by another process sharing the directory
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = None
+            if size is not None:
+                cached = True
+                with self._lock:
+                    self._total += size - self._sizes.pop(name, 0)
+                    self._sizes[name] = size
+        if cached:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+                with self._lock:
+                    self._metrics["hits"] += 1
+                    if name in self._originals:
+                        self._metrics["bytes_saved"] += self._originals[name] - len(data)
+                return data
+            except OSError:
+                with self._lock:
+                    self._total -= self._sizes.pop(name, 0)
+
+        self._count("misses")
+        try:
+            response = self._download(self.source_url(url))
+            data = self.resize(response.content)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Could not build thumbnail for {url}: {e}")
+            return None
+
+        self._store(name, data, len(response.content))
+        return data
+
+    def _download(self, url: str) -> requests.Response:
+        """Downloads an image, following only redirects to allowed hosts.
+
+        Each ``Location`` is checked before it is requested, so a redirect
+        off the allowlist is never fetched.
+
+        Raises:
+            ValueError: If a redirect leaves the allowed hosts or there are
+                more than MAX_REDIRECTS
+            requests.RequestException: If a request fails
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._session.get(url, timeout=self.timeout, allow_redirects=False)
+            if not response.is_redirect:
+                response.raise_for_status()
+                return response
+            url = urljoin(url, response.headers["Location"])
+            if not self.is_allowed(url):
+                raise ValueError(f"Redirected to a disallowed host: {url}")
+        raise ValueError(f"Too many redirects for {url}")
+
+    def peek(self, url: str) -> Optional[bytes]:
+        """Returns the thumbnail only if it is already cached; never downloads."""
+        with self._lock:
+            cached = self.is_allowed(url) and self.key(url) in self._sizes
+        return self.get(url) if cached else None
+
+    def prefetch(self, urls: Iterable[str]) -> int:
+        """Builds thumbnails for uncached URLs in the background.
+
+        Args:
+            urls: Original image URLs
+
+        Returns:
+            int: Number of downloads scheduled
+        """
+        scheduled = 0
+        for url in urls:
+            if not self.is_allowed(url):
+                continue
+            name = self.key(url)
+            with self._lock:
+                if name in self._sizes or name in self._pending:
+                    continue
+                self._pending.add(name)
+            future = self._executor.submit(self.get, url)
+            future.add_done_callback(lambda f, name=name: self._finish(name))
+            scheduled += 1
+        return scheduled
+
+    def _finish(self, name: str) -> None:
+        """Done callback of a prefetch; runs on a worker thread."""
+        with self._lock:
+            self._pending.discard(name)
+
+    def resize(self, original: bytes) -> bytes:
+        """Scales an image down to the thumbnail width and encodes it as JPEG."""
+        with Image.open(io.BytesIO(original)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.width > self.width:
+                height = max(1, round(image.height * self.width / image.width))
+                image = image.resize((self.width, height), Image.LANCZOS)
+            output = io.BytesIO()
+            image.convert("RGB").save(output, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+        return output.getvalue()
+
+    def _store(self, name: str, data: bytes, original_size: int) -> None:
+        """Writes a thumbnail atomically and evicts old ones over the size limit."""
+        path = os.path.join(self.cache_dir, name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._total += len(data) - self._sizes.pop(name, 0)
+            self._sizes[name] = len(data)
+            self._originals[name] = original_size
+            self._metrics["original_bytes"] += original_size
+            self._metrics["thumbnail_bytes"] += len(data)
+            self._metrics["bytes_saved"] += original_size - len(data)
+            rescan = (
+                self._total > self.max_bytes
+                or time.monotonic() - self._scanned_at > RESCAN_INTERVAL
+            )
+        if not rescan:
+            return
+
+        # Other processes write to the same directory: evict from its real contents
+        self._rescan()
+        evicted = []
+        with self._lock:
+            while self._total > self.max_bytes and len(self._sizes) > 1:
+                oldest = next(iter(self._sizes))
+                self._total -= self._sizes.pop(oldest)
+                self._originals.pop(oldest, None)
+                self._metrics["evictions"] += 1
+                evicted.append(oldest)
+
+        for oldest in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, oldest))
+            except OSError:
+                pass
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counts, cache size and bytes saved by serving thumbnails.
+
+        ``bytes_saved`` counts original minus thumbnail size for every
+        thumbnail served, including hits on thumbnails built by this process.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._sizes)
+            metrics["cached_bytes"] = self._total
+        return metrics
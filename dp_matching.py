@@ -0,0 +1,586 @@
+"""
+Name matching engine for the Deadpool application.
+
+The draft flow has to decide, on every submission, whether a typed celebrity
+name is already taken this year and whether the person already exists in the
+``people`` table. Scanning every row with a fuzzy scorer makes that check grow
+linearly with history, so this module keeps an in-memory index that is built
+once and updated incrementally.
+
+Functions and classes in this module handle:
+- Name normalization (case, accents, punctuation and token order)
+- Character n-gram blocking so only a small candidate set is scored
+- Best-match lookups that return the matched ID and its score
+- Bulk top-k candidate scoring of many query names in one call
+- Blocked, multi-process duplicate detection and clustering
+"""
+
+import logging
+import re
+import unicodedata
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Matching Constants
+DEFAULT_THRESHOLD = 85
+DEFAULT_NGRAM = 3
+DEFAULT_MAX_CANDIDATES = 64
+DEFAULT_MIN_GRAMS = 4
+DEFAULT_MAX_BLOCK_SIZE = 4096
+DEFAULT_TOP_K = 5
+DEFAULT_CHUNK_SIZE = 1024
+NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+
+class NameMatch(NamedTuple):
+    """Container for a single fuzzy match result."""
+
+    id: Any
+    name: str
+    score: float
+
+
+def normalize_name(value: str) -> str:
+    """Normalizes a name into the key used for matching.
+
+    Lowercases the text, folds accents ("Beyoncé" -> "beyonce"), replaces
+    punctuation with spaces and sorts the tokens so that "Smith, John" and
+    "John Smith" produce the same key. Comparing two keys with a plain ratio
+    is equivalent to FuzzyWuzzy's ``token_sort_ratio`` on the raw strings.
+
+    Args:
+        value (str): The raw name
+
+    Returns:
+        str: Normalized, token-sorted key (empty string for blank input)
+    """
+    if not isinstance(value, str):
+        return ""
+    folded = unicodedata.normalize("NFKD", value.lower())
+    if not folded.isascii():
+        folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(sorted(NON_ALPHANUMERIC.sub(" ", folded).split()))
+
+
+def name_ngrams(key: str, n: int = DEFAULT_NGRAM) -> Set[str]:
+    """Splits a normalized key into padded character n-grams.
+
+    Args:
+        key (str): A key produced by ``normalize_name``
+        n (int, optional): Size of each gram. Defaults to 3.
+
+    Returns:
+        set: Distinct n-grams of the padded key
+    """
+    if not key:
+        return set()
+    padded = f" {key} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i : i + n] for i in range(len(padded) - n + 1)}
+
+
+class NameIndex:
+    """Incrementally updatable fuzzy index over a name/ID column.
+
+    Every name is stored under its normalized key and an inverted index maps
+    each character n-gram to the positions of the names containing it. A
+    lookup reads the postings of the query's rarest n-grams, keeps the
+    ``max_candidates`` names sharing the most of them and only scores those,
+    so the cost depends on the size of the candidate block rather than on the
+    size of the table.
+
+    Example:
+        index = NameIndex.from_frame(df_people, "NAME", "ID")
+        match = index.best_match("Jon Smtih")
+        if match:
+            print(match.id, match.score)
+    """
+
+    def __init__(
+        self,
+        ngram: int = DEFAULT_NGRAM,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_candidates: int = DEFAULT_MAX_CANDIDATES,
+        min_grams: int = DEFAULT_MIN_GRAMS,
+        max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+    ):
+        """Creates an empty index.
+
+        Args:
+            ngram (int, optional): Size of the blocking n-grams. Defaults to 3.
+            threshold (float, optional): Default minimum score (0-100) for a
+                match. Defaults to 85.
+            max_candidates (int, optional): Number of best-overlapping names
+                that are scored per lookup. Defaults to 64.
+            min_grams (int, optional): Number of rarest query n-grams that are
+                always probed. Defaults to 4.
+            max_block_size (int, optional): Posting entries read per lookup
+                once ``min_grams`` have been probed. Defaults to 4096.
+        """
+        self.ngram = ngram
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.min_grams = min_grams
+        self.max_block_size = max_block_size
+        self._ids: List[Any] = []
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._alive = bytearray()
+        self._positions: Dict[Any, int] = {}
+        self._postings: Dict[str, array] = {}
+        self._size = 0
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        name_column: str = "NAME",
+        id_column: str = "ID",
+        **kwargs,
+    ) -> "NameIndex":
+        """Builds an index from two columns of a DataFrame.
+
+        Args:
+            df (pandas.DataFrame): Source data
+            name_column (str, optional): Column holding the names. Defaults to "NAME".
+            id_column (str, optional): Column holding the IDs. Defaults to "ID".
+            **kwargs: Passed through to the ``NameIndex`` constructor
+
+        Returns:
+            NameIndex: Index containing every row of ``df``
+        """
+        index = cls(**kwargs)
+        if len(df) > 0:
+            index.add_many(df[name_column].tolist(), df[id_column].tolist())
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, item_id: Any) -> bool:
+        return item_id in self._positions
+
+    def add(self, name: str, item_id: Any) -> None:
+        """Adds a name to the index, replacing any earlier entry for the same ID.
+
+        Args:
+            name (str): The display name
+            item_id: The ID to return when this name matches
+        """
+        if item_id in self._positions:
+            self.remove(item_id)
+
+        key = normalize_name(name)
+        position = len(self._ids)
+        self._ids.append(item_id)
+        self._names.append(name)
+        self._keys.append(key)
+        self._alive.append(1)
+        self._positions[item_id] = position
+        self._size += 1
+
+        for gram in name_ngrams(key, self.ngram):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("q")
+            postings.append(position)
+
+    def add_many(self, names: Iterable[str], ids: Iterable[Any]) -> None:
+        """Adds several names at once.
+
+        Args:
+            names (iterable): Display names
+            ids (iterable): IDs in the same order as ``names``
+        """
+        for name, item_id in zip(names, ids):
+            self.add(name, item_id)
+
+    def remove(self, item_id: Any) -> bool:
+        """Removes the entry for an ID.
+
+        The slot is only marked as dead so that removal stays O(1); posting
+        lists are compacted the next time ``compact`` is called.
+
+        Args:
+            item_id: The ID to remove
+
+        Returns:
+            bool: True if the ID was present
+        """
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return False
+        self._alive[position] = 0
+        self._size -= 1
+        return True
+
+    def compact(self) -> None:
+        """Rebuilds the internal storage without removed entries."""
+        live = [
+            (self._names[i], self._ids[i])
+            for i in range(len(self._ids))
+            if self._alive[i]
+        ]
+        self.__init__(
+            self.ngram,
+            self.threshold,
+            self.max_candidates,
+            self.min_grams,
+            self.max_block_size,
+        )
+        for name, item_id in live:
+            self.add(name, item_id)
+
+    def candidates(self, value: str) -> np.ndarray:
+        """Returns the positions of the names that share the most n-grams with a value.
+
+        Args:
+            value (str): The raw query name
+
+        Returns:
+            numpy.ndarray: Positions of up to ``max_candidates`` live entries
+        """
+        key = normalize_name(value)
+        grams = sorted(
+            (gram for gram in name_ngrams(key, self.ngram) if gram in self._postings),
+            key=lambda gram: len(self._postings[gram]),
+        )
+
+        # Probe the rarest n-grams first. Common grams ("joh", "son") only
+        # widen the block, so they are skipped once enough rare grams have
+        # been read and the posting budget is spent.
+        blocks = []
+        hits = 0
+        for i, gram in enumerate(grams):
+            postings = self._postings[gram]
+            if i >= self.min_grams and hits + len(postings) > self.max_block_size:
+                break
+            blocks.append(np.frombuffer(postings, dtype=np.int64))
+            hits += len(postings)
+        if not blocks:
+            return np.empty(0, dtype=np.int64)
+
+        positions, counts = np.unique(np.concatenate(blocks), return_counts=True)
+        alive = np.frombuffer(self._alive, dtype=np.uint8)[positions].astype(bool)
+        positions, counts = positions[alive], counts[alive]
+
+        if len(positions) > self.max_candidates:
+            top = np.argpartition(counts, -self.max_candidates)[-self.max_candidates :]
+            positions = positions[top]
+        return positions
+
+    def best_match(
+        self, value: str, threshold: Optional[float] = None
+    ) -> Optional[NameMatch]:
+        """Finds the best-scoring name for a value.
+
+        Args:
+            value (str): The raw query name
+            threshold (float, optional): Minimum score (0-100). Defaults to the
+                index threshold.
+
+        Returns:
+            NameMatch or None: The best match at or above the threshold
+        """
+        if threshold is None:
+            threshold = self.threshold
+        positions = self.candidates(value)
+        if len(positions) == 0:
+            return None
+
+        choices = [self._keys[i] for i in positions]
+        result = process.extractOne(
+            normalize_name(value), choices, scorer=fuzz.ratio, score_cutoff=threshold
+        )
+        if result is None:
+            return None
+
+        _, score, choice_index = result
+        position = int(positions[choice_index])
+        return NameMatch(self._ids[position], self._names[position], score)
+
+    def has_match(self, value: str, threshold: Optional[float] = None) -> bool:
+        """Checks whether any indexed name matches a value.
+
+        Args:
+            value (str): The raw query name
+            threshold (float, optional): Minimum score (0-100). Defaults to the
+                index threshold.
+
+        Returns:
+            bool: True if a match at or above the threshold exists
+        """
+        return self.best_match(value, threshold) is not None
+
+
+def top_k_matches(
+    queries: Sequence[str],
+    reference_names: Sequence[str],
+    reference_ids: Optional[Sequence[Any]] = None,
+    k: int = DEFAULT_TOP_K,
+    threshold: float = 0,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[List[NameMatch]]:
+    """Scores N query names against M reference names and keeps the top k per query.
+
+    All names are normalized once and the N x M similarity matrix is computed
+    in bulk by RapidFuzz's ``cdist`` (C++), optionally on every CPU core.
+    Queries are processed ``chunk_size`` rows at a time so the matrix never
+    holds more than ``chunk_size x M`` scores, and the top k of each row are
+    selected with a partial sort.
+
+    Args:
+        queries (sequence): Names to look up
+        reference_names (sequence): Names to match against
+        reference_ids (sequence, optional): IDs aligned with ``reference_names``.
+            Defaults to the reference positions.
+        k (int, optional): Candidates to return per query. Defaults to 5.
+        threshold (float, optional): Minimum score (0-100) for a candidate.
+            Defaults to 0.
+        workers (int, optional): Number of threads for the scoring, -1 for
+            all CPU cores. Defaults to 1.
+        chunk_size (int, optional): Query rows scored per batch. Defaults to 1024.
+
+    Returns:
+        list: One list per query of up to ``k`` NameMatch tuples, best first
+    """
+    if reference_ids is None:
+        reference_ids = range(len(reference_names))
+    if len(reference_names) != len(reference_ids):
+        raise ValueError("reference_names and reference_ids must be the same length")
+
+    results: List[List[NameMatch]] = []
+    if not len(reference_names) or k <= 0:
+        return [[] for _ in queries]
+
+    choices = [normalize_name(name) for name in reference_names]
+    keys = [normalize_name(query) for query in queries]
+    k = min(k, len(choices))
+
+    for start in range(0, len(keys), chunk_size):
+        scores = process.cdist(
+            keys[start : start + chunk_size],
+            choices,
+            scorer=fuzz.ratio,
+            dtype=np.float32,
+            workers=workers,
+        )
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        for row_positions, row_scores in zip(top, top_scores):
+            results.append(
+                [
+                    NameMatch(
+                        reference_ids[position],
+                        reference_names[position],
+                        round(float(score), 2),
+                    )
+                    for position, score in zip(row_positions, row_scores)
+                    if score >= threshold
+                ]
+            )
+
+    return results
+
+
+def blocking_keys(key: str) -> Set[str]:
+    """Returns the blocking keys used to group probable duplicates.
+
+    Every pair of tokens contributes the combinations of their three-letter
+    prefixes and suffixes, so a typo at either end of a token still leaves a
+    shared key. Single-token names fall back to their own prefix and suffix.
+
+    Args:
+        key (str): A key produced by ``normalize_name``
+
+    Returns:
+        set: Blocking keys for the name
+    """
+    tokens = key.split()
+    if not tokens:
+        return set()
+    if len(tokens) == 1:
+        token = tokens[0]
+        return {f"{token[:3]}*", f"*{token[-3:]}"}
+
+    keys = set()
+    for i in range(len(tokens)):
+        for j in range(i + 1, len(tokens)):
+            first, second = tokens[i], tokens[j]
+            for a in (first[:3], first[-3:]):
+                for b in (second[:3], second[-3:]):
+                    keys.add(f"{a}|{b}")
+    return keys
+
+
+def _prepare_names(names: List[str]) -> tuple:
+    """Normalizes a chunk of names and lists their blocking keys.
+
+    Runs inside worker processes, so it only receives and returns plain data.
+
+    Args:
+        names (list): Raw names for one chunk
+
+    Returns:
+        tuple: (normalized keys, block keys, chunk-local positions)
+    """
+    keys = [normalize_name(name) for name in names]
+    block_keys, positions = [], []
+    for position, key in enumerate(keys):
+        for block_key in blocking_keys(key):
+            block_keys.append(block_key)
+            positions.append(position)
+    return keys, block_keys, positions
+
+
+def find_duplicate_pairs(
+    names: Sequence[str],
+    threshold: float = 90,
+    workers: Optional[int] = None,
+    max_block_size: int = 1000,
+    chunk_size: int = 50_000,
+) -> pd.DataFrame:
+    """Finds probable duplicate names without comparing every pair.
+
+    Names are normalized and assigned ``blocking_keys`` in chunks across
+    worker processes, and only names sharing a block become candidate pairs.
+    Blocks larger than ``max_block_size`` are sorted and split into
+    overlapping windows (sorted neighbourhood) so no block grows
+    quadratically. The distinct candidate pairs are then scored element-wise
+    in one RapidFuzz ``cpdist`` call.
+
+    Args:
+        names (sequence): Names to check
+        threshold (float, optional): Minimum score (0-100) for a duplicate pair.
+            Defaults to 90.
+        workers (int, optional): Worker processes (and scoring threads); None
+            uses every CPU core and 1 runs in the current process.
+            Defaults to None.
+        max_block_size (int, optional): Largest block scored as a whole.
+            Defaults to 1000.
+        chunk_size (int, optional): Names prepared per worker task.
+            Defaults to 50,000.
+
+    Returns:
+        pandas.DataFrame: LEFT and RIGHT positions into ``names`` with SCORE,
+            one row per distinct pair with LEFT < RIGHT
+    """
+    names = list(names)
+    chunks = [names[i : i + chunk_size] for i in range(0, len(names), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        prepared = [_prepare_names(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            prepared = list(executor.map(_prepare_names, chunks))
+
+    keys: List[str] = []
+    block_keys: List[str] = []
+    positions: List[np.ndarray] = []
+    for offset, (chunk_keys, chunk_blocks, chunk_positions) in zip(
+        range(0, len(names), chunk_size), prepared
+    ):
+        keys.extend(chunk_keys)
+        block_keys.extend(chunk_blocks)
+        positions.append(np.asarray(chunk_positions, dtype=np.int64) + offset)
+
+    empty = pd.DataFrame({"LEFT": [], "RIGHT": [], "SCORE": []}, dtype=np.int64)
+    if not block_keys:
+        return empty
+
+    df_blocks = pd.DataFrame(
+        {"BLOCK": block_keys, "POSITION": np.concatenate(positions)}
+    )
+    df_blocks["BLOCK"] = df_blocks["BLOCK"].astype("category").cat.codes
+    df_blocks["SIZE"] = df_blocks.groupby("BLOCK")["POSITION"].transform("size")
+    df_blocks = df_blocks[df_blocks["SIZE"] > 1]
+
+    # Split oversized blocks into half-overlapping windows of sorted keys
+    step = max(1, max_block_size // 2)
+    large = df_blocks["SIZE"] > max_block_size
+    if large.any():
+        df_large = df_blocks[large].assign(
+            KEY=lambda df: [keys[i] for i in df["POSITION"]]
+        )
+        df_large = df_large.sort_values(["BLOCK", "KEY"])
+        rank = df_large.groupby("BLOCK").cumcount() // step
+        offset = int(df_blocks["BLOCK"].max()) + 1
+        window = df_large["BLOCK"].astype(np.int64) * (len(names) // step + 2) + offset
+        df_blocks = pd.concat(
+            [
+                df_blocks[~large][["BLOCK", "POSITION"]],
+                pd.DataFrame({"BLOCK": window + rank, "POSITION": df_large["POSITION"]}),
+                pd.DataFrame(
+                    {"BLOCK": window + rank + 1, "POSITION": df_large["POSITION"]}
+                ),
+            ]
+        )
+
+    df_pairs = df_blocks[["BLOCK", "POSITION"]].merge(
+        df_blocks[["BLOCK", "POSITION"]], on="BLOCK", suffixes=("_LEFT", "_RIGHT")
+    )
+    df_pairs = df_pairs[df_pairs["POSITION_LEFT"] < df_pairs["POSITION_RIGHT"]]
+    df_pairs = df_pairs.drop_duplicates(["POSITION_LEFT", "POSITION_RIGHT"])
+    if df_pairs.empty:
+        return empty
+
+    left = df_pairs["POSITION_LEFT"].to_numpy()
+    right = df_pairs["POSITION_RIGHT"].to_numpy()
+    scores = process.cpdist(
+        [keys[i] for i in left],
+        [keys[i] for i in right],
+        scorer=fuzz.ratio,
+        dtype=np.uint8,
+        score_cutoff=threshold,
+        workers=-1 if workers is None else workers,
+    )
+    keep = scores > 0
+    logger.info(
+        f"Scored {len(left)} candidate pairs for {len(names)} names, "
+        f"found {int(keep.sum())} duplicate pairs"
+    )
+    return pd.DataFrame(
+        {"LEFT": left[keep], "RIGHT": right[keep], "SCORE": scores[keep].astype(np.int64)}
+    )
+
+
+def cluster_duplicates(pairs: pd.DataFrame, size: int) -> List[List[int]]:
+    """Groups duplicate pairs into clusters with union-find.
+
+    Args:
+        pairs (pandas.DataFrame): Output of ``find_duplicate_pairs``
+        size (int): Number of names the positions refer to
+
+    Returns:
+        list: Clusters of two or more positions, each sorted ascending
+    """
+    parent = list(range(size))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for left, right in zip(pairs["LEFT"], pairs["RIGHT"]):
+        root_left, root_right = find(int(left)), find(int(right))
+        if root_left != root_right:
+            parent[max(root_left, root_right)] = min(root_left, root_right)
+
+    clusters: Dict[int, List[int]] = {}
+    for position in set(pairs["LEFT"]).union(pairs["RIGHT"]):
+        clusters.setdefault(find(int(position)), []).append(int(position))
+    return [sorted(members) for members in clusters.values() if len(members) > 1]
@@ -0,0 +1,250 @@
+"""
+Aggregates for the Notable Names Database (NNDB) statistics page.
+
+The NNDB page shows the age distribution of deceased celebrities and its
+descriptive statistics. Instead of downloading every deceased row and
+letting the chart count them in the browser, Snowflake returns one row per
+distinct age with its count. The statistics are then derived from those
+counts with NumPy, matching ``pandas.Series.describe`` on the raw ages.
+
+NNDB data changes at most daily, so ``jobs/nndb_snapshot.py`` computes all
+of the page's aggregates into one snapshot file each night. The file is an
+Arrow IPC file with one row per aggregate: its NAME and PAYLOAD, the
+aggregate serialized as an Arrow IPC stream. The nndb data version and the
+creation time are stored in the schema metadata. The page memory-maps the
+file and only queries Snowflake when no fresh snapshot exists.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Final, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dp_utilities import get_table_version, run_snowflake_query
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# NNDB Constants
+MAX_AGE: Final[int] = 100
+TOP_PREDICTIONS: Final[int] = 20
+
+# Snapshot Constants
+SNAPSHOT_FORMAT: Final[str] = "1"
+SNAPSHOT_PATH: Final[str] = os.path.join(
+    os.environ.get(
+        "DEADPOOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "deadpool")
+    ),
+    "nndb_snapshot.arrow",
+)
+MAX_SNAPSHOT_AGE: Final[int] = 3 * 24 * 3600
+
+SQL_AGE_HISTOGRAM: Final[str] = """
+SELECT AGE, COUNT(*) AS COUNT
+FROM nndb
+WHERE DEATH_DATE IS NOT NULL
+AND AGE < %(max_age)s
+GROUP BY AGE
+ORDER BY AGE
+"""
+
+SQL_OCCUPATION_RATIO: Final[str] = """
+SELECT
+    OCCUPATION,
+    COUNT(CASE WHEN DEATH_DATE IS NOT NULL THEN 1 END) AS DECEASED_COUNT,
+    COUNT(CASE WHEN DEATH_DATE IS NOT NULL THEN 1 END) /
+    NULLIF(COUNT(CASE WHEN DEATH_DATE IS NULL THEN 1 END), 0) AS RATIO
+FROM DEADPOOL.PROD.NNDB
+WHERE OCCUPATION IS NOT NULL
+GROUP BY 1
+ORDER BY 2 DESC
+LIMIT 15
+"""
+
+SQL_RISK_FACTORS: Final[str] = """
+SELECT NAME, RISK_FACTORS, AGE
+FROM DEADPOOL.PROD.NNDB
+WHERE RISK_FACTORS IS NOT NULL
+AND DEATH_DATE IS NULL
+AND AGE IS NOT NULL
+AND AGE < 101
+GROUP BY 1, 2, 3
+ORDER BY 3 DESC
+LIMIT 200
+"""
+
+SQL_TOP_PREDICTIONS: Final[str] = """
+SELECT * EXCLUDE (ID, IS_DECEASED)
+FROM nndb_predictions
+ORDER BY PREDICTION DESC
+LIMIT %(limit)s
+"""
+
+
+class AggregateQuery(NamedTuple):
+    """One aggregate shown on the NNDB page."""
+
+    sql: str
+    params: Optional[Dict]
+    table: str
+
+
+# Every aggregate the page shows, by snapshot NAME
+AGGREGATES: Final[Dict[str, AggregateQuery]] = {
+    "age_histogram": AggregateQuery(SQL_AGE_HISTOGRAM, {"max_age": MAX_AGE}, "nndb"),
+    "occupation_ratio": AggregateQuery(SQL_OCCUPATION_RATIO, None, "nndb"),
+    "risk_factors": AggregateQuery(SQL_RISK_FACTORS, None, "nndb"),
+    "predictions": AggregateQuery(
+        SQL_TOP_PREDICTIONS, {"limit": TOP_PREDICTIONS}, "nndb_predictions"
+    ),
+}
+
+
+class NNDBSnapshot(NamedTuple):
+    """Aggregates read from a snapshot file."""
+
+    version: str
+    created_at: float
+    frames: Dict[str, pd.DataFrame]
+
+
+def describe_histogram(ages, counts) -> pd.Series:
+    """Computes ``Series.describe()`` statistics from value counts.
+
+    Quantiles use the same linear interpolation as pandas. The element at
+    each rank is found with a binary search over the cumulative counts, so
+    the raw values are never expanded.
+
+    Args:
+        ages: Distinct values, in ascending order
+        counts: Number of rows with each value
+
+    Returns:
+        pandas.Series: count, mean, std, min, 25%, 50%, 75% and max
+    """
+    ages = np.asarray(ages, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    index = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    total = int(counts.sum())
+    if total == 0:
+        return pd.Series([0.0] + [np.nan] * 7, index=index, name="AGE")
+
+    mean = float(np.dot(ages, counts) / total)
+    std = (
+        float(np.sqrt(np.dot(counts, (ages - mean) ** 2) / (total - 1)))
+        if total > 1
+        else np.nan
+    )
+
+    # Value at 0-based rank k in the sorted expansion of the histogram
+    cumulative = np.cumsum(counts)
+    positions = np.array([0.25, 0.5, 0.75]) * (total - 1)
+    lower = ages[np.searchsorted(cumulative, np.floor(positions), side="right")]
+    upper = ages[np.searchsorted(cumulative, np.ceil(positions), side="right")]
+    quartiles = lower + (upper - lower) * (positions - np.floor(positions))
+
+    return pd.Series(
+        [float(total), mean, std, ages[0], *quartiles, ages[-1]], index=index, name="AGE"
+    )
+
+
+def compute_aggregates(_conn) -> Dict[str, pa.Table]:
+    """Runs every NNDB page aggregate in Snowflake.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+
+    Returns:
+        dict: Aggregate name to Arrow table
+    """
+    return {
+        name: run_snowflake_query(_conn, query.sql, as_arrow=True, params=query.params)
+        for name, query in AGGREGATES.items()
+    }
+
+
+def write_snapshot(tables: Dict[str, pa.Table], version: str, path: str = SNAPSHOT_PATH) -> int:
+    """Writes aggregates to one snapshot file, replacing it atomically.
+
+    Args:
+        tables: Aggregate name to Arrow table
+        version: Data version of the source tables
+        path: Snapshot file. Defaults to SNAPSHOT_PATH.
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    payloads = []
+    for table in tables.values():
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        payloads.append(sink.getvalue().to_pybytes())
+
+    snapshot = pa.table(
+        {"NAME": pa.array(list(tables), pa.string()), "PAYLOAD": pa.array(payloads, pa.binary())}
+    ).replace_schema_metadata(
+        {"format": SNAPSHOT_FORMAT, "version": version, "created_at": str(time.time())}
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, snapshot.schema) as writer:
+            writer.write_table(snapshot)
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def read_snapshot(path: str = SNAPSHOT_PATH, max_age: float = MAX_SNAPSHOT_AGE) -> Optional[NNDBSnapshot]:
+    """Reads a snapshot through a memory map.
+
+    Args:
+        path: Snapshot file. Defaults to SNAPSHOT_PATH.
+        max_age: Seconds after which a snapshot counts as missing. Defaults
+            to 3 days, so a failing nightly job falls back to live queries.
+
+    Returns:
+        NNDBSnapshot or None: The aggregates, or None if the file is missing,
+        stale, unreadable or from another format
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            snapshot = pa.ipc.open_file(source).read_all()
+            metadata = {k.decode(): v.decode() for k, v in (snapshot.schema.metadata or {}).items()}
+            if metadata.get("format") != SNAPSHOT_FORMAT:
+                logger.warning(f"Ignoring NNDB snapshot with format {metadata.get('format')}")
+                return None
+            created_at = float(metadata["created_at"])
+            if time.time() - created_at > max_age:
+                logger.warning("Ignoring stale NNDB snapshot")
+                return None
+
+            # Payloads are zero-copy slices of the mapped file
+            frames = {}
+            for name, payload in zip(snapshot["NAME"].to_pylist(), snapshot["PAYLOAD"]):
+                frames[name] = pa.ipc.open_stream(payload.as_buffer()).read_all().to_pandas()
+    except Exception as e:
+        logger.warning(f"Could not read NNDB snapshot {path}: {e}")
+        return None
+    return NNDBSnapshot(metadata["version"], created_at, frames)
+
+
+def build_snapshot(_conn, path: str = SNAPSHOT_PATH) -> int:
+    """Computes every aggregate and writes the snapshot file.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        path: Snapshot file. Defaults to SNAPSHOT_PATH.
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    version = get_table_version(_conn, "nndb") or "unknown"
+    return write_snapshot(compute_aggregates(_conn), version, path)
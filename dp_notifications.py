@@ -0,0 +1,248 @@
+"""
+Background SMS notification dispatcher for the Deadpool application.
+
+Draft picks and deaths are announced to every opted-in player by SMS. Sending
+those messages one after another inside the request made the drafter wait for
+Twilio before seeing the result of their pick. This module queues messages
+instead and delivers them from a bounded pool of worker threads.
+
+Features:
+- Callers only enqueue and get one future per destination back
+- Identical destinations are sent once per message
+- Per-destination rate limiting
+- Retries with exponential backoff for transient errors
+- A per-message DeliveryResult (SID, status, attempts, error)
+- A fake transport for offline tests and benchmarks
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from twilio.rest import Client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Dispatcher Constants
+SMS_FROM_NUMBER = "+18449891781"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 500
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+
+class DeliveryResult(NamedTuple):
+    """Outcome of delivering one message to one destination."""
+
+    to: str
+    status: str  # "sent" or "failed"
+    sid: Optional[str]
+    attempts: int
+    error: Optional[str]
+    seconds: float
+
+
+class TwilioTransport:
+    """Sends SMS through one reusable Twilio client."""
+
+    def __init__(self, account_sid: str, auth_token: str, from_number: str = SMS_FROM_NUMBER):
+        """Creates the Twilio client.
+
+        Args:
+            account_sid: Twilio account SID
+            auth_token: Twilio auth token
+            from_number: Sending phone number. Defaults to SMS_FROM_NUMBER.
+        """
+        self.client = Client(account_sid, auth_token)
+        self.from_number = from_number
+
+    def send(self, to: str, body: str) -> str:
+        """Sends one message and returns its SID."""
+        message = self.client.messages.create(from_=self.from_number, body=body, to=to)
+        return message.sid
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Retries rate limiting, server errors and network failures only."""
+        status = getattr(error, "status", None)
+        return status is None or status == 429 or status >= 500
+
+
+class FakeTransport:
+    """In-memory transport with configurable latency and failure rate.
+
+    Used for tests and for benchmarking the dispatcher offline.
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        """Creates the fake transport.
+
+        Args:
+            latency: Seconds each send takes. Defaults to 0.
+            failure_rate: Probability (0-1) that a send raises. Defaults to 0.
+            seed: Seed for the failure draws. Defaults to 0.
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.sent: List[Tuple[str, str, float]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, to: str, body: str) -> str:
+        """Records the message after sleeping for the configured latency."""
+        time.sleep(self.latency)
+        with self._lock:
+            if self._random.random() < self.failure_rate:
+                raise ConnectionError(f"Simulated failure sending to {to}")
+            self.sent.append((to, body, time.monotonic()))
+            return f"SM{len(self.sent):032d}"
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        return True
+
+
+class NotificationDispatcher:
+    """Delivers SMS messages from a bounded pool of background workers.
+
+    Example:
+        dispatcher = NotificationDispatcher(FakeTransport())
+        futures = dispatcher.send("Draft is open", ["+15552229999"])
+        results = [f.result() for f in futures]
+    """
+
+    def __init__(
+        self,
+        transport,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        """Creates the dispatcher and its worker pool.
+
+        Args:
+            transport: Object with ``send(to, body) -> sid`` and
+                ``is_retryable(error) -> bool``
+            workers: Number of delivery threads. Defaults to 4.
+            max_pending: Messages that may be queued or in flight before
+                ``send`` blocks. Defaults to 500.
+            min_interval: Minimum seconds between two messages to the same
+                destination. Defaults to 1.0.
+            max_retries: Attempts per message, including the first.
+                Defaults to 3.
+            backoff: Delay before the first retry in seconds, doubled after
+                each further failure. Defaults to 1.0.
+        """
+        self.transport = transport
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sms-dispatch"
+        )
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._metrics = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "deduplicated": 0}
+
+    def send(self, body: str, destinations: List[str]) -> List[Future]:
+        """Queues one message for a list of destinations and returns immediately.
+
+        Destinations are stripped and deduplicated, and a message that is
+        already queued for a destination is not queued a second time.
+
+        Args:
+            body: The body of the message
+            destinations: Phone numbers in the format +15552229999
+
+        Returns:
+            list: One Future per distinct destination resolving to a DeliveryResult
+        """
+        futures = []
+        seen = set()
+        for to in destinations:
+            to = (to or "").strip()
+            if not to or to in seen:
+                if to:
+                    self._count("deduplicated")
+                continue
+            seen.add(to)
+
+            key = (to, body)
+            with self._lock:
+                existing = self._in_flight.get(key)
+            if existing is not None:
+                self._count("deduplicated")
+                futures.append(existing)
+                continue
+
+            self._pending.acquire()
+            future = self._executor.submit(self._deliver, to, body)
+            with self._lock:
+                self._in_flight[key] = future
+            future.add_done_callback(lambda f, key=key: self._finished(key))
+            self._count("queued")
+            futures.append(future)
+        return futures
+
+    def _finished(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+        self._pending.release()
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def _wait_for_slot(self, to: str) -> None:
+        """Sleeps until the destination's rate limit allows another message."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(to, now))
+            self._next_slot[to] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _deliver(self, to: str, body: str) -> DeliveryResult:
+        """Sends one message with retries; runs on a worker thread."""
+        started = time.monotonic()
+        delay = self.backoff
+        error = None
+        for attempt in range(1, self.max_retries + 1):
+            self._wait_for_slot(to)
+            try:
+                sid = self.transport.send(to, body)
+                self._count("sent")
+                return DeliveryResult(to, "sent", sid, attempt, None, time.monotonic() - started)
+            except Exception as e:
+                error = e
+                if attempt == self.max_retries or not self.transport.is_retryable(e):
+                    break
+                self._count("retries")
+                logger.warning(f"SMS to {to} failed (attempt {attempt}), retrying: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_BACKOFF)
+
+        self._count("failed")
+        logger.error(f"SMS to {to} failed after {attempt} attempts: {error}")
+        return DeliveryResult(to, "failed", None, attempt, str(error), time.monotonic() - started)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns queued, sent, failed, retried and deduplicated message counts."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["in_flight"] = len(self._in_flight)
+        return metrics
+
+    def close(self, wait: bool = True) -> None:
+        """Stops accepting messages and optionally waits for queued ones."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,302 @@
+"""
+Process-wide cache of the ``people`` table for the Deadpool application.
+
+Every draft submission needs to know whether a typed name already exists in
+``people``. Rather than downloading the whole table per pick, this module
+keeps one in-memory copy of the ID, NAME, WIKI_ID and WIKI_PAGE columns per
+process, backed by a ``dp_matching.NameIndex``, and keeps it current with
+small delta queries.
+
+Refreshes use Snowflake's CHANGES clause from the last high-water mark, which
+requires change tracking on the table:
+
+    ALTER TABLE people SET CHANGE_TRACKING = TRUE;
+
+If the delta query fails because the mark is older than the retention
+period, the cache falls back to a full reload. If change tracking is off on
+the table, delta queries are disabled for the life of the process. Full
+reloads are then throttled to one per ``FULL_RELOAD_INTERVAL``; in between,
+lookups are served from the cache plus write-through ``upsert`` calls.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+import streamlit as st
+
+from dp_matching import NameIndex, NameMatch
+from dp_utilities import iter_result_chunks
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Cache Constants
+MIN_REFRESH_INTERVAL = 2.0
+FULL_RELOAD_INTERVAL = 300.0
+
+# SQL Queries
+SQL_CURRENT_TIMESTAMP = "SELECT CURRENT_TIMESTAMP()"
+
+SQL_PEOPLE_CHANGE_TRACKING = "SHOW TABLES LIKE 'PEOPLE'"
+
+SQL_PEOPLE_SNAPSHOT = """
+SELECT ID, NAME, WIKI_ID, WIKI_PAGE
+FROM people AT(TIMESTAMP => TO_TIMESTAMP_LTZ(%s))
+"""
+
+SQL_PEOPLE_CHANGES = """
+SELECT ID, NAME, WIKI_ID, WIKI_PAGE, METADATA$ACTION AS ACTION
+FROM people
+    CHANGES(INFORMATION => DEFAULT)
+    AT(TIMESTAMP => TO_TIMESTAMP_LTZ(%s))
+    END(TIMESTAMP => TO_TIMESTAMP_LTZ(%s))
+"""
+
+
+class PersonRecord(NamedTuple):
+    """Container for the cached columns of one person."""
+
+    id: str
+    name: str
+    wiki_id: Optional[str]
+    wiki_page: Optional[str]
+
+
+class PeopleCache:
+    """In-memory people table with a fuzzy name index and delta refreshes.
+
+    Instances are shared by every session in the process (see
+    ``get_people_cache``), so all methods are guarded by a lock. Refreshes
+    are serialized by a second lock, and a full reload builds the new
+    records and index before swapping them in, so lookups are never blocked
+    by a reload or served from a half-loaded cache.
+    """
+
+    def __init__(
+        self,
+        min_refresh_interval: float = MIN_REFRESH_INTERVAL,
+        full_reload_interval: float = FULL_RELOAD_INTERVAL,
+    ):
+        """Creates an empty cache; the first ``refresh`` loads the table.
+
+        Args:
+            min_refresh_interval (float, optional): Seconds during which a
+                repeated ``refresh`` is skipped. Defaults to 2.0.
+            full_reload_interval (float, optional): Minimum seconds between
+                full reloads after the first one. Defaults to 300.
+        """
+        self.min_refresh_interval = min_refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._records: Dict[Any, PersonRecord] = {}
+        self._index = NameIndex()
+        self._high_water_mark: Optional[str] = None
+        self._refreshed_at = 0.0
+        self._full_loaded_at = 0.0
+        self._delta_supported = True
+        self.full_loads = 0
+        self.delta_loads = 0
+        self.delta_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Server timestamp the cache is known to be current as of."""
+        return self._high_water_mark
+
+    def refresh(self, _conn, force: bool = False) -> int:
+        """Brings the cache up to date with Snowflake.
+
+        The first call loads the table; later calls only fetch the rows
+        inserted, updated or deleted since the high-water mark. If a load
+        fails, the cache and its high-water mark are left unchanged.
+
+        Args:
+            _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+            force (bool, optional): Refresh even within ``min_refresh_interval``.
+                Defaults to False.
+
+        Returns:
+            int: Number of rows fetched
+        """
+        with self._refresh_lock:
+            if (
+                not force
+                and self._high_water_mark is not None
+                and time.monotonic() - self._refreshed_at < self.min_refresh_interval
+            ):
+                return 0
+
+            with _conn.cursor() as cur:
+                cur.execute(SQL_CURRENT_TIMESTAMP)
+                now = str(cur.fetchone()[0])
+
+            if self._high_water_mark is not None and self._delta_supported:
+                try:
+                    fetched = self._load_changes(_conn, self._high_water_mark, now)
+                    self._high_water_mark = now
+                    self._refreshed_at = time.monotonic()
+                    return fetched
+                except Exception as e:
+                    self.delta_failures += 1
+                    logger.warning(f"People delta refresh failed: {str(e)}")
+                    if not self._change_tracking_enabled(_conn):
+                        self._delta_supported = False
+                        logger.warning(
+                            "Change tracking is off on people, using throttled full reloads"
+                        )
+
+            # Full reload, at most once per full_reload_interval after the first
+            self._refreshed_at = time.monotonic()
+            if (
+                self._high_water_mark is not None
+                and time.monotonic() - self._full_loaded_at < self.full_reload_interval
+            ):
+                return 0
+            fetched = self._load_all(_conn, now)
+            self._high_water_mark = now
+            return fetched
+
+    def _change_tracking_enabled(self, _conn) -> Optional[bool]:
+        """Checks whether change tracking is on for people, None if unknown."""
+        try:
+            with _conn.cursor() as cur:
+                cur.execute(SQL_PEOPLE_CHANGE_TRACKING)
+                columns = [column[0].lower() for column in cur.description]
+                rows = cur.fetchall()
+        except Exception as e:
+            logger.warning(f"Could not check change tracking on people: {str(e)}")
+            return None
+        if "change_tracking" not in columns:
+            return None
+        position = columns.index("change_tracking")
+        return any(str(row[position]).upper() == "ON" for row in rows)
+
+    def _load_all(self, _conn, as_of: str) -> int:
+        """Replaces the cache with the table contents as of a timestamp.
+
+        The records and index are built aside and swapped in only once the
+        whole snapshot was read, so a failed load leaves the cache intact.
+        """
+        records: Dict[Any, PersonRecord] = {}
+        index = NameIndex()
+
+        # Stream the snapshot so the index is built without a full copy in memory
+        fetched = 0
+        with _conn.cursor() as cur:
+            cur.execute(SQL_PEOPLE_SNAPSHOT, (as_of,))
+            for chunk in iter_result_chunks(cur):
+                for row in chunk.itertuples(index=False, name=None):
+                    record = PersonRecord(*row)
+                    records[record.id] = record
+                    index.add(record.name, record.id)
+                fetched += len(chunk)
+
+        with self._lock:
+            self._records = records
+            self._index = index
+        self._full_loaded_at = time.monotonic()
+        self.full_loads += 1
+        logger.info(f"People cache loaded {fetched} rows")
+        return fetched
+
+    def _load_changes(self, _conn, since: str, until: str) -> int:
+        """Applies the rows changed between two timestamps.
+
+        Updates arrive as a DELETE of the old row and an INSERT of the new
+        one, so deletes are applied before inserts.
+        """
+        with _conn.cursor() as cur:
+            cur.execute(SQL_PEOPLE_CHANGES, (since, until))
+            rows = cur.fetchall()
+
+        with self._lock:
+            for *values, action in rows:
+                if action == "DELETE":
+                    self._drop(values[0])
+            for *values, action in rows:
+                if action == "INSERT":
+                    self._put(PersonRecord(*values))
+
+        self.delta_loads += 1
+        logger.debug(f"People cache applied {len(rows)} changed rows")
+        return len(rows)
+
+    def _put(self, record: PersonRecord) -> None:
+        self._records[record.id] = record
+        self._index.add(record.name, record.id)
+
+    def _drop(self, person_id: Any) -> None:
+        self._records.pop(person_id, None)
+        self._index.remove(person_id)
+
+    def upsert(
+        self,
+        person_id: Any,
+        name: str,
+        wiki_page: Optional[str] = None,
+        wiki_id: Optional[str] = None,
+    ) -> None:
+        """Applies a committed insert or update to the cache (write-through).
+
+        Call this after the transaction writing to ``people`` commits so the
+        next lookup sees the row without waiting for a refresh.
+
+        Args:
+            person_id: ID of the person
+            name (str): Name of the person
+            wiki_page (str, optional): Wikipedia page slug
+            wiki_id (str, optional): Wikidata ID
+        """
+        with self._lock:
+            previous = self._records.get(person_id)
+            if previous is not None:
+                wiki_page = wiki_page if wiki_page is not None else previous.wiki_page
+                wiki_id = wiki_id if wiki_id is not None else previous.wiki_id
+            self._put(PersonRecord(person_id, name, wiki_id, wiki_page))
+
+    def get(self, person_id: Any) -> Optional[PersonRecord]:
+        """Returns the cached record for an ID.
+
+        Args:
+            person_id: ID of the person
+
+        Returns:
+            PersonRecord or None: The cached row
+        """
+        return self._records.get(person_id)
+
+    def best_match(self, name: str, threshold: float = 85) -> Optional[NameMatch]:
+        """Finds the best fuzzy match for a name among all cached people.
+
+        Args:
+            name (str): The name to look up
+            threshold (float, optional): Minimum score (0-100). Defaults to 85.
+
+        Returns:
+            NameMatch or None: The best match at or above the threshold
+        """
+        with self._lock:
+            return self._index.best_match(name, threshold)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns the cached rows as a DataFrame with the table's column names."""
+        with self._lock:
+            records: List[PersonRecord] = list(self._records.values())
+        return pd.DataFrame(records, columns=["ID", "NAME", "WIKI_ID", "WIKI_PAGE"])
+
+
+@st.cache_resource
+def get_people_cache() -> PeopleCache:
+    """Returns the process-wide people cache shared by every session.
+
+    Returns:
+        PeopleCache: The shared cache (empty until its first ``refresh``)
+    """
+    return PeopleCache()
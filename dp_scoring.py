@@ -0,0 +1,558 @@
+"""
+Scoring engine for Deadpool standings.
+
+Computes per-player standings from picks the same way the score views
+(``score_current_year``, ``score_twenty_four``, ``score_twenty_three``) do,
+following the points system in the rules:
+
+- A dead pick scores 50 + (100 - AGE)
+- The pick(s) with the earliest death date get First Blood, +25
+- The pick(s) with the latest death date get Last Blood, +25
+- The player(s) with the most points from deaths in a calendar quarter get
+  +5 once that quarter has ended
+
+``score_picks`` scores a whole picks table with NumPy, grouping points per
+player with ``np.bincount`` instead of a Python loop. ``Standings`` keeps the
+totals in memory and applies each new death incrementally, so the
+Leaderboard updates the current season without rescoring it.
+
+``simulate_rules`` rescores every season under many alternative ``RuleSet``
+variants at once.
+Points for all variants and dead picks are one broadcast matrix, and the
+totals of every variant, season and player come from a single
+``np.bincount``.
+
+The score views are the source of truth. ``benchmarks/scoring_validation.py
+--live`` compares ``score_picks`` and ``Standings`` with every season's score
+view and is the acceptance check for changes here.
+"""
+
+import logging
+import threading
+from datetime import date
+from typing import Dict, Final, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Scoring Constants
+BASE_POINTS: Final[int] = 50
+AGE_POINTS: Final[int] = 100
+FIRST_BLOOD_BONUS: Final[int] = 25
+LAST_BLOOD_BONUS: Final[int] = 25
+QUARTERLY_BONUS: Final[int] = 5
+
+# Column names in the picks views
+PLAYER_COLUMN: Final[str] = "PLAYER"
+NAME_COLUMN: Final[str] = "NAME"
+AGE_COLUMN: Final[str] = "AGE"
+DEATH_DATE_COLUMN: Final[str] = "DEATH_DATE"
+TOTAL_COLUMN: Final[str] = "TOTAL"
+
+
+class ScoreDelta(NamedTuple):
+    """Points a player gained or lost from one recorded death."""
+
+    player: str
+    points: int
+    reason: str
+
+
+class RuleSet(NamedTuple):
+    """Scoring rules for a dead pick.
+
+    A pick scores ``base + multiplier * curve(age_points - min(AGE, age_cap))``
+    where curve raises to ``exponent`` and keeps the sign, so the defaults
+    are the real rules, 50 + (100 - AGE).
+    """
+
+    base: float = BASE_POINTS
+    age_points: float = AGE_POINTS
+    multiplier: float = 1.0
+    exponent: float = 1.0
+    age_cap: float = np.inf
+    first_blood: float = FIRST_BLOOD_BONUS
+    last_blood: float = LAST_BLOOD_BONUS
+    quarterly_bonus: float = QUARTERLY_BONUS
+
+
+DEFAULT_RULES: Final[RuleSet] = RuleSet()
+
+
+def pick_points(ages) -> np.ndarray:
+    """Base points for dead picks, 50 + (100 - AGE).
+
+    Args:
+        ages: Ages at death
+
+    Returns:
+        numpy.ndarray: Points per pick as int64
+    """
+    return BASE_POINTS + (AGE_POINTS - np.asarray(ages, dtype=np.int64))
+
+
+def _quarters(death_dates: np.ndarray, as_of=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Codes each death's calendar quarter and flags the quarters that ended.
+
+    Args:
+        death_dates: Dates of the dead picks as datetime64[D]
+        as_of (datetime.date, optional): Quarters ending after this date are
+            still running. None treats every quarter as ended.
+
+    Returns:
+        tuple: (quarter code per death from 0, True where that quarter ended)
+    """
+    quarter = death_dates.astype("datetime64[M]").astype(np.int64) // 3
+    codes, _ = pd.factorize(quarter)
+    if as_of is None:
+        return codes, np.ones(len(death_dates), dtype=bool)
+    # Months count from 1970-01, so quarter boundaries are multiples of 3
+    next_quarter = ((quarter + 1) * 3).astype("datetime64[M]").astype("datetime64[D]")
+    return codes, next_quarter <= np.datetime64(as_of, "D")
+
+
+def _quarter_wins(
+    points: np.ndarray, groups: np.ndarray, quarters: np.ndarray, ended: np.ndarray, n_groups: int
+) -> np.ndarray:
+    """Counts the ended quarters each group had the most points in.
+
+    Ties share the quarter, and a quarter without points has no winner.
+
+    Args:
+        points: (variants x dead picks) points of each pick
+        groups: Group (player) code of each dead pick
+        quarters: Quarter code of each dead pick, from ``_quarters``
+        ended: Whether each dead pick's quarter has ended
+        n_groups: Number of groups
+
+    Returns:
+        numpy.ndarray: (variants x n_groups) quarters won
+    """
+    variants = points.shape[0]
+    if not len(quarters):
+        return np.zeros((variants, n_groups))
+    n_quarters = int(quarters.max()) + 1
+    key_codes, keys = pd.factorize(groups.astype(np.int64) * n_quarters + quarters)
+    key_group, key_quarter = keys // n_quarters, keys % n_quarters
+    key_ended = np.zeros(len(keys), dtype=bool)
+    key_ended[key_codes] = ended
+
+    index = np.arange(variants)[:, None] * len(keys) + key_codes
+    totals = np.bincount(
+        index.ravel(), weights=points.ravel(), minlength=variants * len(keys)
+    ).reshape(variants, len(keys))
+    best = np.zeros((variants, n_quarters))
+    for quarter in range(n_quarters):
+        best[:, quarter] = totals[:, key_quarter == quarter].max(axis=1)
+    wins = (totals == best[:, key_quarter]) & (totals > 0) & key_ended
+
+    index = np.arange(variants)[:, None] * n_groups + key_group
+    return np.bincount(
+        index.ravel(), weights=wins.ravel(), minlength=variants * n_groups
+    ).reshape(variants, n_groups)
+
+
+def score_picks(df_picks: pd.DataFrame, last_blood: bool = True, as_of=None) -> pd.DataFrame:
+    """Scores every pick and totals the points per player.
+
+    Args:
+        df_picks: One row per pick with PLAYER, NAME, AGE and DEATH_DATE.
+            DEATH_DATE is null for picks that are still alive.
+        last_blood: Award Last Blood to the latest death. Defaults to True.
+        as_of (datetime.date, optional): Only quarters ended by this date get
+            the quarterly bonus. Defaults to None, every quarter, as in a
+            closed season.
+
+    Returns:
+        pandas.DataFrame: PLAYER and TOTAL, one row per player including
+        players without points, highest total first
+    """
+    codes, players = pd.factorize(df_picks[PLAYER_COLUMN])
+    death_dates = df_picks[DEATH_DATE_COLUMN].to_numpy(dtype="datetime64[D]")
+    dead = ~np.isnat(death_dates)
+
+    points = np.zeros(len(df_picks), dtype=np.int64)
+    points[dead] = pick_points(df_picks[AGE_COLUMN].to_numpy()[dead])
+    if dead.any():
+        points[dead & (death_dates == death_dates[dead].min())] += FIRST_BLOOD_BONUS
+        if last_blood:
+            points[dead & (death_dates == death_dates[dead].max())] += LAST_BLOOD_BONUS
+
+    totals = np.bincount(codes, weights=points, minlength=len(players)).astype(np.int64)
+    quarters, ended = _quarters(death_dates[dead], as_of)
+    wins = _quarter_wins(points[None, dead], codes[dead], quarters, ended, len(players))[0]
+    totals += QUARTERLY_BONUS * wins.astype(np.int64)
+    return (
+        pd.DataFrame({PLAYER_COLUMN: players, TOTAL_COLUMN: totals})
+        .sort_values([TOTAL_COLUMN, PLAYER_COLUMN], ascending=[False, True])
+        .reset_index(drop=True)
+    )
+
+
+class Standings:
+    """Player totals that are updated in place as deaths arrive.
+
+    Built by replaying the deaths of a picks table in date order through
+    ``record_death``. Afterwards ``record_death`` adds a new pick's points,
+    moves First or Last Blood if the death is earlier or later than the
+    current holder, and re-awards the quarterly bonus of the quarters whose
+    points changed. The work per death depends on how many players picked
+    that person and scored in the affected quarters, never on the number of
+    picks. Instances may be shared between sessions; all methods take a lock.
+
+    Example:
+        standings = Standings(df_picks, last_blood=False, as_of=date.today())
+        standings.record_death("Jane Doe", 88, date(2025, 3, 1))
+        df_leaderboard = standings.frame()
+    """
+
+    def __init__(self, df_picks: pd.DataFrame, last_blood: bool = True, as_of=None):
+        """Indexes the picks and records their deaths.
+
+        Args:
+            df_picks: One row per pick with PLAYER, NAME, AGE and DEATH_DATE
+            last_blood: Award Last Blood to the latest death. Defaults to True.
+            as_of (datetime.date, optional): Only quarters ended by this date
+                get the quarterly bonus. Defaults to None, every quarter.
+        """
+        self.last_blood = last_blood
+        self._lock = threading.RLock()
+        self._reset(df_picks, as_of)
+
+    def _reset(self, df_picks: pd.DataFrame, as_of) -> None:
+        self.as_of = as_of
+        self._totals: Dict[str, int] = {}
+        self._pickers: Dict[str, List[str]] = {}
+        self._dead: Dict[str, date] = {}
+        self._first: Tuple[Optional[date], List[str]] = (None, [])
+        self._last: Tuple[Optional[date], List[str]] = (None, [])
+        self._quarters: Dict[Tuple[int, int], Dict[str, int]] = {}
+        self._winners: Dict[Tuple[int, int], set] = {}
+        self.add_picks(df_picks)
+        for row in _deaths(df_picks).itertuples(index=False):
+            self.record_death(row.NAME, row.AGE, row.DEATH_DATE)
+
+    def add_picks(self, df_picks: pd.DataFrame) -> int:
+        """Indexes picks not seen yet, such as re-ups, so their deaths score.
+
+        Args:
+            df_picks: One row per pick with PLAYER and NAME
+
+        Returns:
+            int: Number of new picks
+        """
+        added = 0
+        with self._lock:
+            for player, name in zip(df_picks[PLAYER_COLUMN], df_picks[NAME_COLUMN]):
+                self._totals.setdefault(player, 0)
+                pickers = self._pickers.setdefault(name, [])
+                if player not in pickers:
+                    pickers.append(player)
+                    added += 1
+        return added
+
+    def update(self, df_picks: pd.DataFrame, as_of=None) -> List[ScoreDelta]:
+        """Brings the totals up to date with a fresh picks table.
+
+        New picks are indexed and new deaths recorded one by one. A death
+        that was corrected or removed cannot be undone incrementally, so the
+        standings are rebuilt from the table instead.
+
+        Args:
+            df_picks: One row per pick with PLAYER, NAME, AGE and DEATH_DATE
+            as_of (datetime.date, optional): New date that ends quarters, for
+                a season in progress
+
+        Returns:
+            list: ScoreDelta for every change, empty after a rebuild
+        """
+        df_dead = _deaths(df_picks)
+        with self._lock:
+            known = dict(zip(df_dead[NAME_COLUMN], df_dead[DEATH_DATE_COLUMN]))
+            if any(known.get(name) != death_date for name, death_date in self._dead.items()):
+                logger.info("Recorded deaths changed, rebuilding standings")
+                self._reset(df_picks, as_of or self.as_of)
+                return []
+
+            self.add_picks(df_picks)
+            deltas = self.settle(as_of) if as_of is not None else []
+            df_new = df_dead[~df_dead[NAME_COLUMN].isin(list(self._dead))]
+            for row in df_new.itertuples(index=False):
+                deltas += self.record_death(row.NAME, row.AGE, row.DEATH_DATE)
+            return deltas
+
+    def settle(self, as_of) -> List[ScoreDelta]:
+        """Awards the quarterly bonus of quarters that ended by a new date.
+
+        Args:
+            as_of (datetime.date): Date that ends quarters
+
+        Returns:
+            list: ScoreDelta for every bonus awarded
+        """
+        with self._lock:
+            self.as_of = as_of
+            deltas = []
+            for quarter in list(self._quarters):
+                deltas += self._award_quarter(quarter)
+            self._apply(deltas)
+            return deltas
+
+    def record_death(self, name: str, age: int, death_date: date) -> List[ScoreDelta]:
+        """Applies one new death to the totals.
+
+        Args:
+            name: Person who died, as in the picks NAME column
+            age: Age at death
+            death_date: Date of death
+
+        Returns:
+            list: ScoreDelta for every player whose total changed. Empty if
+            nobody picked the person or the death was already recorded.
+        """
+        with self._lock:
+            if name in self._dead or name not in self._pickers:
+                return []
+            self._dead[name] = death_date
+            pickers = self._pickers[name]
+            points = int(pick_points(age))
+            deltas = [ScoreDelta(player, points, "pick") for player in pickers]
+            changed = {_quarter_of(death_date)}
+            for player in pickers:
+                self._add_quarter_points(death_date, player, points)
+
+            deltas += self._move_bonus(
+                "_first", death_date, pickers, FIRST_BLOOD_BONUS, "first_blood", changed, True
+            )
+            if self.last_blood:
+                deltas += self._move_bonus(
+                    "_last", death_date, pickers, LAST_BLOOD_BONUS, "last_blood", changed, False
+                )
+            for quarter in changed:
+                deltas += self._award_quarter(quarter)
+
+            self._apply(deltas)
+            logger.info(f"Recorded death of {name}: {len(deltas)} score changes")
+            return deltas
+
+    def _apply(self, deltas: List[ScoreDelta]) -> None:
+        for delta in deltas:
+            self._totals[delta.player] += delta.points
+
+    def _add_quarter_points(self, death_date: date, player: str, points: int) -> None:
+        quarter = self._quarters.setdefault(_quarter_of(death_date), {})
+        quarter[player] = quarter.get(player, 0) + points
+
+    def _move_bonus(
+        self, holder, death_date, pickers, bonus, reason, changed, earlier
+    ) -> List[ScoreDelta]:
+        """Shares or takes over a First or Last Blood bonus for a new death.
+
+        The bonus counts towards the points of the quarter of the death that
+        earned it, so the quarters it moves between are added to ``changed``.
+        """
+        current_date, current_players = getattr(self, holder)
+        if current_date is None or death_date == current_date:
+            setattr(self, holder, (death_date, current_players + list(pickers)))
+            taken = []
+        elif (death_date < current_date) != earlier:
+            return []
+        else:
+            setattr(self, holder, (death_date, list(pickers)))
+            taken = [ScoreDelta(player, -bonus, reason) for player in current_players]
+            for player in current_players:
+                self._add_quarter_points(current_date, player, -bonus)
+            changed.add(_quarter_of(current_date))
+        for player in pickers:
+            self._add_quarter_points(death_date, player, bonus)
+        return taken + [ScoreDelta(player, bonus, reason) for player in pickers]
+
+    def _award_quarter(self, quarter: Tuple[int, int]) -> List[ScoreDelta]:
+        """Moves a quarter's bonus to its current leaders once it has ended."""
+        points = self._quarters.get(quarter, {})
+        winners = set()
+        if _quarter_ended(quarter, self.as_of) and points:
+            best = max(points.values())
+            if best > 0:
+                winners = {player for player, total in points.items() if total == best}
+        previous = self._winners.get(quarter, set())
+        self._winners[quarter] = winners
+        return [
+            ScoreDelta(player, -QUARTERLY_BONUS, "quarterly") for player in previous - winners
+        ] + [ScoreDelta(player, QUARTERLY_BONUS, "quarterly") for player in winners - previous]
+
+    def total(self, player: str) -> Optional[int]:
+        """Current total for a player, or None for an unknown player."""
+        with self._lock:
+            return self._totals.get(player)
+
+    def frame(self) -> pd.DataFrame:
+        """Current standings in the layout of ``score_picks``.
+
+        Returns:
+            pandas.DataFrame: PLAYER and TOTAL, highest total first
+        """
+        with self._lock:
+            totals = dict(self._totals)
+        return (
+            pd.DataFrame({PLAYER_COLUMN: list(totals), TOTAL_COLUMN: list(totals.values())})
+            .sort_values([TOTAL_COLUMN, PLAYER_COLUMN], ascending=[False, True])
+            .reset_index(drop=True)
+        )
+
+
+def _deaths(df_picks: pd.DataFrame) -> pd.DataFrame:
+    """Returns one row per dead person with NAME, AGE and DEATH_DATE as a date, oldest first."""
+    df_dead = df_picks.loc[df_picks[DEATH_DATE_COLUMN].notna(), [NAME_COLUMN, AGE_COLUMN]].copy()
+    df_dead[DEATH_DATE_COLUMN] = pd.to_datetime(
+        df_picks.loc[df_dead.index, DEATH_DATE_COLUMN]
+    ).dt.date
+    return df_dead.drop_duplicates(NAME_COLUMN).sort_values(DEATH_DATE_COLUMN, kind="stable")
+
+
+def _quarter_of(death_date: date) -> Tuple[int, int]:
+    return death_date.year, (death_date.month - 1) // 3
+
+
+def _quarter_ended(quarter: Tuple[int, int], as_of) -> bool:
+    """True if a (year, quarter) is over by ``as_of``; None means every quarter is."""
+    if as_of is None:
+        return True
+    year, number = quarter
+    next_start = date(year + 1, 1, 1) if number == 3 else date(year, 3 * number + 4, 1)
+    return next_start <= as_of
+
+
+def _stack_rules(rule_sets: Sequence[RuleSet]) -> Dict[str, np.ndarray]:
+    """Turns rule sets into one column vector per field, for broadcasting."""
+    matrix = np.array(rule_sets, dtype=np.float64).reshape(len(rule_sets), len(RuleSet._fields))
+    return {field: matrix[:, [i]] for i, field in enumerate(RuleSet._fields)}
+
+
+def simulate_rules(
+    seasons: Dict[str, pd.DataFrame],
+    rule_sets: Sequence[RuleSet],
+    open_seasons: Iterable[str] = (),
+    baselines: Optional[Dict[str, pd.DataFrame]] = None,
+    as_of=None,
+) -> pd.DataFrame:
+    """Rescores every season under each rule set and ranks the players.
+
+    BASELINE_RANK ranks the actual standings, so each variant's ranks can be
+    compared with them. They come from ``baselines`` where given, and from
+    the real rules rescored from the picks otherwise.
+
+    Args:
+        seasons: Season label to picks table, as for ``score_picks``
+        rule_sets: Rule variants to evaluate
+        open_seasons: Seasons still in progress, which get no Last Blood
+            and no quarterly bonus for quarters that have not ended
+        baselines: Season label to the real standings, PLAYER and TOTAL as
+            in the score views. Players missing from them count 0 points.
+        as_of (datetime.date, optional): Date that ends quarters in the open
+            seasons. Defaults to today.
+
+    Returns:
+        pandas.DataFrame: One row per variant, season and player with
+        VARIANT (position in rule_sets), SEASON, PLAYER, TOTAL, RANK,
+        BASELINE_RANK and RANK_CHANGE (positive when the player moved up)
+    """
+    open_seasons = set(open_seasons)
+    as_of = as_of or date.today()
+    rules = _stack_rules([DEFAULT_RULES, *rule_sets])
+    variants = len(rule_sets) + 1
+
+    # Flatten the dead picks of all seasons, grouped by (season, player)
+    group_season, group_player, pick_group, ages, first, last = [], [], [], [], [], []
+    quarters, ended = [], []
+    n_quarters = 0
+    for season, df_picks in seasons.items():
+        codes, players = pd.factorize(df_picks[PLAYER_COLUMN])
+        death_dates = df_picks[DEATH_DATE_COLUMN].to_numpy(dtype="datetime64[D]")
+        dead = ~np.isnat(death_dates)
+        pick_group.append(codes[dead] + len(group_season))
+        group_season += [season] * len(players)
+        group_player += list(players)
+        ages.append(df_picks[AGE_COLUMN].to_numpy(dtype=np.float64)[dead])
+        dead_dates = death_dates[dead]
+        first.append(dead_dates == dead_dates.min() if len(dead_dates) else dead_dates.astype(bool))
+        is_last = dead_dates == dead_dates.max() if len(dead_dates) else dead_dates.astype(bool)
+        last.append(is_last & (season not in open_seasons))
+        season_quarters, season_ended = _quarters(
+            dead_dates, as_of if season in open_seasons else None
+        )
+        quarters.append(season_quarters + n_quarters)
+        ended.append(season_ended)
+        n_quarters += int(season_quarters.max()) + 1 if len(season_quarters) else 0
+
+    pick_group, ages = np.concatenate(pick_group), np.concatenate(ages)
+    first, last = np.concatenate(first), np.concatenate(last)
+    quarters, ended = np.concatenate(quarters), np.concatenate(ended)
+    groups = len(group_season)
+
+    # (variants x dead picks) points, then totals per (variant, group)
+    remaining = rules["age_points"] - np.minimum(ages, rules["age_cap"])
+    points = (
+        rules["base"]
+        + rules["multiplier"] * np.sign(remaining) * np.abs(remaining) ** rules["exponent"]
+        + rules["first_blood"] * first
+        + rules["last_blood"] * last
+    )
+    index = np.arange(variants)[:, None] * groups + pick_group
+    totals = np.bincount(index.ravel(), weights=points.ravel(), minlength=variants * groups)
+    wins = _quarter_wins(points, pick_group, quarters, ended, groups)
+    totals += (rules["quarterly_bonus"] * wins).ravel()
+
+    if baselines:
+        # Replace the rescored real rules with the actual standings
+        df_real = pd.concat(
+            {season: df.set_index(PLAYER_COLUMN)[TOTAL_COLUMN] for season, df in baselines.items()}
+        )
+        real = df_real.reindex(pd.MultiIndex.from_arrays([group_season, group_player]))
+        known = np.isin(group_season, list(baselines))
+        totals[:groups] = np.where(known, real.fillna(0).to_numpy(dtype=np.float64), totals[:groups])
+
+    df_sim = pd.DataFrame(
+        {
+            "VARIANT": np.repeat(np.arange(-1, variants - 1), groups),
+            "SEASON": np.tile(group_season, variants),
+            PLAYER_COLUMN: np.tile(np.array(group_player, dtype=object), variants),
+            TOTAL_COLUMN: totals,
+        }
+    )
+    df_sim["RANK"] = (
+        df_sim.groupby(["VARIANT", "SEASON"])[TOTAL_COLUMN]
+        .rank(method="min", ascending=False)
+        .astype(int)
+    )
+    df_sim["BASELINE_RANK"] = np.tile(df_sim["RANK"].to_numpy()[:groups], variants)
+    df_sim["RANK_CHANGE"] = df_sim["BASELINE_RANK"] - df_sim["RANK"]
+    return df_sim[df_sim["VARIANT"] >= 0].reset_index(drop=True)
+
+
+def summarize_simulation(df_sim: pd.DataFrame, rule_sets: Sequence[RuleSet]) -> pd.DataFrame:
+    """Summarizes how far each rule variant moves the standings.
+
+    Args:
+        df_sim: Output of ``simulate_rules``
+        rule_sets: The rule sets passed to ``simulate_rules``
+
+    Returns:
+        pandas.DataFrame: One row per variant with its rules, the number of
+        seasons whose winner changed, the mean absolute rank change and the
+        largest single move
+    """
+    df_sim = df_sim.assign(
+        ABS_CHANGE=df_sim["RANK_CHANGE"].abs(),
+        WINNER_CHANGED=(df_sim["BASELINE_RANK"] == 1) & (df_sim["RANK"] != 1),
+    )
+    df_summary = df_sim.groupby("VARIANT").agg(
+        WINNERS_CHANGED=("WINNER_CHANGED", "sum"),
+        MEAN_RANK_CHANGE=("ABS_CHANGE", "mean"),
+        MAX_RANK_CHANGE=("ABS_CHANGE", "max"),
+    )
+    df_rules = pd.DataFrame(list(rule_sets), columns=[field.upper() for field in RuleSet._fields])
+    return df_rules.join(df_summary).sort_values("MEAN_RANK_CHANGE").rename_axis("VARIANT")
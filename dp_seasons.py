@@ -0,0 +1,333 @@
+"""
+Season archive for closed Deadpool seasons.
+
+Each season has a picks view and a score view in Snowflake, e.g.
+``picks_twenty_four`` and ``score_twenty_four``, while the season in
+progress reads ``picks_current_year`` and ``score_current_year``.
+``load_season`` hides those names behind a (kind, year) pair. The seasons
+and their views are read from INFORMATION_SCHEMA.VIEWS, so a season is
+picked up as soon as its views exist; seasons without both views are
+skipped unless they are already archived.
+
+Once a closed season is final, ``jobs/freeze_seasons.py`` freezes it into a
+local Arrow IPC file (zstd compressed, one file per kind and year), and it
+is no longer queried from Snowflake. The file is opened through a memory
+map and decompressed into one shared, immutable Arrow table per process.
+Pages never freeze a season themselves: until its archive exists, a closed
+season is read from its views through the shared result cache, so late
+corrections such as a DEATH_DATE fix still show. The job only freezes
+seasons that ended FREEZE_GRACE_DAYS ago, and --force re-freezes one.
+"""
+
+import logging
+import os
+import re
+import time
+from datetime import date, datetime
+from typing import Dict, Final, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from dp_utilities import (
+    load_cached_snowflake_table,
+    load_snowflake_table,
+    run_cached_snowflake_query,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Season Constants
+SEASON_KINDS: Final[tuple] = ("picks", "score")
+SEASON_VIEWS_TTL: Final[int] = 3600
+FREEZE_GRACE_DAYS: Final[int] = 90
+SEASON_VIEW_PATTERN: Final[re.Pattern] = re.compile(r"^(picks|score)_(\w+)$")
+NUMBER_WORDS: Final[Dict[str, int]] = {
+    **{
+        word: value
+        for value, word in enumerate(
+            "zero one two three four five six seven eight nine ten eleven twelve thirteen "
+            "fourteen fifteen sixteen seventeen eighteen nineteen".split()
+        )
+    },
+    **{
+        word: 10 * value
+        for value, word in enumerate(
+            "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2
+        )
+    },
+}
+
+# SQL Queries
+SQL_SEASON_VIEWS: Final[str] = """
+SELECT TABLE_NAME
+FROM INFORMATION_SCHEMA.VIEWS
+WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+AND (TABLE_NAME ILIKE 'PICKS^_%' ESCAPE '^' OR TABLE_NAME ILIKE 'SCORE^_%' ESCAPE '^')
+"""
+
+# Archive Constants
+ARCHIVE_FORMAT: Final[str] = "1"
+ARCHIVE_COMPRESSION: Final[str] = "zstd"
+ARCHIVE_DIR: Final[str] = os.path.join(
+    os.environ.get(
+        "DEADPOOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "deadpool")
+    ),
+    "seasons",
+)
+ARCHIVE_PATTERN: Final[re.Pattern] = re.compile(r"^(\w+?)_(\d{4})\.arrow$")
+
+
+def current_season() -> int:
+    """Returns the season in progress, the calendar year.
+
+    The ``*_current_year`` views filter on the current date, so the season
+    they show changes on January 1 together with this one.
+    """
+    return datetime.now().year
+
+
+def suffix_year(suffix: str) -> Optional[int]:
+    """Returns the season a view name suffix stands for.
+
+    Args:
+        suffix: Suffix after the kind, e.g. "twenty_five" or "2025"
+
+    Returns:
+        int or None: Season year, e.g. 2025, or None if the suffix is not a
+        year, such as "current_year"
+    """
+    if suffix.isdigit():
+        return int(suffix) if len(suffix) == 4 else 2000 + int(suffix)
+    words = suffix.lower().split("_")
+    if not all(word in NUMBER_WORDS for word in words):
+        return None
+    return 2000 + sum(NUMBER_WORDS[word] for word in words)
+
+
+def season_views(_conn) -> Dict[int, str]:
+    """Returns the seasons with both a picks and a score view.
+
+    The view list is read from INFORMATION_SCHEMA.VIEWS and cached for
+    SEASON_VIEWS_TTL seconds.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+
+    Returns:
+        dict: Season year to view name suffix, e.g. {2025: "twenty_five"}
+    """
+    df_views = run_cached_snowflake_query(
+        _conn, SQL_SEASON_VIEWS, ["information_schema.views"], ttl=SEASON_VIEWS_TTL
+    )
+    suffixes: Dict[int, Dict[str, str]] = {}
+    for name in df_views["TABLE_NAME"].str.lower():
+        match = SEASON_VIEW_PATTERN.match(name)
+        if not match:
+            continue
+        kind, suffix = match.groups()
+        year = suffix_year(suffix)
+        if year is not None:
+            suffixes.setdefault(year, {})[kind] = suffix
+    return {
+        year: kinds["picks"]
+        for year, kinds in sorted(suffixes.items())
+        if set(kinds) == set(SEASON_KINDS) and kinds["picks"] == kinds["score"]
+    }
+
+
+def archived_seasons(archive_dir: str = ARCHIVE_DIR) -> List[int]:
+    """Returns the seasons with an archive of every kind, oldest first."""
+    if not os.path.isdir(archive_dir):
+        return []
+    kinds: Dict[int, set] = {}
+    for name in os.listdir(archive_dir):
+        match = ARCHIVE_PATTERN.match(name)
+        if match:
+            kinds.setdefault(int(match.group(2)), set()).add(match.group(1))
+    return sorted(year for year, found in kinds.items() if found >= set(SEASON_KINDS))
+
+
+def closed_seasons(_conn) -> List[int]:
+    """Returns the finished seasons, oldest first.
+
+    A season is included once it has ended and either has its views in
+    Snowflake or is already archived.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+
+    Returns:
+        list: Season years
+    """
+    years = set(season_views(_conn)) | set(archived_seasons())
+    return sorted(year for year in years if year < current_season())
+
+
+def freezable_seasons(_conn, grace_days: int = FREEZE_GRACE_DAYS) -> List[int]:
+    """Returns the closed seasons that ended long enough ago to freeze.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        grace_days: Days after a season's end during which corrections are
+            still expected. Defaults to 90.
+
+    Returns:
+        list: Season years, oldest first
+    """
+    today = datetime.now().date()
+    return [
+        year
+        for year in season_views(_conn)
+        if year < current_season() and (today - date(year + 1, 1, 1)).days >= grace_days
+    ]
+
+
+def season_view(_conn, kind: str, year: int) -> str:
+    """Returns the Snowflake view with a season's picks or scores.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        kind: "picks" or "score"
+        year: Season year
+
+    Returns:
+        str: View name, e.g. "score_twenty_four" or "score_current_year"
+
+    Raises:
+        ValueError: If the kind is unknown or the season has no view
+    """
+    if kind not in SEASON_KINDS:
+        raise ValueError(f"Unknown season data kind: {kind}")
+    if year == current_season():
+        return f"{kind}_current_year"
+    views = season_views(_conn)
+    if year not in views:
+        raise ValueError(f"No {kind} view for season {year}")
+    return f"{kind}_{views[year]}"
+
+
+def archive_path(kind: str, year: int, archive_dir: str = ARCHIVE_DIR) -> str:
+    """Returns the archive file of a closed season."""
+    return os.path.join(archive_dir, f"{kind}_{year}.arrow")
+
+
+def freeze_season(_conn, kind: str, year: int, archive_dir: str = ARCHIVE_DIR) -> int:
+    """Copies a closed season's view into its archive file.
+
+    The file is written next to its final path and then renamed, so readers
+    never see a partial archive.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        kind: "picks" or "score"
+        year: Season year, which must be closed
+        archive_dir: Directory of the archive files. Defaults to ARCHIVE_DIR.
+
+    Returns:
+        int: Size of the written file in bytes
+
+    Raises:
+        ValueError: If the season is still in progress
+    """
+    if year >= current_season():
+        raise ValueError(f"Season {year} is not closed and cannot be frozen")
+    view = season_view(_conn, kind, year)
+    table = load_snowflake_table(_conn, view, as_arrow=True)
+    table = table.replace_schema_metadata(
+        {
+            "format": ARCHIVE_FORMAT,
+            "view": view,
+            "season": str(year),
+            "frozen_at": str(time.time()),
+        }
+    )
+
+    path = archive_path(kind, year, archive_dir)
+    os.makedirs(archive_dir, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    options = pa.ipc.IpcWriteOptions(compression=ARCHIVE_COMPRESSION)
+    with pa.OSFile(temp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+    size = os.path.getsize(path)
+    logger.info(f"Froze {view} ({table.num_rows} rows, {size / 1024:.1f} KiB) to {path}")
+    return size
+
+
+def read_archive(kind: str, year: int, archive_dir: str = ARCHIVE_DIR) -> Optional[pa.Table]:
+    """Reads a season archive through a memory map.
+
+    Args:
+        kind: "picks" or "score"
+        year: Season year
+        archive_dir: Directory of the archive files. Defaults to ARCHIVE_DIR.
+
+    Returns:
+        pyarrow.Table or None: The frozen view, or None if the archive is
+        missing, unreadable or from another format
+    """
+    path = archive_path(kind, year, archive_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except Exception as e:
+        logger.warning(f"Could not read season archive {path}: {e}")
+        return None
+
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"format", b"").decode() != ARCHIVE_FORMAT:
+        logger.warning(f"Ignoring season archive {path} from another format")
+        return None
+    return table
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def archived_season(kind: str, year: int, modified: float) -> Optional[pa.Table]:
+    """Returns a closed season's archive, cached until the file is replaced.
+
+    Args:
+        kind: "picks" or "score"
+        year: Season year
+        modified: Modification time of the archive, part of the cache key
+            so a re-frozen archive is picked up
+
+    Returns:
+        pyarrow.Table or None: The frozen view, or None if it is unreadable
+    """
+    table = read_archive(kind, year)
+    if table is not None:
+        logger.info(f"Loaded {kind} archive for season {year} ({table.num_rows} rows)")
+    return table
+
+
+def load_season(_conn, kind: str, year: int) -> pd.DataFrame:
+    """Loads a season's picks or scores.
+
+    Archived seasons come from their local archive. Every other season,
+    including closed seasons not frozen yet, is read from its view through
+    the shared result cache.
+
+    Example:
+        df_scores = load_season(conn, "score", 2024)
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        kind: "picks" or "score"
+        year: Season year
+
+    Returns:
+        pandas.DataFrame: The season's view, a fresh copy callers may modify
+    """
+    path = archive_path(kind, year)
+    if year < current_season() and os.path.exists(path):
+        table = archived_season(kind, year, os.path.getmtime(path))
+        if table is not None:
+            return table.to_pandas()
+    return load_cached_snowflake_table(_conn, season_view(_conn, kind, year))
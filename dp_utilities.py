@@ -4,26 +4,122 @@ authentication, messaging, and other shared functionality. This module contains
 reusable components that are used across different parts of the application.
 
 Functions in this module handle:
-- Snowflake database connections and queries
+- Snowflake database connections, pooling and queries
 - Session state management
 - User authentication and authorization
 - SMS messaging via Twilio
 - Feature flag management via LaunchDarkly
+- Buffered usage analytics via Mixpanel
 - Natural language processing utilities
 """
 
+import atexit
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, NamedTuple, Optional
 import requests
 import pandas as pd
+import pyarrow as pa
 import snowflake.connector
-from fuzzywuzzy import fuzz
-from twilio.rest import Client
+from snowflake.connector.errors import NotSupportedError
+from rapidfuzz import fuzz, process
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
-import ldclient
-from ldclient import Context
-from ldclient.config import Config
-from mixpanel import Mixpanel
+from dp_analytics import AnalyticsBuffer
+from dp_flags import FlagClient, build_context
+from dp_images import ThumbnailCache
+from dp_matching import normalize_name
+from dp_notifications import NotificationDispatcher, TwilioTransport
+from dp_wikidata import WikidataStore
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Query builder Constants
+DEFAULT_CHUNK_ROWS = 50_000
+SQL_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*){0,2}$")
+SQL_FILTER_OPERATORS = {
+    "=",
+    "!=",
+    "<>",
+    "<",
+    "<=",
+    ">",
+    ">=",
+    "LIKE",
+    "ILIKE",
+    "IN",
+    "NOT IN",
+    "IS NULL",
+    "IS NOT NULL",
+}
+
+# Parallel load Constants
+LOAD_WORKERS = 8
+
+# Table version Constants
+TABLE_VERSION_TTL = 60
+SQL_TABLE_VERSION = """
+SELECT LAST_ALTERED
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = CURRENT_SCHEMA()
+AND TABLE_NAME = %s
+"""
+
+# Result cache TTLs in seconds per table or view; closed seasons never change
+CACHE_TABLE_TTLS = {
+    "draft_next": 10,
+    "draft": 30,
+    "picks_current_year": 60,
+    "score_current_year": 300,
+    "draft_opted_in": 300,
+    "people": 300,
+    "players": 300,
+    "nndb": 3600,
+    "nndb_predictions": 3600,
+    "picks_twenty_four": 86400,
+    "picks_twenty_three": 86400,
+    "score_twenty_four": 86400,
+    "score_twenty_three": 86400,
+}
+
+# Base tables and the views that read from them, for cache invalidation
+CACHE_DEPENDENCIES = {
+    "people": [
+        "picks",
+        "picks_current_year",
+        "picks_twenty_four",
+        "picks_twenty_three",
+        "draft",
+        "score_current_year",
+        "score_twenty_four",
+        "score_twenty_three",
+    ],
+    "player_picks": [
+        "picks",
+        "picks_current_year",
+        "draft",
+        "draft_next",
+        "score_current_year",
+    ],
+    "players": [
+        "picks",
+        "picks_current_year",
+        "draft",
+        "draft_next",
+        "draft_opted_in",
+        "draft_order",
+        "score_current_year",
+    ],
+}
 
 
 # Function to load the private key from secrets
@@ -45,16 +141,14 @@ def load_private_key_from_secrets(private_key_str):
     return private_key
 
 
-@st.cache_resource(ttl=3600)
-def snowflake_connection_helper():
-    """Creates and returns a cached connection to Snowflake using credentials from streamlit secrets.
-    
-    The connection uses RSA key authentication and is cached for 1 hour to prevent
-    excessive connection creation. All connection parameters are retrieved from
-    streamlit secrets.
+def connect_to_snowflake():
+    """Opens a new Snowflake connection using credentials from streamlit secrets.
+
+    The connection uses RSA key authentication. All connection parameters are
+    retrieved from streamlit secrets.
 
     Returns:
-        snowflake.connector.connection.SnowflakeConnection: A connection object to Snowflake
+        snowflake.connector.connection.SnowflakeConnection: A new connection object to Snowflake
     """
     # Load the private key from secrets directly inside the function to avoid passing it as an argument
     private_key = load_private_key_from_secrets(
@@ -75,6 +169,264 @@ def snowflake_connection_helper():
     return conn
 
 
+@st.cache_resource(ttl=3600)
+def snowflake_connection_helper():
+    """Creates and returns a cached connection to Snowflake using credentials from streamlit secrets.
+
+    The connection is cached for 1 hour and shared by every session in the
+    process. It is kept for scripts and tools; pages should check connections
+    out of ``snowflake_connection_pool`` instead so concurrent sessions do not
+    serialize on one connection.
+
+    Returns:
+        snowflake.connector.connection.SnowflakeConnection: A connection object to Snowflake
+    """
+    return connect_to_snowflake()
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """Bounded pool of database connections with liveness probes.
+
+    Connections are created lazily by ``connect`` up to ``size``. Idle
+    connections that have not been used for ``probe_interval`` seconds, or
+    that were in use when an exception was raised, are probed with
+    ``probe_query`` before being handed out and replaced if the probe fails.
+    New connections are opened with exponential backoff between attempts.
+
+    Any DB-API style object with ``cursor()`` and ``close()`` works, so the
+    pool can be exercised with a fake connector.
+
+    Example:
+        pool = snowflake_connection_pool()
+        with pool.connection() as conn:
+            df = load_snowflake_table(conn, "picks_current_year")
+    """
+
+    def __init__(
+        self,
+        connect,
+        size=4,
+        checkout_timeout=30.0,
+        probe_query="SELECT 1",
+        probe_interval=60.0,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=8.0,
+    ):
+        """Creates an empty pool.
+
+        Args:
+            connect (callable): Zero-argument function returning a new connection
+            size (int, optional): Maximum number of open connections. Defaults to 4.
+            checkout_timeout (float, optional): Seconds to wait for a free
+                connection before raising PoolTimeout. Defaults to 30.
+            probe_query (str, optional): Query used as liveness probe.
+                Defaults to "SELECT 1".
+            probe_interval (float, optional): Idle seconds after which a
+                connection is probed before reuse. Defaults to 60.
+            max_retries (int, optional): Connection attempts before giving up.
+                Defaults to 3.
+            backoff (float, optional): Initial delay between attempts in
+                seconds, doubled after each failure. Defaults to 0.5.
+            max_backoff (float, optional): Upper bound for the delay. Defaults to 8.
+        """
+        self._connect = connect
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.probe_query = probe_query
+        self.probe_interval = probe_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []  # (connection, last_used, suspect) with the newest last
+        self._open = 0
+        self._metrics = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "connects": 0,
+            "connect_failures": 0,
+            "probes": 0,
+            "probe_failures": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _open_connection(self):
+        """Opens a connection, retrying with exponential backoff."""
+        delay = self.backoff
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                conn = self._connect()
+                with self._lock:
+                    self._metrics["connects"] += 1
+                return conn
+            except Exception as e:
+                with self._lock:
+                    self._metrics["connect_failures"] += 1
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"Connection attempt {attempt} failed, retrying in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+    def _is_alive(self, conn):
+        """Runs the liveness probe against a connection."""
+        with self._lock:
+            self._metrics["probes"] += 1
+        try:
+            is_closed = getattr(conn, "is_closed", None)
+            if callable(is_closed) and is_closed():
+                raise ConnectionError("connection is closed")
+            with conn.cursor() as cur:
+                cur.execute(self.probe_query)
+                cur.fetchone()
+            return True
+        except Exception as e:
+            with self._lock:
+                self._metrics["probe_failures"] += 1
+            logger.warning(f"Pooled connection failed liveness probe: {e}")
+            return False
+
+    def _discard(self, conn):
+        """Closes a connection and frees its place in the pool."""
+        with self._lock:
+            self._open -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def checkout(self, timeout=None):
+        """Takes a healthy connection from the pool, opening one if needed.
+
+        Every checkout must be paired with ``checkin``; prefer ``connection()``.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free slot.
+                Defaults to the pool's checkout_timeout.
+
+        Returns:
+            Connection object created by ``connect``
+
+        Raises:
+            PoolTimeout: If every connection stays checked out for ``timeout``
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._metrics["timeouts"] += 1
+            raise PoolTimeout(f"No connection available after {timeout:.1f}s")
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._metrics["checkouts"] += 1
+            self._metrics["wait_seconds_total"] += waited
+            self._metrics["wait_seconds_max"] = max(
+                self._metrics["wait_seconds_max"], waited
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    entry = self._idle.pop() if self._idle else None
+                if entry is None:
+                    break
+                conn, last_used, suspect = entry
+                idle_for = time.monotonic() - last_used
+                if not suspect and idle_for < self.probe_interval:
+                    return conn
+                if self._is_alive(conn):
+                    return conn
+                self._discard(conn)
+
+            conn = self._open_connection()
+            with self._lock:
+                self._open += 1
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, conn, suspect=False):
+        """Returns a connection to the pool.
+
+        Args:
+            conn: A connection obtained from ``checkout``
+            suspect (bool, optional): Probe the connection before its next use,
+                e.g. because a query on it failed. Defaults to False.
+        """
+        with self._lock:
+            self._idle.append((conn, time.monotonic(), suspect))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks a connection out and back in.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free slot.
+
+        Yields:
+            Connection object created by ``connect``
+        """
+        conn = self.checkout(timeout)
+        suspect = False
+        try:
+            yield conn
+        except BaseException:
+            suspect = True
+            raise
+        finally:
+            self.checkin(conn, suspect=suspect)
+
+    def stats(self):
+        """Returns pool usage counters.
+
+        Returns:
+            dict: Open and idle connection counts, checkouts, timeouts,
+                connects, probe results and total/max/mean wait seconds
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["open"] = self._open
+            metrics["idle"] = len(self._idle)
+        metrics["wait_seconds_mean"] = metrics["wait_seconds_total"] / max(
+            metrics["checkouts"], 1
+        )
+        return metrics
+
+    def close(self):
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+
+@st.cache_resource
+def snowflake_connection_pool():
+    """Returns the process-wide Snowflake connection pool.
+
+    The pool size is read from ``pool_size`` in the snowflake connection
+    secrets and defaults to 4.
+
+    Returns:
+        ConnectionPool: Pool of Snowflake connections shared by every session
+    """
+    size = st.secrets["connections"]["snowflake"].get("pool_size", 4)
+    return ConnectionPool(connect_to_snowflake, size=int(size))
+
+
 def save_value(key):
     """Updates the session state with a permanent value from a temporary input.
     
@@ -85,49 +437,616 @@ def save_value(key):
     st.session_state[key] = st.session_state["_" + key]
 
 
-def load_snowflake_table(_conn, table):
+def _cast_decimals(table):
+    """Casts decimal columns to float64, as fetch_pandas_all does.
+
+    NUMBER columns with a scale arrive from Snowflake as Arrow decimals,
+    which pandas would otherwise hold as Python Decimal objects.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table
+
+
+def fetch_result(cur, as_arrow=False):
+    """Fetches the result of an executed cursor as Arrow-backed data.
+
+    Consumes the Arrow record batches Snowflake returns directly instead of
+    materializing one Python tuple per row, so numeric and timestamp columns
+    keep native dtypes and peak memory stays close to the size of the data.
+    Results that are not delivered in Arrow format fall back to ``fetchall``.
+
+    Args:
+        cur (snowflake.connector.cursor.SnowflakeCursor): Cursor with an executed query
+        as_arrow (bool, optional): Return the pyarrow.Table itself instead of
+            a DataFrame. Defaults to False.
+
+    Returns:
+        pandas.DataFrame or pyarrow.Table: The query result
+    """
+    columns = [desc[0] for desc in cur.description]
+    try:
+        batches = list(cur.fetch_arrow_batches())
+    except NotSupportedError:
+        df = pd.DataFrame(cur.fetchall(), columns=columns)
+        return pa.Table.from_pandas(df, preserve_index=False) if as_arrow else df
+
+    if batches:
+        table = pa.concat_tables(batches)
+    else:
+        table = pa.table({column: pa.array([], pa.null()) for column in columns})
+
+    table = _cast_decimals(table)
+
+    if as_arrow:
+        return table
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _quote_identifier(name):
+    """Validates a table or column name before it is placed in SQL.
+
+    Args:
+        name (str): Unquoted identifier, optionally qualified ("PROD.NNDB")
+
+    Returns:
+        str: The identifier unchanged
+
+    Raises:
+        ValueError: If the name is not a plain Snowflake identifier
+    """
+    if not isinstance(name, str) or not SQL_IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+def build_select_query(
+    table, columns=None, filters=None, order_by=None, limit=None, offset=None
+):
+    """Builds a parameterized SELECT statement from its parts.
+
+    Identifiers are validated against a strict pattern and every value is
+    passed as a bind parameter, so user input never becomes SQL text.
+
+    Args:
+        table (str): Name of the table or view
+        columns (list, optional): Columns to select. Defaults to all columns.
+        filters (list, optional): (column, operator, value) tuples combined
+            with AND. Operators are =, !=, <>, <, <=, >, >=, LIKE, ILIKE, IN,
+            NOT IN, IS NULL and IS NOT NULL; the NULL tests take no value
+            (pass a 2-tuple) and IN/NOT IN take a list.
+        order_by (list, optional): Column names, each optionally followed by
+            ASC or DESC, e.g. ["DEATH_DATE DESC", "NAME"]
+        limit (int, optional): Maximum number of rows
+        offset (int, optional): Rows to skip before the first returned row
+
+    Returns:
+        tuple: (SQL string, list of bind parameters)
+    """
+    params = []
+    select = ", ".join(_quote_identifier(c) for c in columns) if columns else "*"
+    query = f"SELECT {select} FROM {_quote_identifier(table)}"
+
+    clauses = []
+    for column, operator, *value in filters or []:
+        operator = operator.upper()
+        if operator not in SQL_FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator!r}")
+        column = _quote_identifier(column)
+        if operator in ("IS NULL", "IS NOT NULL"):
+            clauses.append(f"{column} {operator}")
+        elif operator in ("IN", "NOT IN"):
+            values = list(value[0])
+            if not values:
+                clauses.append("FALSE" if operator == "IN" else "TRUE")
+                continue
+            clauses.append(f"{column} {operator} ({', '.join(['%s'] * len(values))})")
+            params.extend(values)
+        else:
+            clauses.append(f"{column} {operator} %s")
+            params.append(value[0])
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+
+    if order_by:
+        terms = []
+        for term in order_by:
+            column, *direction = term.split()
+            direction = " ".join(direction).upper()
+            if direction not in ("", "ASC", "DESC"):
+                raise ValueError(f"Invalid sort direction: {term!r}")
+            terms.append(f"{_quote_identifier(column)} {direction}".strip())
+        query += " ORDER BY " + ", ".join(terms)
+
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+        if offset:
+            query += f" OFFSET {int(offset)}"
+
+    return query, params
+
+
+def load_snowflake_table(
+    _conn,
+    table,
+    columns=None,
+    filters=None,
+    order_by=None,
+    limit=None,
+    as_arrow=False,
+    offset=None,
+):
     """Loads a specific Snowflake table using SQL.
 
-    Executes a SELECT * query on the specified table or view and returns
-    all rows as a pandas DataFrame. The function handles column name extraction
-    and data conversion automatically.
+    Selects the requested columns and rows of the specified table or view
+    (by default SELECT *) and returns them as a pandas DataFrame. Projection,
+    filtering, ordering and limits run in Snowflake, so only the needed data
+    is transferred. Rows are fetched as Arrow record batches (see
+    ``fetch_result``), so column names and dtypes come from the result schema.
+
+    Example:
+        load_snowflake_table(
+            conn,
+            "picks_current_year",
+            columns=["NAME", "WIKI_ID", "DEATH_DATE"],
+            filters=[("DEATH_DATE", "IS NOT NULL")],
+            order_by=["DEATH_DATE DESC"],
+        )
 
     Args:
         _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
         table (str): Name of the table or view to query (no database or schema needed)
+        columns (list, optional): Columns to select. Defaults to all columns.
+        filters (list, optional): (column, operator, value) tuples, see
+            ``build_select_query``
+        order_by (list, optional): Sort terms such as "DEATH_DATE DESC"
+        limit (int, optional): Maximum number of rows
+        as_arrow (bool, optional): Return a pyarrow.Table instead of a
+            DataFrame. Defaults to False.
+        offset (int, optional): Rows to skip, for pagination together with
+            ``limit`` and a stable ``order_by``
 
     Returns:
-        pandas.DataFrame: Complete contents of the specified table/view
+        pandas.DataFrame or pyarrow.Table: Selected contents of the specified table/view
     """
-    query = f"SELECT * FROM {table}"
+    query, params = build_select_query(table, columns, filters, order_by, limit, offset)
 
     # Use cursor to execute the query
     with _conn.cursor() as cur:
-        cur.execute(query)
-        result = cur.fetchall()
-        # Get column names from cursor
+        cur.execute(query, params or None)
+        return fetch_result(cur, as_arrow)
+
+
+def iter_result_chunks(cur, chunk_size=DEFAULT_CHUNK_ROWS, as_arrow=False):
+    """Yields the result of an executed cursor in chunks of bounded size.
+
+    Args:
+        cur (snowflake.connector.cursor.SnowflakeCursor): Cursor with an executed query
+        chunk_size (int, optional): Maximum rows per chunk. Defaults to 50,000.
+        as_arrow (bool, optional): Yield pyarrow.Table chunks instead of
+            DataFrames. Defaults to False.
+
+    Yields:
+        pandas.DataFrame or pyarrow.Table: Consecutive chunks of the result
+    """
+    try:
+        batches = cur.fetch_arrow_batches()
+    except NotSupportedError:
         columns = [desc[0] for desc in cur.description]
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                return
+            df = pd.DataFrame(rows, columns=columns)
+            yield pa.Table.from_pandas(df, preserve_index=False) if as_arrow else df
 
-    # Convert the result to a Pandas DataFrame
-    df = pd.DataFrame(result, columns=columns)
+    for batch in batches:
+        batch = _cast_decimals(batch)
+        for start in range(0, batch.num_rows, chunk_size):
+            chunk = batch.slice(start, chunk_size)
+            yield chunk if as_arrow else chunk.to_pandas(split_blocks=True)
 
-    return df
+
+def iter_snowflake_table(
+    _conn,
+    table,
+    chunk_size=DEFAULT_CHUNK_ROWS,
+    columns=None,
+    filters=None,
+    order_by=None,
+    limit=None,
+    as_arrow=False,
+):
+    """Streams a Snowflake table or view in chunks of bounded size.
+
+    Generator counterpart of ``load_snowflake_table`` for large sources such
+    as ``nndb`` or the full ``people`` table. Arrow batches are consumed as
+    they arrive and re-sliced into chunks of at most ``chunk_size`` rows, so
+    only one chunk (plus the batch being sliced) is held in memory at a time.
+
+    Example:
+        total = 0
+        for chunk in iter_snowflake_table(conn, "nndb", columns=["AGE"]):
+            total += chunk["AGE"].sum()
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        table (str): Name of the table or view to query
+        chunk_size (int, optional): Maximum rows per chunk. Defaults to 50,000.
+        columns (list, optional): Columns to select. Defaults to all columns.
+        filters (list, optional): (column, operator, value) tuples, see
+            ``build_select_query``
+        order_by (list, optional): Sort terms such as "DEATH_DATE DESC"
+        limit (int, optional): Maximum number of rows
+        as_arrow (bool, optional): Yield pyarrow.Table chunks instead of
+            DataFrames. Defaults to False.
+
+    Yields:
+        pandas.DataFrame or pyarrow.Table: Consecutive chunks of the result
+    """
+    query, params = build_select_query(table, columns, filters, order_by, limit)
+
+    with _conn.cursor() as cur:
+        cur.execute(query, params or None)
+        yield from iter_result_chunks(cur, chunk_size, as_arrow)
 
 
-def run_snowflake_query(_conn, query):
+def run_snowflake_query(_conn, query, as_arrow=False, params=None):
     """Executes a SQL query on Snowflake and returns the results as a pandas DataFrame.
-    
+
     Args:
         _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
         query (str): SQL query to execute
-        
+        as_arrow (bool, optional): Return a pyarrow.Table instead of a
+            DataFrame. Defaults to False.
+        params (list or dict, optional): Bind parameters for %s or %(name)s
+            placeholders in the query
+
     Returns:
-        pandas.DataFrame: Results of the query as a DataFrame
+        pandas.DataFrame or pyarrow.Table: Results of the query
     """
     with _conn.cursor() as cur:
-        cur.execute(query)
-        result = cur.fetch_pandas_all()
-        return result
+        cur.execute(query, params)
+        return fetch_result(cur, as_arrow)
+
+
+def _copy_result(value):
+    """Copies a DataFrame; Arrow tables are immutable and shared as-is."""
+    return value if isinstance(value, pa.Table) else value.copy()
+
+
+def _result_size(value):
+    """Returns the in-memory size of a DataFrame or Arrow table in bytes."""
+    if isinstance(value, pa.Table):
+        return value.nbytes
+    return int(value.memory_usage(deep=True).sum())
+
+
+class QueryCache:
+    """Size-bounded LRU cache of query results with per-table TTLs.
+
+    Entries are keyed by table or query and remember which tables they read
+    from, so write paths can drop every affected entry with ``invalidate``.
+    The cache holds DataFrames or Arrow tables and bounds both the number of
+    entries and their total in-memory size; the least recently used entries
+    are evicted first. DataFrames are copied on the way in and out so callers
+    can modify them freely.
+    """
+
+    def __init__(
+        self,
+        max_entries=64,
+        max_bytes=256 * 1024 * 1024,
+        default_ttl=60,
+        table_ttls=None,
+        dependencies=None,
+    ):
+        """Creates an empty cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached results.
+                Defaults to 64.
+            max_bytes (int, optional): Maximum total DataFrame size in bytes.
+                Defaults to 256 MB.
+            default_ttl (float, optional): Seconds a result stays valid when
+                its table has no entry in ``table_ttls``. Defaults to 60.
+            table_ttls (dict, optional): Seconds per table or view name.
+            dependencies (dict, optional): Base table name to the views that
+                read from it, used to expand ``invalidate`` calls.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.table_ttls = {k.lower(): v for k, v in (table_ttls or {}).items()}
+        self.dependencies = {
+            k.lower(): {v.lower() for v in views}
+            for k, views in (dependencies or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires, tables, size)
+        self._bytes = 0
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def ttl_for(self, tables):
+        """Returns the shortest TTL of a set of tables."""
+        return min(
+            (self.table_ttls.get(t.lower(), self.default_ttl) for t in tables),
+            default=self.default_ttl,
+        )
+
+    def get(self, key):
+        """Returns a copy of a cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return _copy_result(entry[0])
+
+    def put(self, key, value, tables, ttl=None):
+        """Stores a value read from ``tables`` and evicts old entries if needed."""
+        tables = frozenset(t.lower() for t in tables)
+        ttl = self.ttl_for(tables) if ttl is None else ttl
+        size = _result_size(value)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (
+                _copy_result(value),
+                time.monotonic() + ttl,
+                tables,
+                size,
+            )
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._metrics["evictions"] += 1
+
+    def _remove(self, key):
+        _, _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def invalidate(self, *tables):
+        """Drops every entry that read from the given tables or their views.
+
+        Args:
+            *tables (str): Table names that were written to
+
+        Returns:
+            int: Number of entries removed
+        """
+        affected = set()
+        for table in tables:
+            affected.add(table.lower())
+            affected.update(self.dependencies.get(table.lower(), ()))
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e[2] & affected]
+            for key in stale:
+                self._remove(key)
+            self._metrics["invalidations"] += len(stale)
+        return len(stale)
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Returns hit, miss, eviction and invalidation counters with the current size."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+            metrics["bytes"] = self._bytes
+        return metrics
+
+
+@st.cache_resource
+def snowflake_query_cache():
+    """Returns the process-wide query result cache.
+
+    Returns:
+        QueryCache: Cache shared by every session, configured with
+            CACHE_TABLE_TTLS and CACHE_DEPENDENCIES
+    """
+    return QueryCache(table_ttls=CACHE_TABLE_TTLS, dependencies=CACHE_DEPENDENCIES)
+
+
+def load_cached_snowflake_table(_conn, table, ttl=None, **kwargs):
+    """Loads a Snowflake table or view through the shared result cache.
+
+    Same as ``load_snowflake_table`` but served from memory while the cached
+    result is younger than the table's TTL and no write path invalidated it.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        table (str): Name of the table or view to query
+        ttl (float, optional): Override for the table's TTL in seconds
+        **kwargs: Passed through to ``load_snowflake_table``
+
+    Returns:
+        pandas.DataFrame: Contents of the specified table/view
+    """
+    cache = snowflake_query_cache()
+    key = ("table", table.lower(), repr(sorted(kwargs.items())))
+    df = cache.get(key)
+    if df is None:
+        df = load_snowflake_table(_conn, table, **kwargs)
+        cache.put(key, df, [table], ttl)
+    return df
+
+
+def run_cached_snowflake_query(_conn, query, tables, ttl=None, params=None):
+    """Runs a query through the shared result cache.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        query (str): SQL query to execute
+        tables (list): Tables or views the query reads, used for TTL and invalidation
+        ttl (float, optional): Override for the TTL in seconds
+        params (list or dict, optional): Bind parameters, part of the cache key
+
+    Returns:
+        pandas.DataFrame: Results of the query as a DataFrame
+    """
+    cache = snowflake_query_cache()
+    key = ("query", query, repr(params))
+    df = cache.get(key)
+    if df is None:
+        df = run_snowflake_query(_conn, query, params=params)
+        cache.put(key, df, tables, ttl)
+    return df
+
+
+def get_table_version(_conn, table, ttl=TABLE_VERSION_TTL):
+    """Returns a token that changes whenever a table's data changes.
+
+    Reads LAST_ALTERED from the information schema of the current schema.
+    The lookup itself is cached for ``ttl`` seconds. Use the token as a cache
+    key so derived results are recomputed only after the table changes.
+
+    Args:
+        _conn (snowflake.connector.connection.SnowflakeConnection): Active Snowflake connection
+        table (str): Name of the table or view
+        ttl (float, optional): Seconds to reuse the lookup. Defaults to 60.
+
+    Returns:
+        str or None: The LAST_ALTERED timestamp, or None if the table is unknown
+    """
+    df = run_cached_snowflake_query(
+        _conn, SQL_TABLE_VERSION, [table], ttl=ttl, params=[table.upper()]
+    )
+    return str(df["LAST_ALTERED"].iloc[0]) if len(df) else None
+
+
+def invalidate_snowflake_cache(*tables):
+    """Drops cached results that depend on tables that were just written to.
+
+    Call after every committed write so the next read sees the change.
+
+    Args:
+        *tables (str): Base tables that were modified, e.g. "people"
+    """
+    removed = snowflake_query_cache().invalidate(*tables)
+    logger.debug(f"Invalidated {removed} cached results for {tables}")
+
+
+class LoadResult(NamedTuple):
+    """Outcome of one named load run by ``load_parallel``."""
+
+    value: Any
+    seconds: float
+    error: Optional[BaseException]
+
+
+class _LazyConnection:
+    """Checks a pooled connection out on first use only.
+
+    Loads served from the result cache never touch the connection, so they
+    do not take a pool slot.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+
+    def cursor(self, *args, **kwargs):
+        return self._connection().cursor(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._connection(), name)
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = self._pool.checkout()
+        return self._conn
+
+    def release(self, suspect=False):
+        if self._conn is not None:
+            self._pool.checkin(self._conn, suspect=suspect)
+            self._conn = None
+
+
+@st.cache_resource
+def _load_executor():
+    """Returns the process-wide thread pool used by ``load_parallel``."""
+    return ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix="snowflake-load")
+
+
+def load_parallel(loads, timeout=None, raise_errors=True):
+    """Runs independent named loads concurrently over pooled connections.
+
+    Each load is called with its own connection from
+    ``snowflake_connection_pool``. The connection is checked out only if the
+    load actually queries Snowflake. Page latency therefore approaches that
+    of the slowest load rather than the sum of all of them. A single load
+    without a timeout is called directly on the current thread, since the
+    thread pool would only add overhead.
+
+    Example:
+        results = load_parallel({
+            "current": lambda conn: load_cached_snowflake_table(conn, "score_current_year"),
+            "2024": lambda conn: load_cached_snowflake_table(conn, "score_twenty_four"),
+        })
+        df_current = results["current"].value
+
+    Args:
+        loads (dict): Name to callable taking a connection and returning a result
+        timeout (float, optional): Seconds to wait for all loads. Loads still
+            running then get a TimeoutError; finished ones keep their
+            results. Defaults to no limit.
+        raise_errors (bool, optional): Re-raise the first failed load's exception
+            after all loads finished. Defaults to True.
+
+    Returns:
+        dict: Name to LoadResult(value, seconds, error)
+    """
+    pool = snowflake_connection_pool()
+    ctx = get_script_run_ctx()
+
+    def run(load):
+        # Let st.cache_* and st.secrets work on the worker thread
+        add_script_run_ctx(threading.current_thread(), ctx)
+        conn = _LazyConnection(pool)
+        started = time.monotonic()
+        try:
+            return LoadResult(load(conn), time.monotonic() - started, None)
+        except Exception as e:
+            conn.release(suspect=True)
+            return LoadResult(None, time.monotonic() - started, e)
+        finally:
+            conn.release()
+
+    started = time.monotonic()
+    if len(loads) == 1 and timeout is None:
+        results = {name: run(load) for name, load in loads.items()}
+    else:
+        futures = {name: _load_executor().submit(run, load) for name, load in loads.items()}
+        wait(futures.values(), timeout=timeout)
+        results = {}
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+            else:
+                # Keep what finished; only the slow load fails
+                error = TimeoutError(f"Load {name} did not finish within {timeout}s")
+                results[name] = LoadResult(None, time.monotonic() - started, error)
+
+    timings = ", ".join(f"{name}={result.seconds:.3f}s" for name, result in results.items())
+    logger.info(f"Loaded {len(results)} in parallel in {time.monotonic() - started:.3f}s ({timings})")
+
+    if raise_errors:
+        for name, result in results.items():
+            if result.error is not None:
+                raise result.error
+    return results
 
 
 def is_admin():
@@ -197,10 +1116,12 @@ def the_arbiter(prompt, arbiter_version="main"):
 def has_fuzzy_match(value, df, column, threshold=85):
     """Performs fuzzy text matching using natural language processing.
 
-    Uses the FuzzyWuzzy library to find approximate string matches,
-    accounting for typos, case differences, and word order variations.
-    The function compares the input value against all entries in the
-    specified DataFrame column and returns both match status and ID.
+    Finds approximate string matches, accounting for typos, case differences,
+    accents and word order variations. Names are normalized once with
+    ``dp_matching.normalize_name`` and the whole column is scored in a single
+    RapidFuzz call, so the best-scoring entry is returned rather than the
+    first one over the threshold. For repeated lookups against the same data
+    build a ``dp_matching.NameIndex`` instead.
 
     Args:
         value (str): The string value to search for
@@ -211,7 +1132,7 @@ def has_fuzzy_match(value, df, column, threshold=85):
 
     Returns:
         tuple: (bool, int or None) - First element indicates if a match was found,
-            second element is the ID of the matched row or None if no match
+            second element is the ID of the best matched row or None if no match
     """
     # Handle empty dataframe/list case
     if isinstance(df, pd.DataFrame):
@@ -225,20 +1146,44 @@ def has_fuzzy_match(value, df, column, threshold=85):
     else:
         raise ValueError(f"Expected DataFrame or list, got {type(df)}")
 
-    for index, item in enumerate(value_set):
-        if fuzz.token_sort_ratio(value.lower(), item.lower()) >= threshold:
-            # Get ID differently based on input type
-            if isinstance(df, pd.DataFrame):
-                person_id = df.iloc[index]["ID"]
-            else:
-                # For list input, we can't get an ID
-                person_id = None
-            return True, person_id
-    return False, None
+    result = process.extractOne(
+        normalize_name(value),
+        [normalize_name(item) for item in value_set],
+        scorer=fuzz.ratio,
+        score_cutoff=threshold,
+    )
+    if result is None:
+        return False, None
+
+    # Get ID differently based on input type
+    _, _, index = result
+    if isinstance(df, pd.DataFrame):
+        person_id = df.iloc[index]["ID"]
+    else:
+        # For list input, we can't get an ID
+        person_id = None
+    return True, person_id
+
+
+@st.cache_resource
+def notification_dispatcher():
+    """Returns the process-wide SMS dispatcher shared by every session.
+
+    Returns:
+        NotificationDispatcher: Dispatcher delivering through Twilio
+    """
+    transport = TwilioTransport(
+        st.secrets["twilio"]["account_sid"], st.secrets["twilio"]["auth_token"]
+    )
+    return NotificationDispatcher(transport)
 
 
 def send_sms(message_text, distro_list):
-    """Send Twilio SMS Message
+    """Queue a Twilio SMS Message for background delivery
+
+    Duplicate numbers are sent once. The call returns as soon as the
+    messages are queued; delivery, retries and rate limiting happen on the
+    dispatcher's worker threads.
 
     Args:
         message_text (str): The body of the message
@@ -246,76 +1191,110 @@ def send_sms(message_text, distro_list):
                             +15552229999
 
     Returns:
-        twilio object: information about the message status after sending.
+        list: Futures resolving to a DeliveryResult per distinct number
     """
-    account_sid = st.secrets["twilio"]["account_sid"]
-    auth_token = st.secrets["twilio"]["auth_token"]
+    return notification_dispatcher().send(message_text, distro_list)
 
-    client = Client(account_sid, auth_token)
 
-    for number in distro_list:
-        message = client.messages.create(
-            from_="+18449891781", body=message_text, to=number
-        )
+@st.cache_resource
+def wikidata_store():
+    """Returns the process-wide persistent Wikidata store.
+
+    Returns:
+        WikidataStore: SQLite-backed store in $DEADPOOL_CACHE_DIR
+    """
+    return WikidataStore()
+
+
+@st.cache_resource
+def thumbnail_cache():
+    """Returns the process-wide portrait thumbnail cache.
+
+    Returns:
+        ThumbnailCache: Disk cache in $DEADPOOL_CACHE_DIR/thumbnails
+    """
+    return ThumbnailCache()
+
+
+@st.cache_resource
+def feature_flags():
+    """Returns the process-wide LaunchDarkly client.
 
-    return message.sid
+    The client is created once per process. If the ``DEADPOOL_FLAGS_FILE``
+    environment variable is set, flags are read from that file offline
+    instead of from LaunchDarkly.
+
+    Returns:
+        FlagClient: Shared feature flag client
+    """
+    flags_file = os.environ.get("DEADPOOL_FLAGS_FILE")
+    if flags_file:
+        flags = FlagClient(flags_file=flags_file)
+    else:
+        flags = FlagClient(sdk_key=st.secrets["other"]["launchdarkly_sdk_key"])
+    atexit.register(flags.close)
+    return flags
 
 
 def get_ld_context():
     """Creates and returns a LaunchDarkly context for the current user.
-    
+
     Retrieves user information from the session state and builds a LaunchDarkly
     context object that can be used for feature flag evaluation. The context
-    includes the user's key, name, and email.
-    
+    includes the user's key, name, and email. Contexts are memoized per user.
+
     Returns:
         ldclient.Context: LaunchDarkly context object for the current user
     """
-    # Get the LaunchDarkly SDK key from Streamlit Secrets
-    sdk_key = st.secrets["other"]["launchdarkly_sdk_key"]
-    ldclient.set_config(Config(sdk_key))
-
     # Get the user's information from Streamlit Authenticator
     app_username = st.session_state.username
-    user_email = st.session_state.email
-    user_name = st.session_state.name
     user_key = st.session_state["config"]["credentials"]["usernames"][app_username][
         "id"
     ]
 
-    # Build the user context for LaunchDarkly
-    builder = Context.builder(user_key)
-    builder.kind("user")
-    builder.name(user_name)
-    builder.set("email", user_email)
-    context = builder.build()
+    return build_context(
+        str(user_key), st.session_state.name, st.session_state.email
+    )
+
+
+@st.cache_resource
+def analytics_buffer():
+    """Returns the process-wide Mixpanel event buffer.
 
-    return context
+    Returns:
+        AnalyticsBuffer: Buffer flushed to Mixpanel in the background
+    """
+    analytics = AnalyticsBuffer(st.secrets["other"]["mixpanel"])
+    atexit.register(analytics.close)
+    return analytics
 
 
 def mp_track_page_view(page_name):
     """Track a page view event in Mixpanel.
-    
-    Sends a page view event to Mixpanel with the current user's username
-    and the name of the page being viewed. This function is called when
-    a user navigates to a new page in the Deadpool application.
+
+    Queues a page view event with the current user's username and the name
+    of the page being viewed. Streamlit reruns the page script on every
+    widget interaction, so the event is only recorded when the session
+    navigates to a different page. The user's profile is only sent when it
+    has changed.
     """
-    
-    # initialize Mixpanel
-    mp = Mixpanel(st.secrets["other"]["mixpanel"])
- 
-    mp.track(
-        st.session_state["config"]["credentials"]["usernames"][
-            st.session_state.username
-        ]["id"],
+    view = (st.session_state.username, page_name)
+    if st.session_state.get("analytics_last_view") == view:
+        return
+    st.session_state["analytics_last_view"] = view
+
+    user_id = st.session_state["config"]["credentials"]["usernames"][
+        st.session_state.username
+    ]["id"]
+
+    analytics = analytics_buffer()
+    analytics.track(
+        user_id,
         "Page View",
         {"Page": page_name, "User": st.session_state.username},
     )
-
-    mp.people_set(
-        st.session_state["config"]["credentials"]["usernames"][
-            st.session_state.username
-        ]["id"],
+    analytics.identify(
+        user_id,
         {
             "name": st.session_state.name,
             "$email": st.session_state.email,
@@ -0,0 +1,390 @@
+"""
+Batched Wikidata lookups for the Deadpool application.
+
+The Death Wall shows each person's birth date, death date, image and
+description from Wikidata. This module looks up a whole list of Wikidata IDs
+with one SPARQL query per chunk, using a VALUES clause, instead of one
+round trip per person.
+
+A chunk that fails is retried one ID at a time, so a single bad ID or a
+transient error only loses the affected people and not the whole page.
+
+Results are kept in a SQLite file (``WikidataStore``) that survives
+restarts and redeploys. Found people are kept for 30 days. IDs Wikidata has
+no data for are kept for one day. Failed lookups are never stored. The
+store lives in ``$DEADPOOL_CACHE_DIR``, which defaults to ``~/.cache/deadpool``.
+
+The store can also resolve IDs on a small background thread pool
+(``submit`` and ``prefetch_async``). Pages can then fill in people as results
+arrive and warm the next page while the current one is read. An ID already
+being fetched is not fetched a second time.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from SPARQLWrapper import JSON, SPARQLWrapper
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Wikidata Constants
+WIKIDATA_ENDPOINT = "https://query.wikidata.org/sparql"
+WIKIDATA_AGENT = "deadpool-app (https://github.com/broepke/deadpool-app)"
+WIKI_ID_PATTERN = re.compile(r"^Q\d+$")
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_TIMEOUT = 5
+DEFAULT_DEADLINE = 30
+MAX_SINGLE_FAILURES = 3
+DEFAULT_WORKERS = 4
+
+# Store Constants
+CACHE_DIR = os.environ.get(
+    "DEADPOOL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "deadpool")
+)
+STORE_FILENAME = "wikidata.sqlite3"
+POSITIVE_TTL = 30 * 24 * 3600
+NEGATIVE_TTL = 24 * 3600
+STORE_READ_CHUNK = 500
+
+SPARQL_BATCH_QUERY = """
+SELECT ?person ?birthDate ?deathDate ?image ?description
+WHERE {{
+VALUES ?person {{ {values} }}
+?person wdt:P569 ?birthDate.
+?person wdt:P570 ?deathDate.
+OPTIONAL {{ ?person wdt:P18 ?image. }}
+OPTIONAL {{ ?person schema:description ?description. FILTER(LANG(?description) = "en") }}
+}}
+"""
+
+
+class PersonDetails(NamedTuple):
+    """Wikidata facts shown for one person."""
+
+    wiki_id: str
+    birth_date: Optional[str]
+    death_date: Optional[str]
+    image_url: Optional[str]
+    description: str
+
+
+def is_wiki_id(value) -> bool:
+    """Returns True if a value looks like a Wikidata item ID such as Q42."""
+    return isinstance(value, str) and bool(WIKI_ID_PATTERN.match(value))
+
+
+def _run_query(wiki_ids: List[str], timeout: float) -> Dict[str, PersonDetails]:
+    """Runs one VALUES query and maps the bindings back to their IDs."""
+    sparql = SPARQLWrapper(WIKIDATA_ENDPOINT, agent=WIKIDATA_AGENT)
+    sparql.setQuery(
+        SPARQL_BATCH_QUERY.format(values=" ".join(f"wd:{wiki_id}" for wiki_id in wiki_ids))
+    )
+    sparql.setReturnFormat(JSON)
+    sparql.setTimeout(int(timeout))
+    bindings = sparql.query().convert()["results"]["bindings"]
+
+    details = {}
+    for binding in bindings:
+        wiki_id = binding["person"]["value"].rsplit("/", 1)[-1]
+        # Keep the first row per person, as the single-ID query used LIMIT 1
+        if wiki_id not in details:
+            details[wiki_id] = PersonDetails(
+                wiki_id,
+                binding.get("birthDate", {}).get("value"),
+                binding.get("deathDate", {}).get("value"),
+                binding.get("image", {}).get("value"),
+                binding.get("description", {}).get("value", ""),
+            )
+    return details
+
+
+def fetch_people(
+    wiki_ids: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timeout: float = DEFAULT_TIMEOUT,
+    deadline: float = DEFAULT_DEADLINE,
+) -> Dict[str, Optional[PersonDetails]]:
+    """Looks up birth/death dates, image and description for many people.
+
+    A failed chunk is retried one ID at a time, to isolate an ID that breaks
+    the query. The retries stop after MAX_SINGLE_FAILURES failures in a row,
+    when the endpoint is most likely down, and no query starts after the
+    deadline.
+
+    Args:
+        wiki_ids: Wikidata IDs such as "Q42"; duplicates and invalid IDs are ignored
+        chunk_size: IDs per SPARQL query. Defaults to 50.
+        timeout: Seconds per HTTP request. Defaults to 5.
+        deadline: Seconds after which no new query is started. Defaults to 30.
+
+    Returns:
+        dict: Maps each looked-up ID to its PersonDetails, or to None when
+        Wikidata has no birth and death date for it. IDs whose lookup failed
+        are left out so callers can retry them.
+    """
+    unique_ids = list(dict.fromkeys(wiki_id for wiki_id in wiki_ids if is_wiki_id(wiki_id)))
+    results: Dict[str, Optional[PersonDetails]] = {}
+    stop_at = time.monotonic() + deadline
+
+    for start in range(0, len(unique_ids), chunk_size):
+        if time.monotonic() > stop_at:
+            logger.warning(f"Wikidata lookup deadline reached, {len(unique_ids) - start} IDs left")
+            break
+        chunk = unique_ids[start : start + chunk_size]
+        try:
+            found = _run_query(chunk, timeout)
+        except Exception as e:
+            logger.warning(f"Wikidata batch of {len(chunk)} IDs failed, retrying singly: {e}")
+            found = {}
+            failures = 0
+            for wiki_id in chunk:
+                if failures >= MAX_SINGLE_FAILURES or time.monotonic() > stop_at:
+                    logger.warning("Giving up on single Wikidata lookups for this batch")
+                    break
+                try:
+                    found.update(_run_query([wiki_id], timeout))
+                except Exception as e:
+                    logger.error(f"Error querying Wikidata for ID {wiki_id}: {str(e)}")
+                    failures += 1
+                    continue
+                failures = 0
+                found.setdefault(wiki_id, None)
+            if failures >= MAX_SINGLE_FAILURES:
+                # The endpoint is failing, not one ID: leave the rest for a retry
+                results.update(found)
+                break
+        else:
+            for wiki_id in chunk:
+                found.setdefault(wiki_id, None)
+        results.update(found)
+
+    logger.debug(f"Wikidata lookup resolved {len(results)} of {len(unique_ids)} IDs")
+    return results
+
+
+class WikidataStore:
+    """Persistent SQLite store of Wikidata lookups keyed by WIKI_ID.
+
+    Example:
+        store = WikidataStore()
+        store.prefetch(df["WIKI_ID"])
+        people = store.lookup(page_ids)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        positive_ttl: float = POSITIVE_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        fetch: Callable[[Iterable[str]], Dict[str, Optional[PersonDetails]]] = fetch_people,
+        workers: int = DEFAULT_WORKERS,
+    ):
+        """Opens (and creates if needed) the store.
+
+        Args:
+            path: SQLite file. Defaults to wikidata.sqlite3 in CACHE_DIR.
+            positive_ttl: Seconds a found person is kept. Defaults to 30 days.
+            negative_ttl: Seconds an ID without data is kept. Defaults to 1 day.
+            fetch: Function resolving IDs on a miss. Defaults to fetch_people.
+            workers: Threads for background resolution. Defaults to 4.
+        """
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, STORE_FILENAME)
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.fetch = fetch
+        self.hits = 0
+        self.misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wikidata")
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS wikidata_people (
+                wiki_id TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                birth_date TEXT,
+                death_date TEXT,
+                image_url TEXT,
+                description TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    def get_many(self, wiki_ids: Iterable[str]) -> Tuple[Dict[str, Optional[PersonDetails]], List[str]]:
+        """Reads fresh entries from the store.
+
+        Args:
+            wiki_ids: Wikidata IDs to read; invalid IDs are ignored
+
+        Returns:
+            tuple: (stored results, IDs that are missing or expired)
+        """
+        unique_ids = list(dict.fromkeys(wiki_id for wiki_id in wiki_ids if is_wiki_id(wiki_id)))
+        if not unique_ids:
+            return {}, []
+
+        now = time.time()
+        rows = []
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(unique_ids), STORE_READ_CHUNK):
+                chunk = unique_ids[start : start + STORE_READ_CHUNK]
+                rows += self._db.execute(
+                    f"SELECT * FROM wikidata_people WHERE wiki_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+
+        stored: Dict[str, Optional[PersonDetails]] = {}
+        for wiki_id, found, birth, death, image, description, fetched_at in rows:
+            ttl = self.positive_ttl if found else self.negative_ttl
+            if now - fetched_at < ttl:
+                stored[wiki_id] = (
+                    PersonDetails(wiki_id, birth, death, image, description or "") if found else None
+                )
+        missing = [wiki_id for wiki_id in unique_ids if wiki_id not in stored]
+
+        with self._lock:
+            self.hits += len(stored)
+            self.misses += len(missing)
+        return stored, missing
+
+    def put_many(self, results: Dict[str, Optional[PersonDetails]]) -> None:
+        """Writes lookup results; None records an ID Wikidata has no data for."""
+        now = time.time()
+        rows = [
+            (wiki_id, 1, *details[1:], now) if details else (wiki_id, 0, None, None, None, None, now)
+            for wiki_id, details in results.items()
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO wikidata_people VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def lookup(self, wiki_ids: Iterable[str]) -> Dict[str, Optional[PersonDetails]]:
+        """Returns details for IDs from the store, fetching only the misses.
+
+        Args:
+            wiki_ids: Wikidata IDs to resolve
+
+        Returns:
+            dict: ID to PersonDetails (None if Wikidata has no data). IDs
+            whose fetch failed are left out.
+        """
+        stored, missing = self.get_many(wiki_ids)
+        if missing:
+            stored.update(self._resolve(missing))
+        return stored
+
+    def _resolve(self, wiki_ids: List[str]) -> Dict[str, Optional[PersonDetails]]:
+        """Fetches IDs from Wikidata and writes the results to the store."""
+        fetched = self.fetch(wiki_ids)
+        self.put_many(fetched)
+        return fetched
+
+    def prefetch(self, wiki_ids: Iterable[str]) -> int:
+        """Fills the store for every missing or expired ID in bulk.
+
+        Args:
+            wiki_ids: Wikidata IDs to make available locally
+
+        Returns:
+            int: Number of IDs fetched from Wikidata
+        """
+        _, missing = self.get_many(wiki_ids)
+        if not missing:
+            return 0
+        fetched = self._resolve(missing)
+        logger.info(f"Prefetched {len(fetched)} of {len(missing)} Wikidata IDs")
+        return len(fetched)
+
+    def submit(self, wiki_ids: Iterable[str], chunk_size: int = 1) -> Dict[Future, List[str]]:
+        """Resolves IDs in the background, in small concurrent chunks.
+
+        IDs that are already being fetched share the existing future.
+
+        Args:
+            wiki_ids: Wikidata IDs to fetch (normally the store's misses)
+            chunk_size: IDs per background task. Defaults to 1.
+
+        Returns:
+            dict: Future to the IDs it covers. Each future resolves to the
+            ``fetch_people`` result for its chunk.
+        """
+        futures: Dict[Future, List[str]] = {}
+        new_ids = []
+        with self._lock:
+            for wiki_id in dict.fromkeys(wiki_id for wiki_id in wiki_ids if is_wiki_id(wiki_id)):
+                future = self._in_flight.get(wiki_id)
+                if future is None:
+                    new_ids.append(wiki_id)
+                else:
+                    futures.setdefault(future, []).append(wiki_id)
+
+            for start in range(0, len(new_ids), chunk_size):
+                chunk = new_ids[start : start + chunk_size]
+                future = self._executor.submit(self._resolve, chunk)
+                for wiki_id in chunk:
+                    self._in_flight[wiki_id] = future
+                futures[future] = chunk
+
+        for future, chunk in futures.items():
+            future.add_done_callback(lambda f, chunk=chunk: self._finished(f, chunk))
+        return futures
+
+    def _finished(self, future: Future, wiki_ids: List[str]) -> None:
+        with self._lock:
+            for wiki_id in wiki_ids:
+                if self._in_flight.get(wiki_id) is future:
+                    del self._in_flight[wiki_id]
+
+    def prefetch_async(self, wiki_ids: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Starts a background fill of every missing or expired ID.
+
+        Args:
+            wiki_ids: Wikidata IDs to make available locally
+            chunk_size: IDs per background task. Defaults to 50.
+
+        Returns:
+            int: Number of IDs scheduled
+        """
+        _, missing = self.get_many(wiki_ids)
+        if missing:
+            self.submit(missing, chunk_size)
+        return len(missing)
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries and returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM wikidata_people WHERE (found = 1 AND fetched_at < ?) OR (found = 0 AND fetched_at < ?)",
+                (now - self.positive_ttl, now - self.negative_ttl),
+            )
+            self._db.commit()
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss counters and the number of stored entries."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM wikidata_people").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "in_flight": len(self._in_flight),
+            }
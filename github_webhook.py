@@ -1,6 +1,7 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import logging
 from subprocess import STDOUT, check_output
+from dp_images import ThumbnailCache
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -9,12 +10,41 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.INFO,
                     format="%(asctime)s %(levelname)s %(message)s")
 
+# Thumbnails are immutable per URL, so browsers may keep them for a year
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+thumbnails = ThumbnailCache()
+
 
 @app.route("/health_check", methods=["GET"])
 def health_check():
     return jsonify({"status": "healthy"}), 200
 
 
+@app.route("/thumbnail", methods=["GET"])
+def thumbnail():
+    url = request.args.get("url", "")
+    if not thumbnails.is_allowed(url):
+        return jsonify({"error": "Image host not allowed"}), 400
+
+    etag = thumbnails.key(url)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
+
+    data = thumbnails.get(url)
+    if data is None:
+        return jsonify({"error": "Image unavailable"}), 502
+    return Response(
+        data,
+        mimetype="image/jpeg",
+        headers={"Cache-Control": THUMBNAIL_CACHE_CONTROL, "ETag": f'"{etag}"'},
+    )
+
+
+@app.route("/thumbnail/stats", methods=["GET"])
+def thumbnail_stats():
+    return jsonify(thumbnails.stats()), 200
+
+
 @app.route("/github-webhook", methods=["POST"])
 def github_webhook():
     payload = request.json
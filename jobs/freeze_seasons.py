@@ -0,0 +1,60 @@
+"""
+Freeze closed Deadpool seasons into local archives.
+
+Copies the picks and score views of every closed season that ended at
+least FREEZE_GRACE_DAYS ago (see ``dp_seasons.freezable_seasons``) into
+compressed Arrow IPC files that the pages memory-map instead of querying
+Snowflake. The pages never freeze a season themselves. Archives that
+already exist are kept unless --force is given, which re-freezes them after
+a late correction; running pages pick up the new file. Run from the
+repository root once a season is final:
+
+    python -m jobs.freeze_seasons
+    python -m jobs.freeze_seasons --year 2024 --force
+
+Outputs:
+- $DEADPOOL_CACHE_DIR/seasons/<kind>_<year>.arrow (or --archive-dir)
+"""
+
+import argparse
+import logging
+import os
+
+from dp_seasons import (
+    ARCHIVE_DIR,
+    SEASON_KINDS,
+    archive_path,
+    freezable_seasons,
+    freeze_season,
+    read_archive,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--year", type=int, action="append", help="Season to freeze (repeatable)")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help="Directory of the archives")
+    parser.add_argument("--force", action="store_true", help="Re-freeze existing archives")
+    args = parser.parse_args()
+
+    from dp_utilities import snowflake_connection_helper
+
+    conn = snowflake_connection_helper()
+    for year in args.year or freezable_seasons(conn):
+        for kind in SEASON_KINDS:
+            path = archive_path(kind, year, args.archive_dir)
+            if os.path.exists(path) and not args.force:
+                logger.info(f"Keeping existing archive {path}")
+                continue
+            freeze_season(conn, kind, year, args.archive_dir)
+            table = read_archive(kind, year, args.archive_dir)
+            if table is None:
+                raise SystemExit(f"Archive {path} could not be read back")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Nightly snapshot of the NNDB page aggregates.
+
+Computes the age histogram, occupation ratios, risk factors and top
+predictions shown on the NNDB page. All of them are written into one
+versioned Arrow IPC file, which the page memory-maps instead of querying
+Snowflake on every visit (see ``dp_nndb``). Run from the repository root,
+once or, with --every, as a long-running process that rebuilds the snapshot
+on an interval. The container runs the latter under supervisord (see
+``supervisord.conf``):
+
+    python -m jobs.nndb_snapshot
+    python -m jobs.nndb_snapshot --every 86400
+
+Outputs:
+- $DEADPOOL_CACHE_DIR/nndb_snapshot.arrow (or --output), replaced atomically
+"""
+
+import argparse
+import logging
+import time
+
+from dp_nndb import SNAPSHOT_PATH, build_snapshot, read_snapshot
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Schedule Constants
+RETRY_INTERVAL = 600
+
+
+def write_snapshot(output: str) -> None:
+    """Builds the snapshot and checks that it reads back.
+
+    Args:
+        output: Snapshot file to write
+
+    Raises:
+        RuntimeError: If the written snapshot cannot be read back
+    """
+    from dp_utilities import snowflake_connection_helper
+
+    start = time.perf_counter()
+    size = build_snapshot(snowflake_connection_helper(), output)
+    snapshot = read_snapshot(output)
+    if snapshot is None:
+        raise RuntimeError(f"Snapshot {output} could not be read back")
+
+    rows = {name: len(frame) for name, frame in snapshot.frames.items()}
+    logger.info(
+        f"Wrote {output} ({size / 1024:.1f} KiB, nndb version {snapshot.version}) "
+        f"in {time.perf_counter() - start:.1f}s: {rows}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="Snapshot file to write")
+    parser.add_argument(
+        "--every", type=float, help="Keep running and rebuild every this many seconds"
+    )
+    args = parser.parse_args()
+
+    if not args.every:
+        try:
+            write_snapshot(args.output)
+        except RuntimeError as e:
+            raise SystemExit(str(e))
+        return
+
+    while True:
+        try:
+            write_snapshot(args.output)
+            delay = args.every
+        except Exception as e:
+            logger.error(f"NNDB snapshot failed, retrying in {RETRY_INTERVAL}s: {e}")
+            delay = min(args.every, RETRY_INTERVAL)
+        time.sleep(delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Offline duplicate detection for the ``people`` table.
+
+``draft_pick`` inserts a new person whenever the fuzzy check misses, so
+near-duplicate celebrities accumulate over the years. This job clusters
+probable duplicates across the whole table and writes a merge plan that
+points every ``player_picks`` row at one canonical person per cluster. The
+plan is written for the Arbiter to review; nothing is changed in Snowflake
+until a reviewed plan is applied with --apply.
+
+Run from the repository root:
+
+    python -m jobs.people_dedupe --output merge_plan
+    python -m jobs.people_dedupe --input people.csv --threshold 92 --workers 4
+    python -m jobs.people_dedupe --apply merge_plan.csv
+
+Outputs:
+- <output>.csv: one row per duplicate with its canonical ID and score
+- <output>.sql: the parameterized UPDATE and, as comments, the merges it
+  is bound to; --apply runs it with the IDs from the CSV as bind values
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from dp_matching import cluster_duplicates, find_duplicate_pairs
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# SQL Queries
+SQL_PICK_COUNTS = """
+SELECT people_id AS ID, COUNT(*) AS PICKS
+FROM player_picks
+GROUP BY 1
+"""
+
+SQL_REPOINT_PICKS = (
+    "UPDATE player_picks SET people_id = %(canonical)s WHERE people_id = %(duplicate)s"
+)
+
+
+def load_people(input_path: Optional[str]) -> pd.DataFrame:
+    """Load the people table with pick counts per person.
+
+    Args:
+        input_path: Optional CSV export with at least ID and NAME columns.
+            When omitted, the table is read from Snowflake.
+
+    Returns:
+        DataFrame with ID, NAME, WIKI_ID and PICKS columns
+    """
+    if input_path:
+        df_people = pd.read_csv(input_path)
+        if "PICKS" not in df_people.columns:
+            df_people["PICKS"] = 0
+    else:
+        from dp_utilities import (
+            load_snowflake_table,
+            run_snowflake_query,
+            snowflake_connection_helper,
+        )
+
+        conn = snowflake_connection_helper()
+        df_people = load_snowflake_table(conn, "people")
+        df_counts = run_snowflake_query(conn, SQL_PICK_COUNTS)
+        df_people = df_people.merge(df_counts, on="ID", how="left")
+
+    if "WIKI_ID" not in df_people.columns:
+        df_people["WIKI_ID"] = None
+    df_people["PICKS"] = df_people["PICKS"].fillna(0).astype(int)
+    return df_people.reset_index(drop=True)
+
+
+def build_merge_plan(
+    df_people: pd.DataFrame, clusters: List[List[int]], pairs: pd.DataFrame
+) -> pd.DataFrame:
+    """Choose a canonical person per cluster and list the rows to re-point.
+
+    The preferred row is the one with a Wikidata ID, then the most picks,
+    then the earliest position in the table. Union-find clusters can chain
+    unrelated names (A matches B, B matches C) and can join rows with
+    different Wikidata IDs, which are different people. So a row is only
+    merged into the canonical row if the two scored as a pair themselves
+    and their WIKI_IDs do not conflict. The rows left over are split off and
+    grouped the same way around the next preferred row.
+
+    Args:
+        df_people: People table as returned by ``load_people``
+        clusters: Position clusters from ``cluster_duplicates``
+        pairs: Scored pairs from ``find_duplicate_pairs``
+
+    Returns:
+        DataFrame with CLUSTER, CANONICAL_ID, CANONICAL_NAME, DUPLICATE_ID,
+        DUPLICATE_NAME, DUPLICATE_PICKS and SCORE (against the canonical
+        row) columns
+    """
+    scores = {
+        (int(left), int(right)): int(score)
+        for left, right, score in zip(pairs["LEFT"], pairs["RIGHT"], pairs["SCORE"])
+    }
+    wiki_ids = [value if pd.notnull(value) else None for value in df_people["WIKI_ID"]]
+    picks = df_people["PICKS"].tolist()
+
+    rows: List[Dict[str, Any]] = []
+    number = 0
+    for cluster in clusters:
+        remaining = sorted(cluster, key=lambda p: (wiki_ids[p] is None, -picks[p], p))
+        while len(remaining) > 1:
+            canonical, rest, remaining = remaining[0], remaining[1:], []
+            merged = []
+            for position in rest:
+                score = scores.get((min(canonical, position), max(canonical, position)))
+                conflict = None not in (wiki_ids[canonical], wiki_ids[position]) and (
+                    wiki_ids[canonical] != wiki_ids[position]
+                )
+                if score is None or conflict:
+                    remaining.append(position)
+                else:
+                    merged.append((position, score))
+            for position, score in merged:
+                rows.append(
+                    {
+                        "CLUSTER": number,
+                        "CANONICAL_ID": df_people["ID"].iloc[canonical],
+                        "CANONICAL_NAME": df_people["NAME"].iloc[canonical],
+                        "DUPLICATE_ID": df_people["ID"].iloc[position],
+                        "DUPLICATE_NAME": df_people["NAME"].iloc[position],
+                        "DUPLICATE_PICKS": picks[position],
+                        "SCORE": score,
+                    }
+                )
+            number += bool(merged)
+
+    columns = [
+        "CLUSTER",
+        "CANONICAL_ID",
+        "CANONICAL_NAME",
+        "DUPLICATE_ID",
+        "DUPLICATE_NAME",
+        "DUPLICATE_PICKS",
+        "SCORE",
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def write_merge_plan(plan: pd.DataFrame, output: str) -> None:
+    """Write the merge plan as CSV and as reviewable SQL.
+
+    IDs are never formatted into the statement: the SQL file holds the
+    parameterized UPDATE, and the CSV holds its bind values.
+
+    Args:
+        plan: Merge plan from ``build_merge_plan``
+        output: Output path without extension
+    """
+    plan.to_csv(f"{output}.csv", index=False)
+    with open(f"{output}.sql", "w") as file:
+        file.write(f"-- Bound once per row of {output}.csv by --apply\n")
+        file.write(f"{SQL_REPOINT_PICKS};\n")
+        for row in plan.itertuples(index=False):
+            file.write(f"-- {row.DUPLICATE_NAME!r} -> {row.CANONICAL_NAME!r}\n")
+    logger.info(f"Merge plan written to {output}.csv and {output}.sql")
+
+
+def apply_merge_plan(plan_path: str) -> int:
+    """Re-point player_picks as listed in a reviewed merge plan.
+
+    Runs the parameterized UPDATE once per plan row in one transaction.
+
+    Args:
+        plan_path: CSV written by ``write_merge_plan``
+
+    Returns:
+        Number of plan rows applied
+    """
+    from dp_utilities import invalidate_snowflake_cache, snowflake_connection_helper
+
+    plan = pd.read_csv(plan_path, dtype={"CANONICAL_ID": str, "DUPLICATE_ID": str})
+    params = [
+        {"canonical": row.CANONICAL_ID, "duplicate": row.DUPLICATE_ID}
+        for row in plan.itertuples(index=False)
+    ]
+    conn = snowflake_connection_helper()
+    cur = conn.cursor()
+    try:
+        cur.execute("START TRANSACTION")
+        cur.executemany(SQL_REPOINT_PICKS, params)
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    finally:
+        cur.close()
+    invalidate_snowflake_cache("player_picks")
+    logger.info(f"Applied {len(params)} merges from {plan_path}")
+    return len(params)
+
+
+def main() -> None:
+    """Run the duplicate detection job."""
+    parser = argparse.ArgumentParser(description="Find duplicate people")
+    parser.add_argument("--input", help="CSV export of the people table")
+    parser.add_argument("--output", default="merge_plan")
+    parser.add_argument("--threshold", type=float, default=90)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--apply", metavar="PLAN_CSV", help="Apply a reviewed merge plan")
+    args = parser.parse_args()
+
+    if args.apply:
+        apply_merge_plan(args.apply)
+        return
+
+    df_people = load_people(args.input)
+    logger.info(f"Loaded {len(df_people)} people")
+
+    start = time.perf_counter()
+    pairs = find_duplicate_pairs(
+        df_people["NAME"].tolist(), threshold=args.threshold, workers=args.workers
+    )
+    clusters = cluster_duplicates(pairs, len(df_people))
+    plan = build_merge_plan(df_people, clusters, pairs)
+    logger.info(
+        f"Found {len(clusters)} clusters ({len(plan)} duplicates) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    write_merge_plan(plan, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,28 +5,34 @@ This module displays information about deceased picks, including:
 - Birth and death dates
 - Biographical information
 - Images (when available)
-- Search functionality
+- Typo-tolerant search
 - Paginated results
 
 Features:
-- Real-time Wikidata queries
-- Cached responses
-- Search capabilities
+- Batched Wikidata queries
+- Persistent on-disk Wikidata cache
+- Concurrent lookups with next-page prefetch
+- Cached 200px portrait thumbnails
+- Server-side search and pagination
 - Responsive layout
 """
 
 import logging
-from typing import Final, Dict, List, Optional
-from functools import lru_cache
+import os
+from concurrent.futures import TimeoutError as FuturesTimeout, as_completed
+from typing import Final, Dict, List, Optional, Tuple
+from urllib.parse import quote
 import streamlit as st
-from SPARQLWrapper import SPARQLWrapper, JSON
 import pandas as pd
 from snowflake.connector import SnowflakeConnection
 from dp_utilities import (
-    load_snowflake_table,
-    snowflake_connection_helper,
+    run_cached_snowflake_query,
+    snowflake_connection_pool,
     mp_track_page_view,
+    thumbnail_cache,
+    wikidata_store,
 )
+from dp_wikidata import PersonDetails, WikidataStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,20 +46,47 @@ AUTH_KEY_DEATH_WALL_LOGIN: Final[str] = "deadpool-app-login-death-wall"
 AUTH_KEY_DEATH_WALL_LOGOUT: Final[str] = "deadpool-app-logout-death-wall"
 HOME_PAGE: Final[str] = "Home.py"
 
-# Wikidata Constants
-WIKIDATA_ENDPOINT: Final[str] = "https://query.wikidata.org/sparql"
-SPARQL_QUERY: Final[str] = """
-SELECT ?personLabel ?birthDate ?deathDate ?image ?description
-WHERE {{
-wd:{wiki_id} wdt:P569 ?birthDate.
-wd:{wiki_id} wdt:P570 ?deathDate.
-OPTIONAL {{ wd:{wiki_id} wdt:P18 ?image. }}
-OPTIONAL {{ wd:{wiki_id} schema:description ?description. FILTER(LANG(?description) = "en") }}
-SERVICE wikibase:label {{ bd:serviceParam wikibase:language "[AUTO_LANGUAGE],en". }}
-}}
-LIMIT 1
+# Deceased picks, newest death first
+DECEASED_TABLE: Final[str] = "picks_current_year"
+SEARCH_SIMILARITY: Final[int] = 85
+
+SQL_DECEASED_PAGE: Final[str] = """
+SELECT NAME, WIKI_ID, DEATH_DATE, COUNT(*) OVER () AS TOTAL
+FROM picks_current_year
+WHERE DEATH_DATE IS NOT NULL
+ORDER BY DEATH_DATE DESC, NAME
+LIMIT %(limit)s OFFSET %(offset)s
 """
 
+# Substring matches first, then names within SEARCH_SIMILARITY (Jaro-Winkler)
+# of the term on the full name, first name or last name to tolerate typos
+SQL_DECEASED_SEARCH: Final[str] = """
+SELECT NAME, WIKI_ID, DEATH_DATE, COUNT(*) OVER () AS TOTAL
+FROM (
+    SELECT
+        NAME,
+        WIKI_ID,
+        DEATH_DATE,
+        CONTAINS(LOWER(NAME), LOWER(%(search)s)) AS IS_SUBSTRING,
+        GREATEST(
+            JAROWINKLER_SIMILARITY(LOWER(NAME), LOWER(%(search)s)),
+            JAROWINKLER_SIMILARITY(LOWER(SPLIT_PART(NAME, ' ', 1)), LOWER(%(search)s)),
+            JAROWINKLER_SIMILARITY(LOWER(SPLIT_PART(NAME, ' ', -1)), LOWER(%(search)s))
+        ) AS SIMILARITY
+    FROM picks_current_year
+    WHERE DEATH_DATE IS NOT NULL
+)
+WHERE IS_SUBSTRING OR SIMILARITY >= %(similarity)s
+ORDER BY IS_SUBSTRING DESC, SIMILARITY DESC, DEATH_DATE DESC, NAME
+LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+# Wikidata Constants
+PAGE_DEADLINE: Final[float] = 8.0
+
+# Base URL of the Flask thumbnail route (github_webhook.py), if deployed
+THUMBNAIL_PROXY_URL: Final[Optional[str]] = os.environ.get("DEADPOOL_THUMBNAIL_URL")
+
 # Pagination Constants
 ITEMS_PER_PAGE: Final[int] = 10
 DEFAULT_PAGE: Final[int] = 1
@@ -74,30 +107,6 @@ def display_user_info(name: str, email: str) -> None:
     st.sidebar.write(f"Email: {email}")
 
 
-@lru_cache(maxsize=100)
-def query_wikidata_by_id(wiki_id: str) -> List[Dict]:
-    """Query Wikidata for person information.
-
-    Args:
-        wiki_id: Wikidata ID for the person
-
-    Returns:
-        List of dictionaries containing person data
-    """
-    try:
-        sparql = SPARQLWrapper(WIKIDATA_ENDPOINT)
-        query = SPARQL_QUERY.format(wiki_id=wiki_id)
-        sparql.setQuery(query)
-        sparql.setReturnFormat(JSON)
-        results = sparql.query().convert()
-        logger.debug(f"Wikidata query successful for ID: {wiki_id}")
-        return results["results"]["bindings"]
-    except Exception as e:
-        error_msg = f"Error querying Wikidata for ID {wiki_id}: {str(e)}"
-        logger.error(error_msg)
-        return []
-
-
 def format_date(date_str: Optional[str]) -> str:
     """Format the date string from full datetime to YYYY-MM-DD.
 
@@ -112,26 +121,46 @@ def format_date(date_str: Optional[str]) -> str:
     return date_str.split("T")[0] if "T" in date_str else date_str
 
 
-def display_person_info(row: pd.Series, data: List[Dict]) -> None:
+def portrait_source(image_url: str):
+    """Pick the smallest available source for a portrait.
+
+    Uses the thumbnail proxy when THUMBNAIL_PROXY_URL is set, otherwise a
+    locally cached thumbnail, and falls back to the original image while the
+    thumbnail is built in the background.
+
+    Args:
+        image_url: Original Wikimedia Commons image URL
+
+    Returns:
+        URL or JPEG bytes accepted by st.image
+    """
+    thumbnails = thumbnail_cache()
+    if THUMBNAIL_PROXY_URL and thumbnails.is_allowed(image_url):
+        return f"{THUMBNAIL_PROXY_URL.rstrip('/')}/thumbnail?url={quote(image_url, safe='')}"
+    thumbnail = thumbnails.peek(image_url)
+    if thumbnail is None:
+        thumbnails.prefetch([image_url])
+        return image_url
+    return thumbnail
+
+
+def display_person_info(row: pd.Series, person: Optional[PersonDetails]) -> None:
     """Display information about a deceased person.
 
     Args:
         row: DataFrame row containing person data
-        data: Wikidata query results for the person
+        person: Wikidata details for the person, or None if unavailable
     """
     try:
-        if data:
-            person = data[0]
-            birth_date = format_date(person.get("birthDate", {}).get("value"))
-            death_date = format_date(person.get("deathDate", {}).get("value"))
-            image_url = person.get("image", {}).get("value")
-            description = person.get("description", {}).get("value", "")
+        if person:
+            birth_date = format_date(person.birth_date)
+            death_date = format_date(person.death_date)
 
             st.subheader(row["NAME"])
             st.write(f"Born: {birth_date} - Died: {death_date}")
-            st.write(description)
-            if image_url:
-                st.image(image_url, width=200)
+            st.write(person.description)
+            if person.image_url:
+                st.image(portrait_source(person.image_url), width=200)
 
             logger.debug(f"Person info displayed: {row['NAME']}")
         else:
@@ -143,48 +172,89 @@ def display_person_info(row: pd.Series, data: List[Dict]) -> None:
         st.error(error_msg)
 
 
-def load_deceased_data(conn: SnowflakeConnection) -> pd.DataFrame:
-    """Load data for deceased picks from Snowflake.
+def display_page(df_page: pd.DataFrame, store: WikidataStore) -> None:
+    """Display a page of people, filling in Wikidata misses as they resolve.
 
-    Args:
-        conn: Snowflake database connection
+    People already in the store are drawn immediately. The rest get a
+    placeholder and are fetched concurrently. Waiting stops after
+    PAGE_DEADLINE seconds however many lookups are slow.
 
-    Returns:
-        DataFrame containing deceased picks data
+    Args:
+        df_page: Rows of the people on this page
+        store: Persistent Wikidata store
     """
+    people, missing = store.get_many(df_page["WIKI_ID"].dropna())
+    col1, col2 = st.columns(2)
+
+    placeholders: Dict[str, List] = {}
+    for i, row in df_page.iterrows():
+        with col1 if i % 2 == 0 else col2:
+            placeholder = st.empty()
+        if row["WIKI_ID"] in missing:
+            placeholder.caption(f"Loading {row['NAME']}...")
+            placeholders.setdefault(row["WIKI_ID"], []).append((placeholder, row))
+        else:
+            with placeholder.container():
+                display_person_info(row, people.get(row["WIKI_ID"]))
+
+    def fill(wiki_id: str, person: Optional[PersonDetails]) -> None:
+        for placeholder, row in placeholders.pop(wiki_id, []):
+            with placeholder.container():
+                display_person_info(row, person)
+
+    futures = store.submit(missing)
     try:
-        df = load_snowflake_table(conn, "picks_current_year")
-        df_dead = df.loc[df["DEATH_DATE"].notnull()].sort_values(
-            by="DEATH_DATE", ascending=False
-        )
-        logger.info(f"Loaded {len(df_dead)} deceased picks")
-        return df_dead
-    except Exception as e:
-        error_msg = f"Error loading deceased data: {str(e)}"
-        logger.error(error_msg)
-        st.error(error_msg)
-        st.stop()
+        for future in as_completed(futures, timeout=PAGE_DEADLINE):
+            resolved = future.result()
+            for wiki_id in futures[future]:
+                if wiki_id in resolved:
+                    fill(wiki_id, resolved[wiki_id])
+    except FuturesTimeout:
+        logger.warning(f"Wikidata lookups still pending after {PAGE_DEADLINE}s")
 
+    # Lookups that failed or are still running; a rerun picks them up from the store
+    for wiki_id in list(placeholders):
+        for placeholder, row in placeholders.pop(wiki_id):
+            placeholder.write(f"Could not load data for {row['NAME']} right now.")
 
-def filter_by_search(df: pd.DataFrame, search_term: str) -> pd.DataFrame:
-    """Filter DataFrame based on search term.
+
+def load_deceased_page(
+    conn: SnowflakeConnection, search_term: str, page_number: int
+) -> Tuple[pd.DataFrame, int]:
+    """Load one page of deceased picks, plus the next for prefetching.
+
+    Search, ordering and pagination run in Snowflake, so the cost per page
+    stays the same however long the death list grows.
 
     Args:
-        df: DataFrame to filter
-        search_term: Search term to filter by
+        conn: Snowflake database connection
+        search_term: Typo-tolerant name search; empty for all deceased picks
+        page_number: 1-based page number
 
     Returns:
-        Filtered DataFrame
+        Tuple of up to two pages of rows and the total number of matches
     """
+    params = {
+        "limit": 2 * ITEMS_PER_PAGE,
+        "offset": (page_number - 1) * ITEMS_PER_PAGE,
+    }
+    query = SQL_DECEASED_PAGE
+    if search_term:
+        query = SQL_DECEASED_SEARCH
+        params.update(search=search_term.strip(), similarity=SEARCH_SIMILARITY)
+
     try:
-        filtered_df = df[df["NAME"].str.contains(search_term, case=False, na=False)]
-        logger.debug(
-            f"Filtered results: {len(filtered_df)} matches for '{search_term}'"
+        df_rows = run_cached_snowflake_query(
+            conn, query, [DECEASED_TABLE], params=params
         )
-        return filtered_df
+        total = int(df_rows["TOTAL"].iloc[0]) if len(df_rows) else 0
+        logger.info(f"Loaded {len(df_rows)} of {total} deceased picks")
+        return df_rows.drop(columns=["TOTAL"]), total
     except Exception as e:
-        logger.error(f"Error filtering data: {str(e)}")
-        return df
+        error_msg = f"Error loading deceased data: {str(e)}"
+        logger.error(error_msg)
+        st.error(error_msg)
+        st.stop()
 
 
 def display_pagination_info(start_idx: int, end_idx: int, total: int) -> None:
@@ -217,30 +287,27 @@ def handle_authentication() -> None:
             # Display user info
             display_user_info(name, email)
 
-            # Load data
-            conn = snowflake_connection_helper()
-            df_dead = load_deceased_data(conn)
-
-            # Handle search
+            # Handle search and pagination
             search_term = st.text_input("Search for a person")
-            if search_term:
-                df_dead = filter_by_search(df_dead, search_term)
-
-            # Handle pagination
             page_number = st.number_input("Page", min_value=1, value=DEFAULT_PAGE)
             start_idx = (page_number - 1) * ITEMS_PER_PAGE
             end_idx = start_idx + ITEMS_PER_PAGE
 
-            # Display results in columns
-            df_page = df_dead.iloc[start_idx:end_idx]
-            col1, col2 = st.columns(2)
+            # Load only this page and the next
+            with snowflake_connection_pool().connection() as conn:
+                df_rows, total = load_deceased_page(conn, search_term, page_number)
+
+            if df_rows.empty:
+                st.write("No results found.")
+                return
 
-            for i, row in df_page.iterrows():
-                data = query_wikidata_by_id(row["WIKI_ID"])
-                with col1 if i % 2 == 0 else col2:
-                    display_person_info(row, data)
+            # Display results in columns
+            store = wikidata_store()
+            display_page(df_rows.iloc[:ITEMS_PER_PAGE], store)
+            display_pagination_info(start_idx, end_idx, total)
 
-            display_pagination_info(start_idx, end_idx, len(df_dead))
+            # Warm the next page in the background
+            store.prefetch_async(df_rows["WIKI_ID"].iloc[ITEMS_PER_PAGE:])
 
         except Exception as e:
             error_msg = f"Error in death wall page: {str(e)}"
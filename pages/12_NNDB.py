@@ -10,21 +10,35 @@ mortality data, including:
 
 Features:
 - Interactive charts
+- Nightly snapshot with live fallback
 - Descriptive statistics
 - Risk factor identification
 - The Arbiter's predictions
 """
 
 import logging
-from typing import Final
+import os
+import time
+from typing import Dict, Final, Optional
 import streamlit as st
 import altair as alt
 import pandas as pd
 from snowflake.connector import SnowflakeConnection
+from dp_nndb import (
+    AGGREGATES,
+    MAX_AGE,
+    MAX_SNAPSHOT_AGE,
+    SNAPSHOT_PATH,
+    SQL_AGE_HISTOGRAM,
+    NNDBSnapshot,
+    describe_histogram,
+    read_snapshot,
+)
 from dp_utilities import (
-    load_snowflake_table,
+    get_table_version,
+    run_cached_snowflake_query,
+    load_parallel,
     run_snowflake_query,
-    snowflake_connection_helper,
     mp_track_page_view,
 )
 
@@ -40,34 +54,6 @@ AUTH_KEY_NNDB_LOGIN: Final[str] = "deadpool-app-login-nndb"
 AUTH_KEY_NNDB_LOGOUT: Final[str] = "deadpool-app-logout-nndb"
 HOME_PAGE: Final[str] = "Home.py"
 CHART_COLOR: Final[str] = "#F63366"
-MAX_AGE: Final[int] = 100
-TOP_PREDICTIONS: Final[int] = 20
-
-# SQL Queries
-SQL_OCCUPATION_RATIO: Final[str] = """
-SELECT
-    OCCUPATION,
-    COUNT(CASE WHEN DEATH_DATE IS NOT NULL THEN 1 END) AS DECEASED_COUNT,
-    COUNT(CASE WHEN DEATH_DATE IS NOT NULL THEN 1 END) /
-    NULLIF(COUNT(CASE WHEN DEATH_DATE IS NULL THEN 1 END), 0) AS RATIO
-FROM DEADPOOL.PROD.NNDB
-WHERE OCCUPATION IS NOT NULL
-GROUP BY 1
-ORDER BY 2 DESC
-LIMIT 15
-"""
-
-SQL_RISK_FACTORS: Final[str] = """
-SELECT NAME, RISK_FACTORS, AGE
-FROM DEADPOOL.PROD.NNDB
-WHERE RISK_FACTORS IS NOT NULL
-AND DEATH_DATE IS NULL
-AND AGE IS NOT NULL
-AND AGE < 101
-GROUP BY 1, 2, 3
-ORDER BY 3 DESC
-LIMIT 200
-"""
 
 # Page configuration
 st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON)
@@ -85,37 +71,85 @@ def display_user_info(name: str, email: str) -> None:
     st.sidebar.write(f"Email: {email}")
 
 
-def load_nndb_data(conn: SnowflakeConnection) -> pd.DataFrame:
-    """Load and preprocess NNDB data.
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_age_histogram(_conn: SnowflakeConnection, version: Optional[str]) -> pd.DataFrame:
+    """Load deceased counts per age, cached until the nndb table changes.
 
     Args:
-        conn: Snowflake database connection
+        _conn: Snowflake database connection
+        version: Data version of the nndb table (see get_table_version)
 
     Returns:
-        Preprocessed DataFrame
+        DataFrame with one AGE and COUNT row per distinct age
     """
-    try:
-        df_nndb = load_snowflake_table(conn, "nndb")
-        df_nndb = df_nndb[df_nndb["AGE"] < MAX_AGE]
+    df_hist = run_snowflake_query(_conn, SQL_AGE_HISTOGRAM, params={"max_age": MAX_AGE})
+    logger.info(f"Loaded NNDB age histogram ({len(df_hist)} ages) for version {version}")
+    return df_hist
 
-        # Add life status columns
-        df_nndb["IS_ALIVE"] = df_nndb["DEATH_DATE"].isnull()
-        df_nndb["IS_DECEASED"] = df_nndb["DEATH_DATE"].notnull()
 
-        logger.info("NNDB data loaded and preprocessed successfully")
-        return df_nndb
-    except Exception as e:
-        error_msg = f"Error loading NNDB data: {str(e)}"
-        logger.error(error_msg)
-        st.error(error_msg)
-        st.stop()
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_snapshot(path: str, modified: float) -> Optional[NNDBSnapshot]:
+    """Read the nightly snapshot, cached until the file is replaced.
+
+    The cached snapshot can outlive MAX_SNAPSHOT_AGE if the nightly job
+    stops, so callers check ``created_at`` again.
+
+    Args:
+        path: Snapshot file
+        modified: Modification time of the file, part of the cache key
+
+    Returns:
+        The snapshot, or None if it is missing or stale
+    """
+    return read_snapshot(path)
 
 
-def display_age_distribution(df: pd.DataFrame) -> None:
+def load_live_aggregates() -> Dict[str, pd.DataFrame]:
+    """Query every aggregate from Snowflake when no snapshot is available.
+
+    The aggregates are independent, so they are queried in parallel.
+
+    Returns:
+        Dictionary of aggregate name to DataFrame
+    """
+    loads = {
+        name: lambda conn, query=query: run_cached_snowflake_query(
+            conn, query.sql, [query.table], params=query.params
+        )
+        for name, query in AGGREGATES.items()
+        if name != "age_histogram"
+    }
+    loads["age_histogram"] = lambda conn: load_age_histogram(
+        conn, get_table_version(conn, "nndb")
+    )
+    return {name: result.value for name, result in load_parallel(loads).items()}
+
+
+def load_aggregates() -> Dict[str, pd.DataFrame]:
+    """Load the page's aggregates from the snapshot, or live as a fallback.
+
+    Returns:
+        Dictionary of aggregate name to DataFrame
+    """
+    snapshot = None
+    if os.path.exists(SNAPSHOT_PATH):
+        snapshot = load_snapshot(SNAPSHOT_PATH, os.path.getmtime(SNAPSHOT_PATH))
+    if snapshot is not None and time.time() - snapshot.created_at > MAX_SNAPSHOT_AGE:
+        logger.warning(f"NNDB snapshot for version {snapshot.version} is stale")
+        snapshot = None
+    if snapshot is not None and set(AGGREGATES) <= set(snapshot.frames):
+        logger.info(f"Using NNDB snapshot for version {snapshot.version}")
+        return snapshot.frames
+
+    logger.info("No NNDB snapshot available, querying live")
+    return load_live_aggregates()
+
+
+def display_age_distribution(df_hist: pd.DataFrame) -> None:
     """Display age distribution chart and statistics.
 
     Args:
-        df: DataFrame containing deceased people
+        df_hist: Deceased counts per age
     """
     try:
         st.subheader("Number of People Who are Dead by Age")
@@ -126,15 +160,18 @@ def display_age_distribution(df: pd.DataFrame) -> None:
 
         # Create and display line chart
         age_line_chart = (
-            alt.Chart(df)
+            alt.Chart(df_hist)
             .mark_line()
-            .encode(alt.X("AGE"), y="count()", color=alt.value(CHART_COLOR))
+            .encode(alt.X("AGE"), y="COUNT:Q", color=alt.value(CHART_COLOR))
         )
         st.altair_chart(age_line_chart, use_container_width=True)
 
         # Display descriptive statistics
         st.subheader("Descriptive Statistics on Age")
-        st.dataframe(df["AGE"].describe(), use_container_width=True)
+        st.dataframe(
+            describe_histogram(df_hist["AGE"], df_hist["COUNT"]),
+            use_container_width=True,
+        )
 
         logger.debug("Age distribution displayed successfully")
     except Exception as e:
@@ -143,14 +180,13 @@ def display_age_distribution(df: pd.DataFrame) -> None:
         st.error(error_msg)
 
 
-def display_occupation_stats(conn: SnowflakeConnection) -> None:
+def display_occupation_stats(df_occupation: pd.DataFrame) -> None:
     """Display occupation-based mortality statistics.
 
     Args:
-        conn: Snowflake database connection
+        df_occupation: Deceased counts and alive/dead ratio per occupation
     """
     try:
-        df_occupation = run_snowflake_query(conn, SQL_OCCUPATION_RATIO)
         df_occupation["RATIO"] = df_occupation["RATIO"].astype(float)
         df_occupation = df_occupation.sort_values(by="RATIO", ascending=False)
 
@@ -173,14 +209,13 @@ def display_occupation_stats(conn: SnowflakeConnection) -> None:
         st.error(error_msg)
 
 
-def display_risk_factors(conn: SnowflakeConnection) -> None:
+def display_risk_factors(df_risk: pd.DataFrame) -> None:
     """Display risk factor analysis.
 
     Args:
-        conn: Snowflake database connection
+        df_risk: Living people with risk factors, oldest first
     """
     try:
-        df_risk = run_snowflake_query(conn, SQL_RISK_FACTORS)
         st.subheader("High Risk People by Age")
         st.dataframe(df_risk, use_container_width=True)
 
@@ -191,20 +226,14 @@ def display_risk_factors(conn: SnowflakeConnection) -> None:
         st.error(error_msg)
 
 
-def display_predictions(conn: SnowflakeConnection) -> None:
+def display_predictions(df_nndb_preds: pd.DataFrame) -> None:
     """Display The Arbiter's predictions.
 
     Args:
-        conn: Snowflake database connection
+        df_nndb_preds: Top predictions, highest first
     """
     try:
-        df_nndb_preds = load_snowflake_table(conn, "nndb_predictions")
-        df_nndb_preds.drop(columns=["ID", "IS_DECEASED"], inplace=True)
-        df_nndb_preds = (
-            df_nndb_preds.sort_values("PREDICTION", ascending=False)
-            .head(TOP_PREDICTIONS)
-            .reset_index(drop=True)
-        )
+        df_nndb_preds = df_nndb_preds.reset_index(drop=True)
 
         st.subheader("The Arbiter's Picks for 2024 are as follows.")
         st.dataframe(df_nndb_preds, use_container_width=True)
@@ -236,14 +265,11 @@ def handle_authentication() -> None:
             display_user_info(name, email)
 
             # Load data and display statistics
-            conn = snowflake_connection_helper()
-            df_nndb = load_nndb_data(conn)
-            df_nndb_dead = df_nndb[df_nndb["IS_DECEASED"]]
-
-            display_age_distribution(df_nndb_dead)
-            display_occupation_stats(conn)
-            display_risk_factors(conn)
-            display_predictions(conn)
+            frames = load_aggregates()
+            display_age_distribution(frames["age_histogram"])
+            display_occupation_stats(frames["occupation_ratio"])
+            display_risk_factors(frames["risk_factors"])
+            display_predictions(frames["predictions"])
 
         except Exception as e:
             error_msg = f"Error in NNDB page: {str(e)}"
@@ -14,14 +14,19 @@ for the deadpool game. It includes functionality for:
 import logging
 from datetime import datetime, timezone
 import uuid
-from typing import Tuple, Any, List
+from typing import Tuple, Any, List, Optional
 import pandas as pd
 import streamlit as st
+from dp_draft import DraftTurn, get_draft_state
+from dp_matching import top_k_matches
+from dp_people import get_people_cache
 from dp_utilities import (
     has_fuzzy_match,
     send_sms,
-    load_snowflake_table,
-    snowflake_connection_helper,
+    invalidate_snowflake_cache,
+    load_cached_snowflake_table,
+    load_parallel,
+    snowflake_connection_pool,
     is_admin,
     mp_track_page_view,
 )
@@ -33,6 +38,8 @@ DRAFT_YEAR = datetime.now().year
 WEBSITE_URL = "https://deadpool.streamlit.app/Drafting"
 MIN_PICK_LENGTH = 2
 MAX_PICK_LENGTH = 255
+SUGGESTION_COUNT = 3
+SUGGESTION_THRESHOLD = 60
 
 # SQL Queries
 SQL_INSERT_PEOPLE = """
@@ -62,30 +69,37 @@ def reset() -> None:
     st.session_state.submitted = False
 
 
-def draft_logic(current_email: str, conn: Any) -> Tuple[bool, str]:
+def draft_logic(current_email: str) -> Tuple[bool, str]:
     """Check if the current user is the person who will draft next.
 
+    Reads the process-wide draft state, which display_drafting has synced.
+
     Args:
         current_email: Email of the current logged in person
-        conn: Snowflake database connection
 
     Returns:
         Tuple containing:
             - bool: True if it's the person's turn to draft
             - str: Next user's ID if it's their turn, empty string otherwise
     """
-    df_draft = load_snowflake_table(conn, "draft_next")
-    try:
-        next_user = df_draft["EMAIL"].iloc[0]
-        next_user_id = df_draft["ID"].iloc[0]
-        if current_email == next_user:
-            return True, next_user_id
-
-        st.write("It is not your turn. Please come back when it is.")
-        return False, ""
-    except IndexError:
-        st.write("And with that the 2024 Draft is over!")
+    draft_state = get_draft_state()
+    current = draft_state.current()
+    if current is None:
+        st.write(f"And with that the {DRAFT_YEAR} Draft is over!")
         return False, ""
+    if current_email == current.email:
+        return True, current.id
+
+    st.write("It is not your turn. Please come back when it is.")
+    player = draft_state.find(current_email)
+    turns = draft_state.turns_until(player.id) if player is not None else None
+    if turns is not None:
+        minutes = draft_state.eta(player.id) / 60
+        st.caption(
+            f"{current.name} is picking now. You are up in {turns} "
+            f"pick{'s' if turns != 1 else ''} (about {minutes:.0f} minutes)."
+        )
+    return False, ""
 
 
 def validate_pick(pick: str) -> bool:
@@ -125,7 +139,7 @@ def draft_pick(
     
     Args:
         pick: The celebrity name being drafted
-        user_info: User information (email for regular users, DataFrame for admin)
+        user_info: User information (player ID for regular users, DraftTurn for admin)
         conn: Snowflake database connection
         opted_in_numbers: List of phone numbers opted in for notifications
         current_drafts: List of already drafted celebrity names
@@ -140,18 +154,13 @@ def draft_pick(
 
         # Validate user_info based on mode
         if admin_mode:
-            if not isinstance(user_info, pd.DataFrame):
-                logger.error("Admin mode requires DataFrame user_info")
+            if not isinstance(user_info, DraftTurn):
+                logger.error("Admin mode requires DraftTurn user_info")
                 st.error("Invalid admin user information format")
                 return
-            if len(user_info) == 0 or "ID" not in user_info.columns:
-                logger.error("Admin user_info DataFrame is empty or missing ID column")
-                st.error("Invalid admin user data structure")
-                return
-            logger.debug(f"Admin mode - User info DataFrame:\n{user_info}")
-            player_id = user_info["ID"].iloc[0]
-            player_email = user_info["EMAIL"].iloc[0]
-            logger.info(f"Admin drafting for player: {player_email}")
+            logger.debug(f"Admin mode - User info: {user_info}")
+            player_id = user_info.id
+            logger.info(f"Admin drafting for player: {user_info.email}")
         else:
             if not isinstance(user_info, str):
                 logger.error("Regular mode requires string user_info (player ID)")
@@ -172,12 +181,16 @@ def draft_pick(
             logger.warning(f"Duplicate pick attempted: {pick}, matching {match_id}")
             st.error(error_msg)
             st.info(f"Match found: {match_id}")
+            display_suggestions(pick, current_drafts)
             return
 
-        # Check if person exists in database
+        # Check if person exists in database (delta-refreshed process cache)
         logger.debug("Checking if person exists in database")
-        df_all_people = load_snowflake_table(conn, "people")
-        existing_person, existing_id = has_fuzzy_match(pick, df_all_people, "NAME")
+        people = get_people_cache()
+        people.refresh(conn)
+        existing_match = people.best_match(pick)
+        existing_person = existing_match is not None
+        existing_id = existing_match.id if existing_person else None
         logger.debug(f"Person exists: {existing_person}, ID: {existing_id}")
         
         # Use existing ID if person exists, otherwise generate new one
@@ -200,18 +213,26 @@ def draft_pick(
             (player_id, DRAFT_YEAR, person_id, timestamp),
         )
 
-        # Commit transaction
+        # Commit transaction and drop cached views that read these tables
         conn.cursor().execute("COMMIT")
+        invalidate_snowflake_cache("people", "player_picks")
+
+        # Advance the draft turn locally (write-through), confirmed against draft_next
+        next_turn = get_draft_state().record_pick(conn, player_id, new_person=not existing_person)
+
+        # Write the new person through to the people cache
+        if not existing_person:
+            people.upsert(person_id, pick, wiki_page)
 
         # Send notifications
         if admin_mode:
             logger.info("Admin mode - Sending notifications on behalf of player")
             # In admin mode, use the drafted player's name instead of admin's name
-            player_name = user_info["NAME"].iloc[0]
-            send_draft_notifications(pick, player_name, opted_in_numbers, conn)
+            player_name = user_info.name
+            send_draft_notifications(pick, player_name, opted_in_numbers, next_turn)
         else:
             logger.info("Regular mode - Sending notifications")
-            send_draft_notifications(pick, st.session_state.name, opted_in_numbers, conn)
+            send_draft_notifications(pick, st.session_state.name, opted_in_numbers, next_turn)
         
         st.success(f"Draft pick complete{' (Admin Mode)' if admin_mode else ''}")
         reset()
@@ -223,11 +244,30 @@ def draft_pick(
         reset()
 
 
+def display_suggestions(pick: str, current_drafts: pd.DataFrame) -> None:
+    """Show the already drafted names that are closest to a pick.
+
+    Args:
+        pick: The celebrity name being drafted
+        current_drafts: DataFrame of this year's picks with NAME and ID columns
+    """
+    candidates = top_k_matches(
+        [pick],
+        current_drafts["NAME"].tolist(),
+        current_drafts["ID"].tolist(),
+        k=SUGGESTION_COUNT,
+        threshold=SUGGESTION_THRESHOLD,
+    )[0]
+    if candidates:
+        names = ", ".join(f"{c.name} ({c.score:.0f})" for c in candidates)
+        st.info(f"Did you mean: {names}")
+
+
 def send_draft_notifications(
     pick: str,
     user_name: str,
     opted_in_numbers: List[str],
-    conn: Any,
+    next_turn: Optional[DraftTurn],
 ) -> None:
     """Send SMS notifications about the draft pick.
 
@@ -235,7 +275,7 @@ def send_draft_notifications(
         pick: The celebrity name that was drafted
         user_name: Name of the user who made the pick
         opted_in_numbers: List of phone numbers opted in for notifications
-        conn: Snowflake database connection
+        next_turn: Player whose turn it is now, None once the draft is over
     """
     # Notify opted-in users about the pick
     # In admin mode, user_name will be the player's name from the database
@@ -247,16 +287,13 @@ def send_draft_notifications(
     send_sms(pick_message, opted_in_numbers)
 
     # Notify next player
-    df_next_sms = load_snowflake_table(conn, "draft_next")
-    if len(df_next_sms) > 0:
-        next_name = df_next_sms["NAME"].iloc[0]
-        next_sms = df_next_sms["SMS"].iloc[0]
+    if next_turn is not None:
         next_message = (
-            f"{next_name} is next to pick. "
+            f"{next_turn.name} is next to pick. "
             f"Please log into the website at {WEBSITE_URL} to make your selection."
         )
-        send_sms(next_message, [next_sms])
-        logger.info("SMS notifications sent")
+        send_sms(next_message, [next_turn.sms])
+        logger.info("SMS notifications queued")
     else:
         logger.info("No additional players to notify")
 
@@ -275,36 +312,43 @@ def display_draft_notes() -> None:
     )
 
 
-def main() -> None:
-    """Main function to handle the drafting interface."""
-    logger.info("Starting drafting interface")
-    st.title("Drafting :skull_and_crossbones:")
+def load_draft_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load the current year picks and the SMS opt-ins in parallel.
 
-    if st.session_state.get("authentication_status") is None:
-        logger.warning("User not authenticated")
-        st.warning("Please use the button below to navigate to Home and log in.")
-        st.page_link("Home.py", label="Home", icon="🏠")
-        st.stop()
+    Runs before the render checks its own connection out of the pool, so the
+    parallel loads never wait on a pool slot held by the same render.
 
-    # Authentication setup
-    authenticator = st.session_state.get("authenticator")
-    authenticator.logout(location="sidebar", key="deadpool-app-logout-drafting")
-    authenticator.login(location="unrendered", key="deadpool-app-login-drafting")
-    
-    mp_track_page_view(PAGE_TITLE)
+    Returns:
+        Tuple of the picks and opted-in DataFrames
+    """
+    logger.debug("Loading current year picks")
+    results = load_parallel(
+        {
+            "picks": lambda _conn: load_cached_snowflake_table(_conn, "picks_current_year"),
+            "opted": lambda _conn: load_cached_snowflake_table(
+                _conn, "draft_opted_in", columns=["SMS"]
+            ),
+        }
+    )
+    return results["picks"].value, results["opted"].value
 
-    # User information
-    name = st.session_state.name
-    email = st.session_state.email
-    user_name = st.session_state.username
-    logger.info(f"User authenticated: {email}")
-    st.sidebar.write(f"Welcome, {name}")
-    st.sidebar.write(f"Email: {email}")
 
-    # Database connections and data loading
-    conn = snowflake_connection_helper()
-    logger.debug("Loading current year picks")
-    df_picks = load_snowflake_table(conn, "picks_current_year")
+def display_drafting(
+    conn: Any, df_picks: pd.DataFrame, df_opted: pd.DataFrame, email: str, user_name: str
+) -> None:
+    """Display the admin or regular drafting form.
+
+    Args:
+        conn: Snowflake database connection
+        df_picks: Current year picks, from load_draft_data
+        df_opted: Phone numbers opted in to SMS, from load_draft_data
+        email: Email of the current logged in person
+        user_name: Username of the current logged in person
+    """
+    # Whose turn it is comes from the shared draft state; this only queries
+    # Snowflake when player_picks changed since the last sync
+    draft_state = get_draft_state()
+    draft_state.sync(conn)
     logger.debug(f"Picks table type: {type(df_picks)}")
     logger.debug(f"Picks table shape: {df_picks.shape}")
     logger.debug(f"Picks table columns: {df_picks.columns.tolist()}")
@@ -327,18 +371,16 @@ def main() -> None:
         current_drafts = pd.DataFrame(columns=['NAME', 'ID'])
         logger.debug("Created empty current drafts DataFrame due to error")
     
-    df_opted = load_snowflake_table(conn, "draft_opted_in")
     opted_in_numbers = df_opted["SMS"].tolist()
 
     if is_admin():
         logger.info("Admin mode detected")
         st.info("Admin Mode Enabled")
-        df_players = load_snowflake_table(conn, "draft_next")
+        current_turn = draft_state.current()
         
         try:
-            if len(df_players) > 0:
-                next_player_email = df_players["EMAIL"].iloc[0]
-                st.write("Drafting for:", next_player_email)
+            if current_turn is not None:
+                st.write("Drafting for:", current_turn.email)
                 with st.form("Draft Picks"):
                     pick = st.text_input(
                         "Please choose the celebrity pick for the next player:",
@@ -348,7 +390,7 @@ def main() -> None:
 
                     if st.form_submit_button("Submit", on_click=submitted):
                         draft_pick(
-                            pick, df_players, conn, opted_in_numbers, current_drafts,
+                            pick, current_turn, conn, opted_in_numbers, current_drafts,
                             user_name, admin_mode=True
                         )
                         st.divider()
@@ -363,7 +405,7 @@ def main() -> None:
     else:
         logger.info("Regular user mode")
         st.write("Regular User Mode")
-        is_next, next_user_id = draft_logic(email, conn)
+        is_next, next_user_id = draft_logic(email)
         
         if is_next:
             st.subheader("Draft Picks:")
@@ -381,5 +423,40 @@ def main() -> None:
                     display_draft_notes()
 
 
+def main() -> None:
+    """Main function to handle the drafting interface."""
+    logger.info("Starting drafting interface")
+    st.title("Drafting :skull_and_crossbones:")
+
+    if st.session_state.get("authentication_status") is None:
+        logger.warning("User not authenticated")
+        st.warning("Please use the button below to navigate to Home and log in.")
+        st.page_link("Home.py", label="Home", icon="🏠")
+        st.stop()
+
+    # Authentication setup
+    authenticator = st.session_state.get("authenticator")
+    authenticator.logout(location="sidebar", key="deadpool-app-logout-drafting")
+    authenticator.login(location="unrendered", key="deadpool-app-login-drafting")
+    
+    mp_track_page_view(PAGE_TITLE)
+
+    # User information
+    name = st.session_state.name
+    email = st.session_state.email
+    user_name = st.session_state.username
+    logger.info(f"User authenticated: {email}")
+    st.sidebar.write(f"Welcome, {name}")
+    st.sidebar.write(f"Email: {email}")
+
+    # Parallel loads check out their own connections, so run them before
+    # this render holds one: nested checkouts can exhaust the pool
+    df_picks, df_opted = load_draft_data()
+
+    # Check a pooled connection out for the rest of the render
+    with snowflake_connection_pool().connection() as conn:
+        display_drafting(conn, df_picks, df_opted, email, user_name)
+
+
 if __name__ == "__main__":
     main()
@@ -10,17 +10,17 @@ This module displays all draft picks for the Deadpool game, including:
 Features:
 - Real-time data from Snowflake
 - Multiple view options for draft picks
-- Historical comparison capabilities
+- Historical comparison capabilities, loaded on demand
 """
 
 import logging
-from typing import Final, Dict
+from typing import Any, Final, Dict
 import streamlit as st
 import pandas as pd
-from snowflake.connector import SnowflakeConnection
+from dp_seasons import closed_seasons, current_season, load_season
 from dp_utilities import (
-    load_snowflake_table,
-    snowflake_connection_helper,
+    load_cached_snowflake_table,
+    load_parallel,
     mp_track_page_view,
 )
 
@@ -52,27 +52,32 @@ def display_user_info(name: str, email: str) -> None:
     st.sidebar.write(f"Email: {email}")
 
 
-def load_draft_data(conn: SnowflakeConnection) -> Dict[str, pd.DataFrame]:
-    """Load all required draft data from Snowflake.
+def load_draft_data() -> Dict[str, Any]:
+    """Load the current season's draft data from Snowflake.
 
-    Args:
-        conn: Snowflake database connection
+    The tables are independent, so they are loaded in parallel. Past
+    seasons are loaded on demand by display_history_picks; only their list
+    is loaded here.
 
     Returns:
-        Dictionary containing different draft data DataFrames
+        Dictionary containing different draft data DataFrames, and the
+        past seasons newest first under "history"
     """
     try:
-        # Load current and historical picks
-        df_current = load_snowflake_table(conn, "picks_current_year")
-        df_2024 = load_snowflake_table(conn, "picks_twenty_four")
-        # df_2023 = load_snowflake_table(conn, "picks_twenty_three")
-
-        # Load picks by person
-        df_picks = load_snowflake_table(conn, "draft")
-        df_picks.drop(columns="ID", inplace=True)
+        # Load current picks and picks by person
+        results = load_parallel(
+            {
+                "current": lambda conn: load_season(conn, "picks", current_season()),
+                "by_person": lambda conn: load_cached_snowflake_table(conn, "draft"),
+                "history": closed_seasons,
+            }
+        )
+        draft_data = {key: result.value for key, result in results.items()}
+        draft_data["by_person"].drop(columns="ID", inplace=True)
+        draft_data["history"] = draft_data["history"][::-1]
 
         logger.info("Draft data loaded successfully")
-        return {"current": df_current, "historical": df_2024, "by_person": df_picks}
+        return draft_data
     except Exception as e:
         error_msg = f"Error loading draft data: {str(e)}"
         logger.error(error_msg)
@@ -80,7 +85,24 @@ def load_draft_data(conn: SnowflakeConnection) -> Dict[str, pd.DataFrame]:
         st.stop()
 
 
-def display_draft_picks(data: Dict[str, pd.DataFrame]) -> None:
+@st.fragment
+def display_history_picks(year: int) -> None:
+    """Display a past season's picks once the user asks for it.
+
+    Runs as a fragment, so toggling one season only reruns this section.
+    Closed seasons come from their local archive (see dp_seasons).
+
+    Args:
+        year: Season year
+    """
+    if st.toggle(f"Show {year} draft picks", key=f"draft-picks-history-{year}"):
+        with st.spinner(f"Loading {year} draft picks..."):
+            result = load_parallel({"picks": lambda conn: load_season(conn, "picks", year)})
+        st.header(f"{year} Draft Picks:")
+        st.dataframe(result["picks"].value, use_container_width=True)
+
+
+def display_draft_picks(data: Dict[str, Any]) -> None:
     """Display all draft pick information in various formats.
 
     Args:
@@ -97,12 +119,9 @@ def display_draft_picks(data: Dict[str, pd.DataFrame]) -> None:
 
         st.divider()
 
-        # Display year-specific picks
-        st.header("2025 Draft Picks:")
-        st.dataframe(data["current"])
-
-        st.header("2024 Draft Picks:")
-        st.dataframe(data["historical"], use_container_width=True)
+        # Display past seasons on demand
+        for year in data["history"]:
+            display_history_picks(year)
 
         logger.debug("Draft picks displayed successfully")
     except Exception as e:
@@ -131,8 +150,7 @@ def handle_authentication() -> None:
             display_user_info(name, email)
 
             # Load and display draft data
-            conn = snowflake_connection_helper()
-            draft_data = load_draft_data(conn)
+            draft_data = load_draft_data()
             display_draft_picks(draft_data)
 
         except Exception as e:
@@ -9,19 +9,21 @@ This module displays various leaderboards and statistics for the Deadpool game,
 
 Features:
 - Real-time data from Snowflake
+- Current standings updated incrementally as deaths are recorded (see dp_scoring)
 - Interactive charts and tables
-- Historical comparisons
+- Historical comparisons, loaded on demand
 - Highlighted maximum scores
 """
 
 import logging
-from typing import Final, Dict
+from datetime import date
+from typing import Final, List
 import streamlit as st
 import pandas as pd
-from snowflake.connector import SnowflakeConnection
+from dp_scoring import Standings
+from dp_seasons import closed_seasons, current_season, load_season
 from dp_utilities import (
-    load_snowflake_table,
-    snowflake_connection_helper,
+    load_parallel,
     mp_track_page_view,
 )
 
@@ -59,36 +61,64 @@ def display_user_info(name: str, email: str) -> None:
     st.sidebar.write(f"Email: {email}")
 
 
-def load_score_data(conn: SnowflakeConnection) -> Dict[str, pd.DataFrame]:
-    """Load all required score data from Snowflake.
+def load_score_data(year: int) -> pd.DataFrame:
+    """Load one season's scores.
+
+    Closed seasons come from their local archive (see dp_seasons). Loading
+    through load_parallel only checks a connection out on a cache miss.
 
     Args:
-        conn: Snowflake database connection
+        year: Season year
 
     Returns:
-        Dictionary containing different score DataFrames
+        DataFrame with the season's scores
     """
-    try:
-        # Load scores for different time periods
-        df_score_current = load_snowflake_table(conn, "score_current_year")
-        df_score_2024 = load_snowflake_table(conn, "score_twenty_four")
-        df_score_2023 = load_snowflake_table(conn, "score_twenty_three")
-
-        # Clean up dataframes
-        for df in [df_score_current, df_score_2024, df_score_2023]:
-            df.drop(columns=COLUMNS_TO_DROP, inplace=True)
-
-        logger.info("Score data loaded successfully")
-        return {
-            "current": df_score_current,
-            "2024": df_score_2024,
-            "2023": df_score_2023,
-        }
-    except Exception as e:
-        error_msg = f"Error loading score data: {str(e)}"
-        logger.error(error_msg)
-        st.error(error_msg)
-        st.stop()
+    result = load_parallel({"scores": lambda conn: load_season(conn, "score", year)})["scores"]
+    logger.info(f"Score data for {year} loaded in {result.seconds:.3f}s")
+    return result.value.drop(columns=COLUMNS_TO_DROP)
+
+
+@st.cache_resource(show_spinner=False)
+def get_current_standings(year: int, _df_picks: pd.DataFrame) -> Standings:
+    """Build the process-wide standings of the season in progress.
+
+    Args:
+        year: Season year, the cache key
+        _df_picks: The season's picks, used only to build the standings
+
+    Returns:
+        Standings shared by every session
+    """
+    return Standings(_df_picks, last_blood=False, as_of=date.today())
+
+
+def load_current_standings() -> pd.DataFrame:
+    """Load the current season's standings, recording any new deaths.
+
+    The picks are read through the shared result cache. New deaths in them
+    are applied to the shared standings one at a time with record_death,
+    instead of rescoring the whole season.
+
+    Returns:
+        DataFrame with PLAYER and TOTAL, highest total first
+    """
+    year = current_season()
+    result = load_parallel({"picks": lambda conn: load_season(conn, "picks", year)})["picks"]
+    standings = get_current_standings(year, result.value)
+    deltas = standings.update(result.value, as_of=date.today())
+    if deltas:
+        logger.info(f"Applied {len(deltas)} score changes to the {year} standings")
+    return standings.frame()
+
+
+def load_history_seasons() -> List[int]:
+    """Load the past seasons shown on demand, newest first.
+
+    Returns:
+        List of closed season years
+    """
+    result = load_parallel({"seasons": closed_seasons})["seasons"]
+    return result.value[::-1]
 
 
 def display_leaderboard(title: str, data: pd.DataFrame) -> None:
@@ -117,16 +147,36 @@ def display_leaderboard(title: str, data: pd.DataFrame) -> None:
         st.error(error_msg)
 
 
-def display_all_leaderboards(data: Dict[str, pd.DataFrame]) -> None:
-    """Display all leaderboards in sequence.
+@st.fragment
+def display_history_leaderboard(year: int) -> None:
+    """Display a past season's leaderboard once the user asks for it.
+
+    Runs as a fragment, so toggling one season only reruns this section.
 
     Args:
-        data: Dictionary containing different score DataFrames
+        year: Season year
     """
+    if st.toggle(f"Show {year} results", key=f"leaderboard-history-{year}"):
+        with st.spinner(f"Loading {year} results..."):
+            data = load_score_data(year)
+        display_leaderboard(f"{year} Results", data)
+
+
+def display_all_leaderboards() -> None:
+    """Display the current leaderboard, then the past seasons on demand."""
     try:
-        display_leaderboard("Current Leaderboard:", data["current"])
-        display_leaderboard("2024 Results", data["2024"])
-        display_leaderboard("2023 Results", data["2023"])
+        try:
+            data = load_current_standings()
+        except Exception as e:
+            # The score view stays the source of truth if the picks cannot be scored
+            logger.warning(f"Falling back to the current score view: {e}")
+            data = load_score_data(current_season())
+        display_leaderboard("Current Leaderboard:", data)
+
+        st.divider()
+        st.header("Past Seasons")
+        for year in load_history_seasons():
+            display_history_leaderboard(year)
         logger.debug("All leaderboards displayed successfully")
     except Exception as e:
         error_msg = f"Error displaying leaderboards: {str(e)}"
@@ -154,9 +204,7 @@ def handle_authentication() -> None:
             display_user_info(name, email)
 
             # Load and display leaderboard data
-            conn = snowflake_connection_helper()
-            score_data = load_score_data(conn)
-            display_all_leaderboards(score_data)
+            display_all_leaderboards()
 
         except Exception as e:
             error_msg = f"Error in leaderboard page: {str(e)}"
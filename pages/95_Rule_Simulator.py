@@ -0,0 +1,228 @@
+"""
+Rule Simulator for Deadpool.
+
+This admin tool recomputes the standings of every season under alternative
+scoring rules, without editing the Snowflake score views. It allows
+administrators to:
+- Sweep bonus values, base points, age caps and scoring curves
+- Compare each variant's ranks against the real standings in the score views
+- Inspect the standings of a single variant per season
+
+Features:
+- Hundreds of variants evaluated in one vectorized pass (see dp_scoring)
+- Parallel loading of all seasons' picks
+- Admin only
+"""
+
+import itertools
+import logging
+import time
+from typing import Dict, Final, List, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dp_scoring import RuleSet, simulate_rules, summarize_simulation
+from dp_seasons import closed_seasons, current_season, load_season
+from dp_utilities import (
+    is_admin,
+    load_parallel,
+    mp_track_page_view,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Constants
+PAGE_TITLE: Final[str] = "Rule Simulator"
+PAGE_ICON: Final[str] = ":skull:"
+PAGE_HEADER: Final[str] = "Rule Simulator :skull_and_crossbones:"
+AUTH_KEY_SIMULATOR_LOGIN: Final[str] = "deadpool-app-login-rule-simulator"
+AUTH_KEY_SIMULATOR_LOGOUT: Final[str] = "deadpool-app-logout-rule-simulator"
+HOME_PAGE: Final[str] = "Home.py"
+
+# Simulation Constants
+CURRENT_SEASON: Final[str] = str(current_season())
+MAX_VARIANTS: Final[int] = 5000
+AGE_CAP_OPTIONS: Final[list] = [np.inf, 105, 100, 95, 90]
+EXPONENT_OPTIONS: Final[list] = [0.5, 0.8, 1.0, 1.2, 1.5, 2.0]
+
+# Page configuration
+st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON, layout="wide")
+st.title(PAGE_HEADER)
+
+
+def display_user_info(name: str, email: str) -> None:
+    """Display user information in the sidebar.
+
+    Args:
+        name: User's display name
+        email: User's email address
+    """
+    st.sidebar.write(f"Welcome, {name}")
+    st.sidebar.write(f"Email: {email}")
+
+
+def load_seasons() -> Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]:
+    """Load the picks and real scores of every season in parallel.
+
+    Returns:
+        Tuple of dictionaries of season to picks and to scores DataFrame
+    """
+    closed = load_parallel({"seasons": closed_seasons})["seasons"].value
+    years = [current_season(), *reversed(closed)]
+    results = load_parallel(
+        {
+            f"{kind}_{year}": lambda conn, kind=kind, year=year: load_season(conn, kind, year)
+            for year in years
+            for kind in ("picks", "score")
+        }
+    )
+    picks = {str(year): results[f"picks_{year}"].value for year in years}
+    scores = {str(year): results[f"score_{year}"].value for year in years}
+    return picks, scores
+
+
+def value_range(label: str, low: int, high: int, default: tuple, step: int) -> List[float]:
+    """Ask for an inclusive range of values and its step.
+
+    Args:
+        label: Name of the rule
+        low: Smallest selectable value
+        high: Largest selectable value
+        default: Default (start, end) of the range
+        step: Default step
+
+    Returns:
+        The values in the range
+    """
+    col_range, col_step = st.columns([3, 1])
+    start, end = col_range.slider(label, low, high, default)
+    step = col_step.number_input(f"{label} step", min_value=1, value=step)
+    return list(np.arange(start, end + 1, step, dtype=float))
+
+
+def build_rule_sets() -> List[RuleSet]:
+    """Build the grid of rule variants from the form inputs.
+
+    Returns:
+        Every combination of the selected rule values
+    """
+    st.subheader("Rule Variants")
+    bases = value_range("Base points", 0, 100, (50, 50), 10)
+    age_points = value_range("Age points", 80, 120, (100, 100), 5)
+    first_bloods = value_range("First Blood bonus", 0, 100, (0, 50), 5)
+    last_bloods = value_range("Last Blood bonus", 0, 100, (0, 50), 5)
+    quarterly_bonuses = value_range("Quarterly bonus", 0, 50, (5, 5), 5)
+    col_cap, col_curve = st.columns(2)
+    age_caps = col_cap.multiselect("Age caps", AGE_CAP_OPTIONS, default=[np.inf])
+    exponents = col_curve.multiselect("Curve exponents", EXPONENT_OPTIONS, default=[1.0])
+
+    return [
+        RuleSet(
+            base=base,
+            age_points=points,
+            exponent=exponent,
+            age_cap=cap,
+            first_blood=first,
+            last_blood=last,
+            quarterly_bonus=quarterly,
+        )
+        for base, points, exponent, cap, first, last, quarterly in itertools.product(
+            bases, age_points, exponents, age_caps, first_bloods, last_bloods, quarterly_bonuses
+        )
+    ]
+
+
+def display_simulation(
+    seasons: Dict[str, pd.DataFrame], scores: Dict[str, pd.DataFrame], rule_sets: List[RuleSet]
+) -> None:
+    """Run the simulation and display the summary and a variant's standings.
+
+    Args:
+        seasons: Dictionary of season to picks DataFrame
+        scores: Dictionary of season to real scores DataFrame, the baseline
+        rule_sets: Rule variants to evaluate
+    """
+    start = time.perf_counter()
+    df_sim = simulate_rules(
+        seasons, rule_sets, open_seasons=[CURRENT_SEASON], baselines=scores
+    )
+    df_summary = summarize_simulation(df_sim, rule_sets)
+    seconds = time.perf_counter() - start
+    logger.info(f"Simulated {len(rule_sets)} rule variants in {seconds:.3f}s")
+
+    st.subheader("Rank Changes")
+    st.caption(
+        f"{len(rule_sets)} variants over {len(seasons)} seasons in {seconds:.2f}s. "
+        "Ranks are compared with the real standings from the score views; "
+        "the current season has no Last Blood yet."
+    )
+    st.dataframe(df_summary, use_container_width=True)
+
+    st.subheader("Variant Standings")
+    variant = st.selectbox("Variant", df_summary.index.tolist())
+    for season in seasons:
+        df_season = df_sim[(df_sim["VARIANT"] == variant) & (df_sim["SEASON"] == season)]
+        st.write(f"**{season}**")
+        st.dataframe(
+            df_season.drop(columns=["VARIANT", "SEASON"]).sort_values("RANK"),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+def handle_authentication() -> None:
+    """Handle user authentication and display appropriate content."""
+    if st.session_state.get("authentication_status") is not None:
+        try:
+            # Setup authentication
+            authenticator = st.session_state.get("authenticator")
+            authenticator.logout(location="sidebar", key=AUTH_KEY_SIMULATOR_LOGOUT)
+            authenticator.login(location="unrendered", key=AUTH_KEY_SIMULATOR_LOGIN)
+
+            mp_track_page_view(PAGE_TITLE)
+
+            # Get user information
+            name = st.session_state.name
+            email = st.session_state.email
+            display_user_info(name, email)
+
+            if not is_admin():
+                logger.warning(f"Non-admin user attempted to access rule simulator: {email}")
+                st.warning("The rule simulator is only available to admins.")
+                return
+            logger.info(f"Displaying rule simulator for admin: {email}")
+
+            rule_sets = build_rule_sets()
+            if not rule_sets:
+                st.info("Select at least one age cap and curve exponent.")
+                return
+            if len(rule_sets) > MAX_VARIANTS:
+                st.warning(f"{len(rule_sets)} variants selected, the limit is {MAX_VARIANTS}.")
+                return
+
+            seasons, scores = load_seasons()
+            display_simulation(seasons, scores, rule_sets)
+
+        except Exception as e:
+            error_msg = f"Error in rule simulator page: {str(e)}"
+            logger.error(error_msg)
+            st.error(error_msg)
+    else:
+        logger.warning("Unauthenticated user attempted to access rule simulator")
+        st.warning("Please use the button below to navigate to Home and log in.")
+        st.page_link(HOME_PAGE, label="Home", icon="🏠")
+        st.stop()
+
+
+def main() -> None:
+    """Main function to handle the rule simulator page flow."""
+    logger.info("Starting rule simulator page")
+    handle_authentication()
+
+
+if __name__ == "__main__":
+    main()
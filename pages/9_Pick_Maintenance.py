@@ -20,9 +20,11 @@ from typing import Final, Dict, Optional, NamedTuple
 import streamlit as st
 import pandas as pd
 from snowflake.connector import SnowflakeConnection
+from dp_people import get_people_cache
 from dp_utilities import (
-    load_snowflake_table,
-    snowflake_connection_helper,
+    invalidate_snowflake_cache,
+    load_cached_snowflake_table,
+    snowflake_connection_pool,
     mp_track_page_view,
 )
 
@@ -92,7 +94,9 @@ def load_pick_data(conn: SnowflakeConnection) -> pd.DataFrame:
         DataFrame containing pick data
     """
     try:
-        df_picks = load_snowflake_table(conn, "people")
+        df_picks = load_cached_snowflake_table(
+            conn, "people", columns=["ID", "NAME", "WIKI_PAGE", "WIKI_ID"]
+        )
         logger.info("Pick data loaded successfully")
         return df_picks
     except Exception as e:
@@ -181,6 +185,10 @@ def update_pick(
             SQL_UPDATE_PICK,
             (new_data.name, new_data.wiki_page, new_data.wiki_id, pick_data.id),
         )
+        get_people_cache().upsert(
+            pick_data.id, new_data.name, new_data.wiki_page, new_data.wiki_id
+        )
+        invalidate_snowflake_cache("people")
 
         # Log the update
         logger.info(f"Pick updated: {pick_data.name} -> {new_data.name}")
@@ -273,10 +281,10 @@ def handle_authentication() -> None:
             st.markdown(INSTRUCTIONS)
 
             # Load and display forms
-            conn = snowflake_connection_helper()
-            df_picks = load_pick_data(conn)
-            display_pick_selection_form(df_picks)
-            display_update_form(conn)
+            with snowflake_connection_pool().connection() as conn:
+                df_picks = load_pick_data(conn)
+                display_pick_selection_form(df_picks)
+                display_update_form(conn)
 
         except Exception as e:
             error_msg = f"Error in pick maintenance page: {str(e)}"
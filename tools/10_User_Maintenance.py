@@ -3,7 +3,12 @@ User maintenance tools
 """
 
 import streamlit as st
-from dp_utilities import check_password, get_user_name, load_snowflake_table
+from dp_utilities import (
+    check_password,
+    get_user_name,
+    invalidate_snowflake_cache,
+    load_snowflake_table,
+)
 
 st.set_page_config(page_title="User Maintenance", page_icon=":skull_and_crossbones:")
 
@@ -147,6 +152,7 @@ with st.form("Registration"):
                 SUB_ID,
             ),
         )
+        invalidate_snowflake_cache("players")
 
         st.write("Query:", WRITE_QUERY)
         st.write("ID:", SUB_ID)
@@ -7,6 +7,7 @@ import streamlit as st
 from dp_utilities import (
     check_password,
     get_user_name,
+    invalidate_snowflake_cache,
     load_snowflake_table,
 )
 
@@ -66,5 +67,6 @@ with st.form("Registration"):
                 WRITE_QUERY,
                 (first_name, last_name, email, YEAR_ONE, sms, opt_in, ID),
             )
+            invalidate_snowflake_cache("players")
         else:
             st.write("User is already in the database.")
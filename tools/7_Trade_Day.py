@@ -6,6 +6,7 @@ import streamlit as st
 from dp_utilities import (
     check_password,
     has_fuzzy_match,
+    invalidate_snowflake_cache,
     send_sms,
     load_snowflake_table,
 )
@@ -106,6 +107,9 @@ if authenticated:
                         DELETE_QUERY, (sel_pick, email, DRAFT_YEAR)
                     )  # noqa: E501
 
+                    # Drop cached results that read the traded picks
+                    invalidate_snowflake_cache("picks", "player_picks")
+
                     sms_message = user_name
                     +" has traded "
                     +sel_pick